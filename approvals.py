@@ -0,0 +1,34 @@
+from typing import Callable
+
+
+# ── Approval Buttons ──────────────────────────────────────────────
+# Approval buttons carry their submission id ("approve:<id>"), so one
+# listener routes every click: nothing is added to the view store per
+# message, and startup does not grow with the backlog.
+APPROVAL_ACTIONS = {"approve": "approved", "reject": "rejected"}
+# Messages posted before the ids were added; resolved by their message id.
+# Submissions from before the message ids were stored cannot be matched
+# that way and are pointed to /review instead.
+LEGACY_APPROVAL_ACTIONS = {"btn_approve": "approved", "btn_reject": "rejected"}
+
+
+def approval_custom_id(action: str, submission_id: str) -> str:
+    return f"{action}:{submission_id}"
+
+
+def approval_target(
+    custom_id: str,
+    message_id: int | None,
+    submission_for_message: Callable[[int], str | None],
+) -> tuple[str | None, str] | None:
+    """``(submission id, status)`` for an approval button, else ``None``.
+
+    Legacy buttons are matched through ``submission_for_message``; the id
+    is ``None`` when no pending submission was posted as that message.
+    """
+    action, _, submission_id = custom_id.partition(":")
+    if submission_id and action in APPROVAL_ACTIONS:
+        return submission_id, APPROVAL_ACTIONS[action]
+    if custom_id in LEGACY_APPROVAL_ACTIONS and message_id is not None:
+        return submission_for_message(message_id), LEGACY_APPROVAL_ACTIONS[custom_id]
+    return None
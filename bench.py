@@ -0,0 +1,592 @@
+# ── Offline Benchmarks ────────────────────────────────────────────
+# Drives the bot's hot handlers against fake guilds, channels and
+# interactions on a synthetic dataset, without a Discord connection:
+#
+#   python bench.py --preset small
+#   python bench.py --preset large --backend json --output before.json
+#   python bench.py --preset large --compare before.json
+#
+# Each operation reports latency percentiles, bytes the process read and
+# wrote, allocations per call and the Discord API calls it issued
+# (including the leaderboard refreshes and queued edits it triggered).
+# Results are written as JSON; --compare flags regressions against an
+# earlier run and exits non-zero.
+import argparse
+import asyncio
+import gc
+import importlib.util
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+
+from models import MemberPeriodStats, Task, encode_points
+
+ROOT     = os.path.dirname(os.path.abspath(__file__))
+BOT_FILE = os.path.join(ROOT, "bot(2).py")
+GUILD_ID = 100_000_000_000_000_000
+MEMBER_BASE = 200_000_000_000_000_000
+ADMIN_ROLE  = "leadership teammember"
+PRESETS = {
+    "small":  {"members": 1_000,   "submissions": 10_000,    "tasks": 1_000},
+    "medium": {"members": 10_000,  "submissions": 100_000,   "tasks": 1_000},
+    "large":  {"members": 100_000, "submissions": 1_000_000, "tasks": 1_000},
+}
+# Compared metrics and the absolute change below which a shift is noise.
+COMPARED = {"p50_ms": 0.05, "p95_ms": 0.1, "api_calls": 0.5, "io_write_bytes": 4096, "alloc_peak_bytes": 16384}
+
+
+# ── Fake Discord ──────────────────────────────────────────────────
+# Just the attributes and coroutines the handlers touch. Every REST call
+# is counted on the shared ``Api``; nothing leaves the process.
+class Api:
+    def __init__(self):
+        self.calls = Counter()
+        self._ids  = itertools.count(300_000_000_000_000_000)
+
+    def hit(self, endpoint: str) -> None:
+        self.calls[endpoint] += 1
+
+    async def request(self, endpoint: str, bucket=None) -> None:
+        """One REST call against ``bucket``; answered instantly here."""
+        self.hit(endpoint)
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+
+class FakeAvatar:
+    def __init__(self, url: str):
+        self.url = url
+
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str):
+        self.id   = role_id
+        self.name = name
+
+
+class FakeMember:
+    def __init__(self, member_id: int, roles: list | None = None):
+        self.id             = member_id
+        self.name           = f"member{member_id % 1_000_000}"
+        self.display_name   = f"Member {member_id % 1_000_000}"
+        self.display_avatar = FakeAvatar(f"https://cdn.example/avatars/{member_id}.png")
+        self.roles          = roles or []
+        self.mention        = f"<@{member_id}>"
+
+
+class FakeMessage:
+    def __init__(self, api: Api, channel, message_id: int, embeds: list | None = None):
+        self.api     = api
+        self.channel = channel
+        self.id      = message_id
+        self.embeds  = embeds or []
+        self.author  = None
+
+    async def edit(self, **fields):
+        await self.api.request("message.edit", self.channel.id if self.channel else None)
+        if fields.get("embed") is not None:
+            self.embeds = [fields["embed"]]
+        return self
+
+    async def pin(self, **_):
+        await self.api.request("message.pin", self.channel.id if self.channel else None)
+
+    async def delete(self, **_):
+        await self.api.request("message.delete", self.channel.id if self.channel else None)
+
+
+class FakeChannel:
+    def __init__(self, api: Api, guild, channel_id: int, name: str):
+        self.api   = api
+        self.guild = guild
+        self.id    = channel_id
+        self.name  = name
+
+    async def send(self, content=None, **fields):
+        await self.api.request("channel.send", self.id)
+        embed = fields.get("embed")
+        return FakeMessage(self.api, self, self.api.next_id(), [embed] if embed else [])
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        return FakeMessage(self.api, self, message_id)
+
+    async def history(self, limit: int = 100):
+        await self.api.request("channel.history", self.id)
+        return
+        yield
+
+    async def purge(self, **_):
+        await self.api.request("channel.purge", self.id)
+        return []
+
+    async def pins(self):
+        await self.api.request("channel.pins", self.id)
+        return []
+
+
+class FakeGuild:
+    def __init__(self, api: Api, member_count: int, channel_names: list[str]):
+        self.api           = api
+        self.id            = GUILD_ID
+        self.name          = "Benchmark Guild"
+        self.member_count  = member_count
+        self.roles         = [FakeRole(GUILD_ID + 1, ADMIN_ROLE)]
+        self.text_channels = [
+            FakeChannel(api, self, GUILD_ID + 10 + offset, name) for offset, name in enumerate(channel_names)
+        ]
+
+    def get_member(self, member_id: int) -> FakeMember | None:
+        # The gateway member cache: present for everyone in the guild.
+        if 0 <= member_id - MEMBER_BASE < self.member_count:
+            return FakeMember(member_id)
+        return None
+
+    async def query_members(self, user_ids=None, limit: int = 5, cache: bool = True, **_):
+        self.api.hit("gateway.query_members")  # gateway, not REST: no bucket
+        return [member for member in map(self.get_member, user_ids or []) if member is not None]
+
+
+class FakeResponse:
+    def __init__(self, api: Api):
+        self.api   = api
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def send_message(self, *args, **kwargs):
+        await self.api.request("interaction.send_message")
+        self._done = True
+
+    async def edit_message(self, **kwargs):
+        await self.api.request("interaction.edit_message")
+        self._done = True
+
+    async def defer(self, **kwargs):
+        await self.api.request("interaction.defer")
+        self._done = True
+
+    async def send_modal(self, modal):
+        await self.api.request("interaction.send_modal")
+        self._done = True
+
+
+class FakeFollowup:
+    def __init__(self, api: Api):
+        self.api = api
+
+    async def send(self, *args, **kwargs):
+        await self.api.request("followup.send")
+
+
+class FakeInteraction:
+    def __init__(self, api: Api, guild: FakeGuild, user: FakeMember):
+        self.api        = api
+        self.id         = api.next_id()
+        self.created_at = datetime.now(timezone.utc)
+        self.guild      = guild
+        self.user       = user
+        self.response   = FakeResponse(api)
+        self.followup   = FakeFollowup(api)
+
+    async def original_response(self):
+        await self.api.request("interaction.original_response")
+        return FakeMessage(self.api, None, self.api.next_id())
+
+
+# ── Dataset ───────────────────────────────────────────────────────
+def make_tasks(count: int) -> dict:
+    return {
+        f"task_{i:04d}": {"name": f"Task {i:04d}", "points": 1 + i % 50, "max_completions": 0}
+        for i in range(count)
+    }
+
+
+def seed_store(storage, rng: random.Random, tasks: dict, member_count: int, submissions: int, pending: int) -> list[str]:
+    """Write the synthetic guild; returns the pending submission ids."""
+    task_items = list(tasks.items())
+    points     = {"weekly": {}, "monthly": {}}
+    now        = time.time()
+    resolved, open_subs = [], {}
+    for i in range(submissions):
+        member_id    = str(MEMBER_BASE + rng.randrange(member_count))
+        task_key, task = task_items[rng.randrange(len(task_items))]
+        amount       = rng.randint(1, 5)
+        record = {
+            "member_id":           member_id,
+            "task_key":            task_key,
+            "task":                task,
+            "amount":              amount,
+            "earned_points":       task["points"] * amount,
+            "claim_message_id":    str(MEMBER_BASE + i),
+            "approval_message_id": str(MEMBER_BASE + i + 1),
+        }
+        submission_id = f"{member_id}_{MEMBER_BASE + i}"
+        if i < pending:
+            open_subs[submission_id] = {**record, "status": "pending"}
+            continue
+        approved = rng.random() < 0.9
+        resolved.append({
+            "submission_id": submission_id,
+            **record,
+            "status":      "approved" if approved else "rejected",
+            "reviewed_by": "Benchmark",
+            "resolved_at": now - rng.uniform(0, 365 * 86400),
+        })
+        if approved:
+            periods = ("weekly", "monthly") if i % 4 == 0 else ("monthly",)
+            for period in periods:
+                data = points[period].setdefault(int(member_id), MemberPeriodStats())
+                data.total_points += record["earned_points"]
+                data.completions[task_key] = data.completions.get(task_key, 0) + amount
+    storage.write_batch({
+        "tasks":       tasks,
+        "resolved":    resolved,
+        "submissions": open_subs,
+        "snapshot":    (encode_points(points, 0), 0),
+    })
+    return list(open_subs)
+
+
+# ── Harness ───────────────────────────────────────────────────────
+def load_bot(data_dir: str, backend: str, window: float):
+    """Import ``bot(2).py`` as a module with its data kept in ``data_dir``."""
+    os.environ["DATA_DIR"]              = data_dir
+    os.environ["STORAGE_BACKEND"]       = backend
+    os.environ["MUTATION_BATCH_WINDOW"] = str(window)
+    sys.path.insert(0, ROOT)
+    spec   = importlib.util.spec_from_file_location("bot", BOT_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def process_io() -> tuple[int, int] | None:
+    """Bytes this process has read and written so far (Linux only)."""
+    try:
+        with open("/proc/self/io", "r") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+class Bench:
+    def __init__(self, bot, api: Api, guild: FakeGuild, data_dir: str, rng: random.Random, member_count: int):
+        self.bot          = bot
+        self.api          = api
+        self.guild        = guild
+        self.data_dir     = data_dir
+        self.rng          = rng
+        self.member_count = member_count
+        self.state        = bot.guild_state(guild)
+        self.admin        = FakeMember(MEMBER_BASE, roles=list(guild.roles))
+
+    def random_member(self) -> FakeMember:
+        return FakeMember(MEMBER_BASE + self.rng.randrange(self.member_count))
+
+    async def settle(self) -> None:
+        """Let queued edits, debounced refreshes and dirty rows finish."""
+        await self.bot.leaderboard_refresh.flush()
+        for _ in range(1000):
+            if not any(stats["queued"] for stats in self.bot.outbound.stats().values()):
+                break
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        await self.state.flush()
+
+    async def measure(self, name: str, setup, run, iterations: int, alloc_iterations: int) -> dict:
+        """Time ``run(arg)`` where ``arg = setup(i)``; setup is not measured."""
+        await self.settle()
+        api_before  = Counter(self.api.calls)
+        io_before   = process_io()
+        disk_before = directory_size(self.data_dir)
+        latencies   = []
+        for i in range(iterations):
+            arg     = setup(i)
+            started = time.perf_counter()
+            await run(arg)
+            latencies.append((time.perf_counter() - started) * 1000)
+        await self.settle()
+        io_after   = process_io()
+        api_calls  = self.api.calls - api_before
+        # Allocations are sampled separately so tracing does not skew the timings.
+        peaks, retained = [], 0
+        gc.collect()
+        tracemalloc.start()
+        start_size, _ = tracemalloc.get_traced_memory()
+        for i in range(alloc_iterations):
+            arg = setup(iterations + i)
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            await run(arg)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+        await self.settle()
+        retained = tracemalloc.get_traced_memory()[0] - start_size
+        tracemalloc.stop()
+        result = {
+            "iterations":          iterations,
+            "p50_ms":              round(percentile(latencies, 50), 4),
+            "p95_ms":              round(percentile(latencies, 95), 4),
+            "p99_ms":              round(percentile(latencies, 99), 4),
+            "max_ms":              round(max(latencies), 4),
+            "mean_ms":             round(statistics.fmean(latencies), 4),
+            "api_calls":           round(sum(api_calls.values()) / iterations, 3),
+            "api_calls_by_endpoint": {
+                endpoint: round(count / iterations, 3) for endpoint, count in sorted(api_calls.items())
+            },
+            "io_read_bytes":       round((io_after[0] - io_before[0]) / iterations) if io_before else None,
+            "io_write_bytes":      round((io_after[1] - io_before[1]) / iterations) if io_before else None,
+            "disk_growth_bytes":   round((directory_size(self.data_dir) - disk_before) / iterations),
+            "alloc_peak_bytes":    round(statistics.median(peaks)) if peaks else None,
+            "alloc_retained_bytes": round(retained / alloc_iterations) if alloc_iterations else None,
+        }
+        print(
+            f"  {name:<28} p50 {result['p50_ms']:>9.3f} ms  p95 {result['p95_ms']:>9.3f} ms  "
+            f"api {result['api_calls']:>6.2f}  write {result['io_write_bytes'] or 0:>9} B  "
+            f"alloc {result['alloc_peak_bytes'] or 0:>9} B"
+        )
+        return result
+
+    # operations
+    async def approval_resolve(self, iterations: int, alloc_iterations: int, pending: list[str]) -> dict:
+        if len(pending) < iterations + alloc_iterations:
+            raise SystemExit(f"Need at least {iterations + alloc_iterations} pending submissions, got {len(pending)}")
+        queue = iter(pending)
+
+        def setup(i):
+            submission_id = next(queue)
+            return submission_id, FakeInteraction(self.api, self.guild, self.admin), "rejected" if i % 10 == 0 else "approved"
+
+        async def run(arg):
+            submission_id, interaction, status = arg
+            await self.bot.resolve_approval(interaction, submission_id, status)
+
+        return await self.measure("resolve_approval", setup, run, iterations, alloc_iterations)
+
+    async def amount_modal_callback(self, iterations: int, alloc_iterations: int) -> dict:
+        task_items = list(self.state.tasks.items())
+
+        def setup(i):
+            task_key, task = task_items[self.rng.randrange(len(task_items))]
+            modal = self.bot.AmountModal(task_key, task)
+            modal.children[0].value = str(self.rng.randint(1, 5))
+            return modal, FakeInteraction(self.api, self.guild, self.random_member())
+
+        async def run(arg):
+            modal, interaction = arg
+            await modal.callback(interaction)
+
+        return await self.measure("AmountModal.callback", setup, run, iterations, alloc_iterations)
+
+    async def build_leaderboard_embed(self, iterations: int, alloc_iterations: int) -> dict:
+        task_keys = list(self.state.tasks)
+        index     = self.state.ranks["weekly"]
+
+        def setup(i):
+            # An approval lands between views, so cached pages go stale as they do live.
+            self.state.record(
+                "award",
+                member_id = MEMBER_BASE + self.rng.randrange(self.member_count),
+                task_key  = task_keys[self.rng.randrange(len(task_keys))],
+                amount    = 1,
+                points    = self.rng.randint(1, 50),
+            )
+            return self.rng.randrange(min(index.total_pages, 5)) if i % 2 else self.rng.randrange(index.total_pages)
+
+        async def run(page):
+            self.bot.build_leaderboard_embed(
+                self.guild, "weekly", "📅 Weekly Leaderboard", self.bot.discord.Color.blue(), "", page,
+            )
+
+        return await self.measure("build_leaderboard_embed", setup, run, iterations, alloc_iterations)
+
+    async def update_open_tasks_channel(self, iterations: int, alloc_iterations: int) -> dict:
+        task_items = list(self.state.tasks.items())
+
+        def setup(i):
+            task_key, task = task_items[self.rng.randrange(len(task_items))]
+            self.state.put_task(Task(task_key, task.name, task.points % 50 + 1, task.max_completions))
+
+        async def run(_):
+            await self.bot.update_open_tasks_channel(self.guild)
+
+        return await self.measure("update_open_tasks_channel", setup, run, iterations, alloc_iterations)
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_suite(args, data_dir: str) -> dict:
+    rng     = random.Random(args.seed)
+    dataset = {**PRESETS[args.preset]}
+    for key in dataset:
+        if getattr(args, key) is not None:
+            dataset[key] = getattr(args, key)
+    pending_needed = args.iterations + args.alloc_iterations
+
+    bot   = load_bot(data_dir, args.backend, args.window)
+    from storage import open_storage
+    api   = Api()
+    guild = FakeGuild(api, dataset["members"], [
+        bot.TASK_CHANNEL_NAME, bot.OPEN_TASKS_CHANNEL_NAME, bot.CLAIM_CHANNEL_NAME,
+        bot.APPROVAL_CHANNEL_NAME, bot.WEEKLY_CHANNEL_NAME, bot.MONTHLY_CHANNEL_NAME,
+    ])
+    print(f"Seeding {dataset} ({args.backend}) …")
+    started = time.perf_counter()
+    store   = open_storage(args.backend, os.path.join(data_dir, str(guild.id)))
+    pending = seed_store(
+        store, rng, make_tasks(dataset["tasks"]), dataset["members"],
+        max(dataset["submissions"], pending_needed), pending_needed,
+    )
+    store.close()
+    seeded = time.perf_counter() - started
+    started = time.perf_counter()
+    bench  = Bench(bot, api, guild, data_dir, rng, dataset["members"])
+    loaded = time.perf_counter() - started
+    print(f"Seeded in {seeded:.1f} s, guild state loaded in {loaded * 1000:.0f} ms")
+
+    # Production pacing would hold every channel to 5 calls per 5 s; only the work is measured here.
+    bot.outbound.route_capacity = 10 ** 9
+    bot.states.start()
+    bot.outbound.start()
+    # Publish the panels once, as on startup, so each operation measures steady state.
+    await bot.update_open_tasks_channel(guild)
+    await bot.update_leaderboard_channel(guild, "weekly")
+    await bot.update_leaderboard_channel(guild, "monthly")
+
+    results = {}
+    try:
+        results["approval_resolve"]          = await bench.approval_resolve(args.iterations, args.alloc_iterations, pending)
+        results["amount_modal_callback"]     = await bench.amount_modal_callback(args.iterations, args.alloc_iterations)
+        results["build_leaderboard_embed"]   = await bench.build_leaderboard_embed(args.iterations, args.alloc_iterations)
+        results["update_open_tasks_channel"] = await bench.update_open_tasks_channel(args.iterations, args.alloc_iterations)
+    finally:
+        await bot.outbound.close()
+        await bot.states.close()
+    return {
+        "meta": {
+            "created_at":      datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision":    git_revision(),
+            "python":          platform.python_version(),
+            "platform":        platform.platform(),
+            "backend":         args.backend,
+            "preset":          args.preset,
+            "dataset":         dataset,
+            "iterations":      args.iterations,
+            "window":          args.window,
+            "seed":            args.seed,
+            "seed_seconds":    round(seeded, 2),
+            "load_ms":         round(loaded * 1000, 1),
+        },
+        "results": results,
+    }
+
+
+# ── Comparison ────────────────────────────────────────────────────
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """Print metric changes per operation; returns the regressions."""
+    regressions = []
+    print(f"\nCompared with {baseline['meta'].get('git_revision')} ({baseline['meta'].get('created_at')}):")
+    for key in ("backend", "dataset", "window"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"  ⚠️ {key} differs: {baseline['meta'].get(key)} → {current['meta'].get(key)}")
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        for metric, noise in COMPARED.items():
+            before, after = old.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            flag   = ""
+            if change > tolerance and after - before > noise:
+                flag = "  ⚠️ regression"
+                regressions.append(f"{name}.{metric}")
+            print(f"  {name:<28} {metric:<18} {before:>12} → {after:<12} {change:+.1%}{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the bot's hot handlers")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--members", type=int, help="override the preset's member count")
+    parser.add_argument("--submissions", type=int, help="override the preset's submission count")
+    parser.add_argument("--tasks", type=int, help="override the preset's task count")
+    parser.add_argument("--backend", choices=["sqlite", "json"], default="sqlite")
+    parser.add_argument("--iterations", type=int, default=200, help="timed calls per operation")
+    parser.add_argument("--alloc-iterations", type=int, default=50, help="traced calls per operation")
+    parser.add_argument("--window", type=float, default=0.0,
+                        help="mutation batch window in seconds (0 measures the work, not the wait)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="results file (default: bench_results/<time>-<preset>.json)")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown before failing")
+    parser.add_argument("--keep-data", action="store_true", help="keep the generated data directory")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="bot-bench-")
+    try:
+        report = asyncio.run(run_suite(args, data_dir))
+    finally:
+        if args.keep_data:
+            print(f"Data kept in {data_dir}")
+        else:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    output = args.output or os.path.join(
+        ROOT, "bench_results", f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{args.preset}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
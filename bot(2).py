@@ -1,15 +1,62 @@
 import discord
-from discord.ext import tasks
+import asyncio
+import functools
+import hashlib
+import io
+import itertools
 import json
+import logging
 import os
+import threading
+import time
+import traceback
 from datetime import datetime, timedelta
 import pytz
 
+from approvals import approval_custom_id, approval_target
+from leaderboard import RankIndex, RefreshScheduler
+from members import MemberCache, MemberIdentity, identity_of
+from metrics import Metrics, MetricsServer, SamplingProfiler, TimedProxy
+from models import Submission, Task
+from outbound import PANEL, USER, OutboundScheduler
+from resets import ResetScheduler, epoch_label, last_deadline
+from shards import PartitionLocked, ShardBus, shard_for
+from state import GuildStates, StateCache
+import stats
+from storage import open_legacy_storage
+from tracing import TraceRecorder
+
 # ── Configuration ────────────────────────────────────────────────
 BOT_TOKEN = os.environ.get('BOT_TOKEN')  # Railway liest aus Environment Variables
 BOT_TOKEN = os.environ.get('BOT_TOKEN')  # Railway liest aus Environment Variables
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "sqlite")  # "sqlite" or "json"
+DATA_DIR = os.environ.get("DATA_DIR", "data")  # one sub-directory per guild
+LEGACY_GUILD_ID = os.environ.get("LEGACY_GUILD_ID")  # guild that receives the old bot-wide JSON files
+TASKS_FILE = "tasks.json"
 POINTS_FILE = "points.json"
 SUBMISSIONS_FILE = "submissions.json"
+STATE_FLUSH_INTERVAL = float(os.environ.get("STATE_FLUSH_INTERVAL", "2.0"))  # seconds
+STATE_DURABILITY = os.environ.get("STATE_DURABILITY", "normal")  # "off", "normal" or "full"
+LEDGER_SNAPSHOT_EVERY = int(os.environ.get("LEDGER_SNAPSHOT_EVERY", "500"))  # ledger entries between snapshots
+MUTATION_BATCH_WINDOW = float(os.environ.get("MUTATION_BATCH_WINDOW", "0.05"))  # seconds per group commit
+ARCHIVE_RETENTION = int(os.environ.get("ARCHIVE_RETENTION", "12"))  # closed weeks / months kept per period
+LEADERBOARD_PAGE_SIZE = 20
+LEADERBOARD_REFRESH_INTERVAL = float(os.environ.get("LEADERBOARD_REFRESH_INTERVAL", "15"))  # seconds between edits
+OUTBOUND_WORKERS = int(os.environ.get("OUTBOUND_WORKERS", "4"))
+OUTBOUND_ROUTE_CAPACITY = 5  # calls per channel and kind (sends, message changes) ...
+OUTBOUND_ROUTE_PERIOD = 5.0  # ... per this many seconds
+MEMBER_CACHE_SIZE = int(os.environ.get("MEMBER_CACHE_SIZE", "10000"))  # member names / avatars kept
+MEMBER_CACHE_TTL = float(os.environ.get("MEMBER_CACHE_TTL", "21600"))  # seconds before a cached member is re-read
+MEMBER_CHUNK_SIZE = 100  # ids per gateway member request (Discord's limit)
+GUILD_INIT_CONCURRENCY = int(os.environ.get("GUILD_INIT_CONCURRENCY", "8"))  # guilds bootstrapped at once
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")  # Prometheus endpoint, local by default
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9108"))  # 0 disables the endpoint
+PROFILE_MAX_SECONDS = 60
+TRACE_FILE = os.environ.get("TRACE_FILE")  # opt-in: log anonymized interactions for replay.py
+SHARD_ID = int(os.environ.get("SHARD_ID", "0"))  # set per process by shards.py
+SHARD_COUNT = int(os.environ.get("SHARD_COUNT", "1"))  # shard processes sharing DATA_DIR
+IPC_DIR = os.environ.get("IPC_DIR", os.path.join(DATA_DIR, ".ipc"))  # sockets of the shard bus
+PARTITION_LOCK_TIMEOUT = float(os.environ.get("PARTITION_LOCK_TIMEOUT", "30"))  # seconds to wait for a guild held elsewhere
 ADMIN_ROLE_NAME = "leadership teammember"
 TASK_CHANNEL_NAME = "task-creation"
 OPEN_TASKS_CHANNEL_NAME = "open-tasks"
@@ -19,233 +66,584 @@ WEEKLY_CHANNEL_NAME = "weakly-leaderboard"
 MONTHLY_CHANNEL_NAME = "monthly-leaderboard"
 TIMEZONE = pytz.timezone("Europe/Berlin")
 
+if SHARD_COUNT > 1:
+    # Every shard process serves its own metrics and writes its own trace.
+    METRICS_PORT = METRICS_PORT + SHARD_ID if METRICS_PORT else 0
+    if TRACE_FILE:
+        root, ext  = os.path.splitext(TRACE_FILE)
+        TRACE_FILE = f"{root}.shard{SHARD_ID}{ext}"
+
+
+# ── Metrics ──────────────────────────────────────────────────────
+# Interaction callbacks, storage calls and Discord REST calls are timed
+# into histograms; METRICS_PORT serves them to Prometheus and /metrics
+# summarizes them for admins.
+metrics = Metrics()
+metrics.describe("interaction_seconds", "Time spent in interaction callbacks and slash commands")
+metrics.describe("storage_seconds", "Time spent in storage calls, by operation")
+metrics.describe("discord_request_seconds", "Discord REST request latency, including rate limit waits")
+metrics.describe("discord_rate_limits_total", "429 responses from Discord, by scope")
+
+
+# ── Interaction Tracing ───────────────────────────────────────────
+# With TRACE_FILE set, every callback is logged as a ``ui`` event, and
+# claims, reviews and resets additionally carry what replay.py needs to
+# drive them again. Ids are pseudonymized before they are written.
+tracer = TraceRecorder(TRACE_FILE)
+
+
+def timed_interaction(func):
+    """Time a callback into the metrics and, when tracing, log it."""
+    timed = metrics.track("interaction")(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await timed(*args, **kwargs)
+        finally:
+            if tracer.enabled:
+                # The interaction is the last argument; autocomplete passes a context around it.
+                interaction = getattr(args[-1], "interaction", args[-1])
+                guild       = tracer.anon("g", interaction.guild.id) if interaction.guild else None
+                tracer.record("ui", interaction, guild=guild, handler=func.__qualname__)
+
+    return wrapper
+
+
+# ── Storage ──────────────────────────────────────────────────────
+states = GuildStates(
+    STORAGE_BACKEND,
+    DATA_DIR,
+    durability        = STATE_DURABILITY,
+    flush_interval    = STATE_FLUSH_INTERVAL,
+    snapshot_every    = LEDGER_SNAPSHOT_EVERY,
+    page_size         = LEADERBOARD_PAGE_SIZE,
+    window            = MUTATION_BATCH_WINDOW,
+    archive_retention = ARCHIVE_RETENTION,
+    instrument        = lambda store: TimedProxy(store, metrics, "storage"),
+)
+
+
+def guild_state(guild: discord.Guild) -> StateCache:
+    return states.get(guild.id)
+
+
+def import_legacy_store(guilds: list[discord.Guild]) -> None:
+    """Move the old bot-wide files into one guild's partition, once."""
+    source = open_legacy_storage(DATA_DIR, TASKS_FILE, POINTS_FILE, SUBMISSIONS_FILE)
+    if source is None:
+        return
+    try:
+        if LEGACY_GUILD_ID:
+            guild_id = int(LEGACY_GUILD_ID)
+        elif len(guilds) == 1 and SHARD_COUNT == 1:
+            guild_id = guilds[0].id
+        else:
+            print("⚠️ Legacy data found but the bot is in several guilds; set LEGACY_GUILD_ID to import it.")
+            return
+        if shard_for(guild_id, SHARD_COUNT) != SHARD_ID:
+            return  # the shard serving that guild imports it
+        if guild_id in states:
+            return  # already loaded, so already imported on an earlier start
+        counts = states.import_legacy(guild_id, source)
+        if counts:
+            print(f"📦 Imported legacy data into guild {guild_id}: {counts}")
+    finally:
+        source.close()
+
+
+# ── Outbound Requests ────────────────────────────────────────────
+# Interaction responses are awaited directly; every other REST call goes
+# through the scheduler so member-facing sends overtake panel refreshes.
+outbound = OutboundScheduler(
+    workers        = OUTBOUND_WORKERS,
+    route_capacity = OUTBOUND_ROUTE_CAPACITY,
+    route_period   = OUTBOUND_ROUTE_PERIOD,
+)
+
+
+# Discord limits sends to a channel and changes to its messages in
+# separate buckets, so each gets its own budget.
+def channel_route(channel: discord.abc.Messageable) -> str:
+    return f"channel:{channel.id}"
+
 
-# ── File Helpers ─────────────────────────────────────────────────
-def load_tasks() -> dict:
-    if os.path.exists(TASKS_FILE):
-        with open(TASKS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-def save_tasks(tasks: dict) -> None:
-    os.makedirs(os.path.dirname(TASKS_FILE), exist_ok=True)
-    with open(TASKS_FILE, "w", encoding="utf-8") as f:
-        json.dump(tasks, f, ensure_ascii=False, indent=2)
-
-def load_points() -> dict:
-    if os.path.exists(POINTS_FILE):
-        with open(POINTS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {"weekly": {}, "monthly": {}}
-
-def save_points(points: dict) -> None:
-    os.makedirs(os.path.dirname(POINTS_FILE), exist_ok=True)
-    with open(POINTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(points, f, ensure_ascii=False, indent=2)
-
-def load_submissions() -> dict:
-    if os.path.exists(SUBMISSIONS_FILE):
-        with open(SUBMISSIONS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-def save_submissions(submissions: dict) -> None:
-    os.makedirs(os.path.dirname(SUBMISSIONS_FILE), exist_ok=True)
-    with open(SUBMISSIONS_FILE, "w", encoding="utf-8") as f:
-        json.dump(submissions, f, ensure_ascii=False, indent=2)
+def message_route(channel: discord.abc.Messageable) -> str:
+    return f"message:{channel.id}"
+
+
+def load_tasks(guild: discord.Guild) -> dict:
+    return guild_state(guild).tasks
 
 def has_admin_role(interaction: discord.Interaction) -> bool:
     role = discord.utils.get(interaction.guild.roles, name=ADMIN_ROLE_NAME)
     return role is not None and role in interaction.user.roles
 
-def ensure_points_structure(points: dict) -> dict:
-    if "weekly" not in points:
-        points["weekly"] = {}
-    if "monthly" not in points:
-        points["monthly"] = {}
-    return points
-
 
 # ── Bot ──────────────────────────────────────────────────────────
+class PointsBot(discord.Bot):
+    async def close(self):
+        # Publish the latest standings, then persist anything still waiting.
+        try:
+            await leaderboard_refresh.flush()
+        except Exception as e:
+            print(f"⚠️ Final leaderboard refresh failed: {e}")
+        tracer.close()
+        try:
+            await resets.close()
+            await bus.close()
+            await metrics_server.close()
+            await outbound.close()
+            await states.close()
+        except Exception as e:
+            print(f"⚠️ Final state flush failed: {e}")
+        await super().close()
+
+
 intents = discord.Intents.default()
 intents.members = True
-bot = discord.Bot(intents=intents)
+bot = PointsBot(intents=intents, shard_id=SHARD_ID, shard_count=SHARD_COUNT)
+
+
+# ── Message Registry ──────────────────────────────────────────────
+# Live panels are remembered per guild as (channel_id, message_id) and
+# edited in place; the channel history is only scanned when the stored
+# message is gone. Each render is fingerprinted and compared with what
+# this process last sent, so unchanged panels cost no API call at all.
+_sent_digests = {}  # (guild_id, kind) -> (message_id, digest)
+
+
+def fingerprint(embed: discord.Embed | None = None, view: discord.ui.View | None = None, content: str | None = None) -> str:
+    payload = {
+        "content":    content,
+        "embed":      embed.to_dict() if embed else None,
+        "components": view.to_components() if view else None,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+async def discover_message(channel: discord.TextChannel, match, limit: int = 50) -> discord.Message | None:
+    async for msg in channel.history(limit=limit):
+        if msg.author == bot.user and match(msg):
+            return msg
+    return None
+
+
+async def publish_message(channel: discord.TextChannel, kind: str, match, digest: str | None = None, **fields):
+    guild_id = channel.guild.id
+    key      = (guild_id, kind)
+    digest   = digest or fingerprint(fields.get("embed"), fields.get("view"), fields.get("content"))
+    state    = guild_state(channel.guild)
+    entry    = state.get_message(guild_id, kind)
+    if entry and entry["channel_id"] == channel.id:
+        if _sent_digests.get(key) == (entry["message_id"], digest):
+            return None
+        partial = channel.get_partial_message(entry["message_id"])
+        try:
+            msg = await outbound.call(lambda: partial.edit(**fields), PANEL, message_route(channel))
+            _sent_digests[key] = (entry["message_id"], digest)
+            return msg
+        except discord.NotFound:
+            state.forget_message(guild_id, kind)
+            _sent_digests.pop(key, None)
+    msg = await discover_message(channel, match)
+    if msg:
+        await outbound.call(lambda: msg.edit(**fields), PANEL, message_route(channel))
+    else:
+        msg = await outbound.call(lambda: channel.send(**fields), PANEL, channel_route(channel))
+    state.put_message(guild_id, kind, channel.id, msg.id)
+    _sent_digests[key] = (msg.id, digest)
+    return msg
+
+
+def embed_titled(title: str):
+    return lambda msg: bool(msg.embeds) and msg.embeds[0].title == title
+
+
+# ── Member Identities ─────────────────────────────────────────────
+# Names and avatars come from this cache, kept current by member events
+# and filled in batches over the gateway, never by one REST call each.
+members          = MemberCache(MEMBER_CACHE_SIZE, MEMBER_CACHE_TTL)
+_member_requests = {}     # guild_id -> member ids waiting for the next batch
+_member_lookups  = set()  # running batch lookups, held until they finish
+
+
+def member_identity(guild: discord.Guild, member_id: int) -> MemberIdentity | None:
+    known, identity = members.lookup(guild.id, member_id)
+    if known:
+        return identity
+    member = guild.get_member(member_id)
+    if member is not None:
+        identity = identity_of(member)
+        members.put(guild.id, identity)
+        return identity
+    request_members(guild, [member_id])
+    return None
+
+
+def request_members(guild: discord.Guild, member_ids) -> None:
+    """Queue ids for one batched lookup; renders redraw once it lands."""
+    pending = _member_requests.get(guild.id)
+    if pending is None:
+        pending = _member_requests[guild.id] = set()
+        task = asyncio.create_task(_resolve_requested_members(guild))
+        _member_lookups.add(task)
+        task.add_done_callback(_member_lookup_done)
+    pending.update(member_ids)
+
+
+def _member_lookup_done(task: asyncio.Task) -> None:
+    _member_lookups.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"⚠️ Member batch lookup failed: {task.exception()}")
+
+
+async def _resolve_requested_members(guild: discord.Guild):
+    await asyncio.sleep(0)  # let the rest of the render queue its ids
+    member_ids = _member_requests.pop(guild.id, set())
+    if await warm_members(guild, member_ids):
+        leaderboard_refresh.mark(guild, "weekly")
+        leaderboard_refresh.mark(guild, "monthly")
+
+
+async def warm_members(guild: discord.Guild, member_ids) -> int:
+    """Load the given members in gateway chunks; returns how many were found."""
+    missing = [member_id for member_id in member_ids if not members.lookup(guild.id, member_id)[0]]
+    found   = 0
+    for start in range(0, len(missing), MEMBER_CHUNK_SIZE):
+        chunk = missing[start : start + MEMBER_CHUNK_SIZE]
+        try:
+            result = await guild.query_members(user_ids=chunk, limit=len(chunk), cache=True)
+        except Exception as e:
+            print(f"⚠️ Member lookup failed in {guild.name}: {e}")
+            continue
+        for member in result:
+            members.put(guild.id, identity_of(member))
+        for member_id in set(chunk) - {member.id for member in result}:
+            members.put_missing(guild.id, member_id)
+        found += len(result)
+    return found
 
 
 # ── Leaderboard Helpers ───────────────────────────────────────────
+_leaderboard_pages = {}  # (guild_id, period, page) -> ((page version, name generation), rendered rows)
+
+
+def leaderboard_page_description(guild: discord.Guild, period: str, page: int) -> str:
+    index   = guild_state(guild).ranks[period]
+    version = (index.page_version(page), members.generation(guild.id))
+    key     = (guild.id, period, page)
+    cached  = _leaderboard_pages.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+    description = rank_page_description(guild, index, page)
+    _leaderboard_pages[key] = (version, description)
+    return description
+
+
+def rank_page_description(guild: discord.Guild, index: RankIndex, page: int) -> str:
+    rows = index.page(page)
+    if rows:
+        medals = {1: "🥇", 2: "🥈", 3: "🥉"}
+        lines  = []
+        for offset, (member_id, pts) in enumerate(rows):
+            rank   = page * index.page_size + offset + 1
+            member = member_identity(guild, member_id)
+            name   = member.display_name if member else f"User {member_id}"
+            icon   = medals.get(rank, f"**#{rank}**")
+            lines.append(f"{icon} {name} — **{pts} pts**")
+        description = "\n".join(lines)
+    else:
+        description = "*No points have been awarded yet.*"
+    return description
+
+
 def build_leaderboard_embed(
     guild: discord.Guild,
     period: str,
-    points_data: dict,
     title: str,
     color: discord.Color,
     footer: str = "",
+    page: int = 0,
+    index: RankIndex | None = None,
 ) -> discord.Embed:
-    bucket = points_data.get(period, {})
-    sorted_members = sorted(
-        [(mid, data) for mid, data in bucket.items()],
-        key=lambda x: x[1].get("total_points", 0),
-        reverse=True,
-    )
-    embed = discord.Embed(title=title, color=color)
-    if not sorted_members or all(d.get("total_points", 0) == 0 for _, d in sorted_members):
-        embed.description = "*No points have been awarded yet.*"
+    # Without an explicit index this renders the live standings (cached per page).
+    if index is None:
+        total_pages = guild_state(guild).ranks[period].total_pages
+        description = leaderboard_page_description(guild, period, page)
     else:
-        medals = {1: "🥇", 2: "🥈", 3: "🥉"}
-        lines = []
-        rank = 1
-        for member_id, data in sorted_members:
-            pts = data.get("total_points", 0)
-            if pts == 0:
-                continue
-            member = guild.get_member(int(member_id))
-            name   = member.display_name if member else f"User {member_id}"
-            icon   = medals.get(rank, f"**#{rank}**")
-            lines.append(f"{icon} {name} — **{pts} pts**")
-            rank += 1
-        embed.description = "\n".join(lines) if lines else "*No points have been awarded yet.*"
+        total_pages = index.total_pages
+        description = rank_page_description(guild, index, page)
+    embed = discord.Embed(title=title, color=color, description=description)
+    if total_pages > 1:
+        footer = f"Page {page + 1} / {total_pages}" + (f" · {footer}" if footer else "")
     if footer:
         embed.set_footer(text=footer)
     return embed
 
 
-async def update_leaderboard_channel(guild: discord.Guild, period: str):
-    channel_name = WEEKLY_CHANNEL_NAME if period == "weekly" else MONTHLY_CHANNEL_NAME
-    channel = discord.utils.get(guild.text_channels, name=channel_name)
-    if not channel:
-        return
-    points_data = load_points()
-    now_local   = datetime.now(TIMEZONE)
+def live_leaderboard_embed(guild: discord.Guild, period: str, page: int = 0, stamped: bool = True) -> discord.Embed:
+    now_local = datetime.now(TIMEZONE)
     if period == "weekly":
         title  = "📅 Weekly Leaderboard"
         color  = discord.Color.blue()
-        footer = f"Resets every Monday at 19:00 · Last updated: {now_local.strftime('%d.%m.%Y %H:%M')}"
+        footer = "Resets every Monday at 19:00"
     else:
         title  = "🗓️ Monthly Leaderboard"
         color  = discord.Color.purple()
-        footer = f"Resets on the 1st of each month at 20:00 · Last updated: {now_local.strftime('%d.%m.%Y %H:%M')}"
-    embed = build_leaderboard_embed(guild, period, points_data, title, color, footer)
-    live_msg = None
-    async for msg in channel.history(limit=50):
-        if msg.author == bot.user and msg.embeds:
-            if msg.embeds[0].title and "FINAL STANDINGS" not in msg.embeds[0].title:
-                live_msg = msg
-                break
-    if live_msg:
-        await live_msg.edit(embed=embed)
-    else:
-        await channel.send(embed=embed)
+        footer = "Resets on the 1st of each month at 20:00"
+    if stamped:
+        footer += f" · Last updated: {now_local.strftime('%d.%m.%Y %H:%M')}"
+    return build_leaderboard_embed(guild, period, title, color, footer, page)
 
 
-async def reset_leaderboard(guild: discord.Guild, period: str):
+async def update_leaderboard_channel(guild: discord.Guild, period: str):
     channel_name = WEEKLY_CHANNEL_NAME if period == "weekly" else MONTHLY_CHANNEL_NAME
     channel = discord.utils.get(guild.text_channels, name=channel_name)
     if not channel:
         return
-    points_data = load_points()
-    now_local   = datetime.now(TIMEZONE)
+    embed = live_leaderboard_embed(guild, period)
+    view  = LeaderboardView(period) if guild_state(guild).ranks[period].total_pages > 1 else discord.ui.View()
+    # The "Last updated" stamp alone is not a reason to edit.
+    await publish_message(
+        channel, f"leaderboard:{period}",
+        lambda msg: bool(msg.embeds) and bool(msg.embeds[0].title) and "FINAL STANDINGS" not in msg.embeds[0].title,
+        digest = fingerprint(live_leaderboard_embed(guild, period, stamped=False), view),
+        embed  = embed,
+        view   = view,
+    )
+
+
+leaderboard_refresh = RefreshScheduler(update_leaderboard_channel, LEADERBOARD_REFRESH_INTERVAL)
+
+
+class LeaderboardNavButton(discord.ui.Button):
+    def __init__(self, label: str, custom_id: str, period: str, target_page: int):
+        super().__init__(label=label, style=discord.ButtonStyle.grey, custom_id=custom_id)
+        self.period      = period
+        self.target_page = target_page
+
+    @timed_interaction
+    async def callback(self, interaction: discord.Interaction):
+        total_pages = guild_state(interaction.guild).ranks[self.period].total_pages
+        page        = min(self.target_page, total_pages - 1)
+        new_view    = LeaderboardPageView(interaction.guild, self.period, page)
+        embed       = live_leaderboard_embed(interaction.guild, self.period, page)
+        if isinstance(self.view, LeaderboardView):
+            # The channel message always shows the top; browsing happens privately.
+            await interaction.response.send_message(embed=embed, view=new_view, ephemeral=True)
+        else:
+            await interaction.response.edit_message(embed=embed, view=new_view)
+
+
+class LeaderboardView(discord.ui.View):
+    def __init__(self, period: str):
+        super().__init__(timeout=None)
+        self.add_item(LeaderboardNavButton("Next ▶", f"lb_{period}_next", period, 1))
+
+
+class LeaderboardPageView(discord.ui.View):
+    def __init__(self, guild: discord.Guild, period: str, page: int):
+        super().__init__(timeout=120)
+        total_pages = guild_state(guild).ranks[period].total_pages
+        if page > 0:
+            self.add_item(LeaderboardNavButton("◀ Previous", "lb_page_prev", period, page - 1))
+        if page < total_pages - 1:
+            self.add_item(LeaderboardNavButton("Next ▶", "lb_page_next", period, page + 1))
+
+
+async def reset_leaderboard(guild: discord.Guild, period: str, deadline: datetime | None = None):
+    started = time.perf_counter()
+    channel_name = WEEKLY_CHANNEL_NAME if period == "weekly" else MONTHLY_CHANNEL_NAME
+    channel = discord.utils.get(guild.text_channels, name=channel_name)
+    now_local = datetime.now(TIMEZONE)
+    closed_at = deadline.astimezone(TIMEZONE) if deadline else now_local
+    state     = guild_state(guild)
+    # The closing epoch began at the previous reset.
+    last   = state.last_reset(period)
+    opened = datetime.fromtimestamp(last, TIMEZONE) if last is not None else last_deadline(period, closed_at - timedelta(seconds=1))
+    epoch  = epoch_label(period, opened)
+    await state.mutations.submit(state.reset_period, period, deadline.timestamp() if deadline else None, epoch)
+    tracer.record("reset", duration=time.perf_counter() - started, guild=tracer.anon("g", guild.id), period=period)
+    if not channel:
+        return
     if period == "weekly":
-        snapshot_title = f"📅 FINAL STANDINGS — Week ending {now_local.strftime('%d.%m.%Y')}"
+        snapshot_title = f"📅 FINAL STANDINGS — Week ending {closed_at.strftime('%d.%m.%Y')}"
         color          = discord.Color.blue()
     else:
-        snapshot_title = f"🗓️ FINAL STANDINGS — {now_local.strftime('%B %Y')}"
+        snapshot_title = f"🗓️ FINAL STANDINGS — {closed_at.strftime('%B %Y')}"
         color          = discord.Color.purple()
+    _, archive = state.archived[period]
     snapshot_embed = build_leaderboard_embed(
-        guild, period, points_data,
+        guild, period,
         title  = snapshot_title,
         color  = color,
         footer = f"Archived on {now_local.strftime('%d.%m.%Y at %H:%M')}",
+        index  = archive,
     )
-    await channel.send(embed=snapshot_embed)
-    for member_id in points_data.get(period, {}):
-        points_data[period][member_id]["total_points"] = 0
-        points_data[period][member_id]["completions"]  = {}
-    save_points(points_data)
+    await outbound.call(lambda: channel.send(embed=snapshot_embed), USER, channel_route(channel))
     await update_leaderboard_channel(guild, period)
 
 
 # ── Scheduled Resets ──────────────────────────────────────────────
-@tasks.loop(minutes=1)
-async def check_resets():
-    now = datetime.now(TIMEZONE)
-    is_weekly_reset  = (now.weekday() == 0 and now.hour == 19 and now.minute == 0)
-    is_monthly_reset = (now.day == 1      and now.hour == 20 and now.minute == 0)
-    for guild in bot.guilds:
-        if is_weekly_reset:
-            await reset_leaderboard(guild, "weekly")
-        if is_monthly_reset:
-            await reset_leaderboard(guild, "monthly")
+resets = ResetScheduler(
+    reset_leaderboard,
+    targets   = lambda: [guild for guild in bot.guilds if states.holds(guild.id)],
+    state_for = guild_state,
+    tz        = TIMEZONE,
+)
+
+
+# ── Shards ────────────────────────────────────────────────────────
+# shards.py runs one process per shard over the same DATA_DIR. Discord
+# sends each guild to one shard, and that process holds the guild's
+# partition lock. After a change of SHARD_COUNT a guild's new owner asks
+# over the bus for it; the old holder commits and unlocks it, then hands
+# on its pending leaderboard refreshes and any reset that came due.
+bus = ShardBus(IPC_DIR, SHARD_ID)
+
+
+async def claim_guild(guild_id: int) -> bool:
+    if states.try_lock(guild_id):
+        return True
+    print(f"🧩 Guild {guild_id} is held by another process, asking for it")
+    bus.publish("release", guild=guild_id)
+    try:
+        await states.acquire(guild_id, PARTITION_LOCK_TIMEOUT)
+    except PartitionLocked as e:
+        print(f"⚠️ {e}")
+        return False
+    return True
+
+
+async def on_release_request(message: dict):
+    guild_id = message["guild"]
+    guild    = bot.get_guild(guild_id)
+    refresh  = [period for period in ("weekly", "monthly") if guild and leaderboard_refresh.cancel(guild, period)]
+    due      = []
+    if guild_id in states:
+        state = states.get(guild_id)
+        now   = datetime.now(TIMEZONE)
+        for period in ("weekly", "monthly"):
+            last = state.last_reset(period)
+            if last is not None and last < last_deadline(period, now).timestamp():
+                due.append(period)
+    if not await states.release(guild_id):
+        return
+    print(f"🧩 Guild {guild_id} handed over to shard {message['from']}")
+    for period in refresh:
+        bus.publish("refresh", shard=message["from"], guild=guild_id, period=period)
+    for period in due:
+        bus.publish("reset", shard=message["from"], guild=guild_id, period=period)
+
+
+async def on_refresh_notice(message: dict):
+    guild = bot.get_guild(message["guild"])
+    if guild is not None:
+        leaderboard_refresh.mark(guild, message["period"])
+
+
+async def on_reset_notice(message: dict):
+    if bot.get_guild(message["guild"]) is not None:
+        await resets.run_due()
+
+
+bus.on("release", on_release_request)
+bus.on("refresh", on_refresh_notice)
+bus.on("reset", on_reset_notice)
 
 
 # ── Remove Buttons from Old Messages ─────────────────────────────
-async def disable_old_control_messages(channel: discord.TextChannel):
+async def disable_old_control_messages(channel: discord.TextChannel, keep_id: int | None = None):
     async for msg in channel.history(limit=50):
-        if msg.author == bot.user and msg.components:
+        if msg.author == bot.user and msg.components and msg.id != keep_id:
             try:
-                await msg.edit(view=discord.ui.View())
+                await outbound.call(lambda msg=msg: msg.edit(view=discord.ui.View()), PANEL, message_route(channel))
             except discord.NotFound:
                 pass
 
 
+async def publish_panel(channel: discord.TextChannel, kind: str, embed: discord.Embed, view: discord.ui.View):
+    had_entry = guild_state(channel.guild).get_message(channel.guild.id, kind) is not None
+    msg = await publish_message(channel, kind, embed_titled(embed.title), embed=embed, view=view)
+    if not had_entry and msg is not None:
+        # First adoption of this panel: strip buttons from stale copies once.
+        await disable_old_control_messages(channel, keep_id=msg.id)
+        if kind == "claim" and not msg.pinned:
+            # Submissions scroll the panel away; a pin keeps it reachable without reposting.
+            try:
+                await outbound.call(lambda: msg.pin(reason="Claim panel"), PANEL, message_route(channel))
+            except discord.HTTPException as e:
+                print(f"⚠️ Could not pin the claim panel in {channel.guild.name}: {e}")
+
+
+# ── Task List Embeds ──────────────────────────────────────────────
+EMBED_FIELD_LIMIT = 25  # Discord rejects embeds with more fields
+
+
+def add_task_fields(embed: discord.Embed, tasks: dict):
+    """One field per task; past Discord's limit the last field counts the rest."""
+    shown = len(tasks) if len(tasks) <= EMBED_FIELD_LIMIT else EMBED_FIELD_LIMIT - 1
+    for task in itertools.islice(tasks.values(), shown):
+        max_display = "Unlimited" if task.max_completions == 0 else f"{task.max_completions}x"
+        embed.add_field(
+            name=f"📌 {task.name}",
+            value=f"⭐ **{task.points} Points** | 🔄 Max. **{max_display}**",
+            inline=False,
+        )
+    if shown < len(tasks):
+        embed.add_field(
+            name=f"… and {len(tasks) - shown} more",
+            value="Use 🔍 Search in the task picker to find them.",
+            inline=False,
+        )
+
+
 # ── Update #open-tasks ────────────────────────────────────────────
 async def update_open_tasks_channel(guild: discord.Guild):
     channel = discord.utils.get(guild.text_channels, name=OPEN_TASKS_CHANNEL_NAME)
     if not channel:
         return
-    async for msg in channel.history(limit=100):
-        if msg.author == bot.user:
-            try:
-                await msg.delete()
-            except discord.NotFound:
-                pass
-    tasks = load_tasks()
+    tasks = load_tasks(guild)
     embed = discord.Embed(title="📋 Open Orders", color=discord.Color.gold())
     if tasks:
-        for task in tasks.values():
-            max_display = "Unlimited" if task["max_completions"] == 0 else f"{task['max_completions']}x"
-            embed.add_field(
-                name=f"📌 {task['name']}",
-                value=f"⭐ **{task['points']} Points** | 🔄 Max. **{max_display}**",
-                inline=False,
-            )
+        add_task_fields(embed, tasks)
     else:
         embed.description = "*No open orders at the moment.*"
-    await channel.send(embed=embed)
+    had_entry = guild_state(guild).get_message(guild.id, "open_tasks") is not None
+    msg = await publish_message(channel, "open_tasks", embed_titled(embed.title), embed=embed)
+    if not had_entry and msg is not None:
+        # First adoption: clear out the copies the old delete-and-resend cycle left behind.
+        stale = lambda m: m.author == bot.user and m.id != msg.id
+        await outbound.call(lambda: channel.purge(limit=100, check=stale, bulk=True), PANEL, channel_route(channel))
 
 
 # ── Send Control Message (#task-creation) ────────────────────────
 async def send_control_message(channel: discord.TextChannel):
-    await disable_old_control_messages(channel)
-    tasks = load_tasks()
+    tasks = load_tasks(channel.guild)
     embed = discord.Embed(title="📋 Order Management", color=discord.Color.blurple())
     if tasks:
-        for task in tasks.values():
-            max_display = "Unlimited" if task["max_completions"] == 0 else f"{task['max_completions']}x"
-            embed.add_field(
-                name=f"📌 {task['name']}",
-                value=f"⭐ **{task['points']} Points** | 🔄 Max. **{max_display}**",
-                inline=False,
-            )
+        add_task_fields(embed, tasks)
     else:
         embed.description = "*No orders created yet.*"
-    await channel.send(embed=embed, view=TaskControlView())
+    await publish_panel(channel, "control", embed=embed, view=TaskControlView())
 
 
 # ── Send Submit Button (#claim-points) ───────────────────────────
 async def send_claim_message(channel: discord.TextChannel):
-    await disable_old_control_messages(channel)
     embed = discord.Embed(
         title="🏆 Claim Points",
         description="Completed a task? Click **Submit Task** to log your points!",
         color=discord.Color.green(),
     )
-    await channel.send(embed=embed, view=ClaimControlView())
+    await publish_panel(channel, "claim", embed=embed, view=ClaimControlView())
 
 
 # ── Build Submission Embed ────────────────────────────────────────
 def build_submission_embed(
-    member: discord.Member,
-    task: dict,
+    member: MemberIdentity,
+    task: Task,
     amount: int,
     earned_points: int,
     weekly_total: int,
@@ -262,104 +660,579 @@ def build_submission_embed(
         color      = discord.Color.orange()
         status_str = "🕐 **PENDING**"
     embed = discord.Embed(title="🏆 Task Submission", color=color)
-    embed.set_thumbnail(url=member.display_avatar.url)
+    if member.avatar_url:
+        embed.set_thumbnail(url=member.avatar_url)
     embed.add_field(name="👤 Member",                value=member.mention,             inline=True)
-    embed.add_field(name="📌 Task",                  value=task["name"],               inline=True)
+    embed.add_field(name="📌 Task",                  value=task.name,                  inline=True)
     embed.add_field(name="🔄 Submissions",           value=f"{amount}x",               inline=True)
-    embed.add_field(name="⭐ Points per Completion", value=f"{task['points']} pts",    inline=True)
+    embed.add_field(name="⭐ Points per Completion", value=f"{task.points} pts",      inline=True)
     embed.add_field(name="💰 Points Earned",         value=f"**{earned_points} pts**", inline=True)
     embed.add_field(name="\u200b",                   value="\u200b",                  inline=True)
     embed.add_field(name="📅 Weekly Total",          value=f"**{weekly_total} pts**",  inline=True)
     embed.add_field(name="🗓️ Monthly Total",        value=f"**{monthly_total} pts**", inline=True)
     embed.add_field(name="📋 Status",                value=status_str,                inline=False)
-    max_display = "Unlimited" if task["max_completions"] == 0 else f"{task['max_completions']}x"
+    max_display = "Unlimited" if task.max_completions == 0 else f"{task.max_completions}x"
     embed.set_footer(text=f"Max completions for this task: {max_display}")
     return embed
 
 
 # ── Approval View ─────────────────────────────────────────────────
+class ApprovalButton(discord.ui.Button):
+    def __init__(self, action: str, submission_id: str, **kwargs):
+        super().__init__(custom_id=approval_custom_id(action, submission_id), **kwargs)
+
+    def is_dispatchable(self) -> bool:
+        # Clicks go through approval_dispatch, not the view store.
+        return False
+
+
 class ApprovalView(discord.ui.View):
     def __init__(self, submission_id: str):
         super().__init__(timeout=None)
         self.submission_id = submission_id
+        self.add_item(ApprovalButton("approve", submission_id, label="Approved", style=discord.ButtonStyle.green, emoji="✅"))
+        self.add_item(ApprovalButton("reject", submission_id, label="Not Approved", style=discord.ButtonStyle.red, emoji="❌"))
 
-    @discord.ui.button(label="Approved", style=discord.ButtonStyle.green, emoji="✅", custom_id="btn_approve")
-    async def approve(self, button: discord.ui.Button, interaction: discord.Interaction):
-        if not has_admin_role(interaction):
-            await interaction.response.send_message(f"🚫 You need the **{ADMIN_ROLE_NAME}** role.", ephemeral=True)
-            return
-        await self._resolve(interaction, "approved")
 
-    @discord.ui.button(label="Not Approved", style=discord.ButtonStyle.red, emoji="❌", custom_id="btn_reject")
-    async def reject(self, button: discord.ui.Button, interaction: discord.Interaction):
-        if not has_admin_role(interaction):
-            await interaction.response.send_message(f"🚫 You need the **{ADMIN_ROLE_NAME}** role.", ephemeral=True)
-            return
-        await self._resolve(interaction, "rejected")
+def interaction_approval_target(interaction: discord.Interaction) -> tuple[str | None, str] | None:
+    if interaction.type is not discord.InteractionType.component or interaction.guild is None:
+        return None
+    return approval_target(
+        (interaction.data or {}).get("custom_id", ""),
+        interaction.message.id if interaction.message is not None else None,
+        lambda message_id: guild_state(interaction.guild).submission_for_approval(message_id),
+    )
 
-    async def _resolve(self, interaction: discord.Interaction, status: str):
-        submissions = load_submissions()
-        sub = submissions.get(self.submission_id)
-        if not sub:
-            await interaction.response.send_message("⚠️ Submission not found.", ephemeral=True)
-            return
-        if sub["status"] != "pending":
-            await interaction.response.send_message("⚠️ Already reviewed.", ephemeral=True)
-            return
-        points_data = ensure_points_structure(load_points())
-        member_id   = sub["member_id"]
-        task        = sub["task"]
-        task_key    = sub["task_key"]
-        amount      = sub["amount"]
-        earned      = sub["earned_points"]
-        if status == "approved":
-            for period in ("weekly", "monthly"):
-                if member_id not in points_data[period]:
-                    points_data[period][member_id] = {"total_points": 0, "completions": {}}
-                points_data[period][member_id]["total_points"] += earned
-                prev = points_data[period][member_id]["completions"].get(task_key, 0)
-                points_data[period][member_id]["completions"][task_key] = prev + amount
-        else:
-            for period in ("weekly", "monthly"):
-                if member_id in points_data.get(period, {}):
-                    prev = points_data[period][member_id]["completions"].get(task_key, 0)
-                    points_data[period][member_id]["completions"][task_key] = max(0, prev - amount)
-        save_points(points_data)
-        weekly_total  = points_data["weekly"].get(member_id,  {}).get("total_points", 0)
-        monthly_total = points_data["monthly"].get(member_id, {}).get("total_points", 0)
-        sub["status"]      = status
-        sub["reviewed_by"] = interaction.user.display_name
-        submissions[self.submission_id] = sub
-        save_submissions(submissions)
+
+@bot.listen("on_interaction")
+async def on_approval_interaction(interaction: discord.Interaction):
+    target = interaction_approval_target(interaction)
+    if target is not None:
+        await approval_dispatch(*target, interaction)
+
+
+@timed_interaction
+async def approval_dispatch(submission_id: str | None, status: str, interaction: discord.Interaction):
+    if not has_admin_role(interaction):
+        await interaction.response.send_message(f"🚫 You need the **{ADMIN_ROLE_NAME}** role.", ephemeral=True)
+        return
+    if submission_id is None:
+        await interaction.response.send_message(
+            "⚠️ This approval message predates the current buttons and cannot be matched to its submission. "
+            "Use **/review** to approve or reject it.",
+            ephemeral=True,
+        )
+        return
+    await resolve_approval(interaction, submission_id, status)
+
+
+async def resolve_approval(interaction: discord.Interaction, submission_id: str, status: str):
+    guild   = interaction.guild
+    sub     = guild_state(guild).submissions.get(submission_id)
+    outcome = await review_approval(interaction, submission_id, status)
+    if tracer.enabled and sub is not None:
+        tracer.record(
+            "review", interaction,
+            guild    = tracer.anon("g", guild.id),
+            reviewer = tracer.anon("m", interaction.user.id),
+            status   = status,
+            outcome  = outcome,
+            **tracer.submission_fields(guild.id, submission_id, sub),
+        )
+
+
+async def review_approval(interaction: discord.Interaction, submission_id: str, status: str) -> str:
+    state = guild_state(interaction.guild)
+    outcome, sub, weekly_total, monthly_total = await state.mutations.submit(
+        state.review_submission,
+        submission_id, status, str(interaction.user.id), interaction.user.display_name,
+    )
+    if outcome == "missing" and await state.resolved_status(submission_id) is not None:
+        # Reviewed before a restart: the button outlived the in-memory record.
+        outcome = "reviewed"
+    if outcome == "missing":
+        await interaction.response.send_message("⚠️ Submission not found.", ephemeral=True)
+        return outcome
+    if outcome == "reviewed":
+        await interaction.response.send_message("⚠️ Already reviewed.", ephemeral=True)
+        return outcome
+    new_embed = reviewed_embed(interaction.guild, sub, status, weekly_total, monthly_total, interaction.user.display_name)
+    await interaction.response.edit_message(embed=new_embed, view=discord.ui.View())
+    claim_channel = discord.utils.get(interaction.guild.text_channels, name=CLAIM_CHANNEL_NAME)
+    if claim_channel and sub.claim_message_id:
+        claim_msg = claim_channel.get_partial_message(sub.claim_message_id)
         try:
-            member = await interaction.guild.fetch_member(int(member_id))
+            await outbound.call(lambda: claim_msg.edit(embed=new_embed), USER, message_route(claim_channel))
         except discord.NotFound:
-            member = interaction.user
-        new_embed = build_submission_embed(
-            member        = member,
-            task          = task,
-            amount        = amount,
-            earned_points = earned,
-            weekly_total  = weekly_total,
-            monthly_total = monthly_total,
-            status        = status,
+            pass
+    if status == "approved":
+        leaderboard_refresh.mark(interaction.guild, "weekly")
+        leaderboard_refresh.mark(interaction.guild, "monthly")
+    await interaction.followup.send(
+        f"{'✅ Approved' if status == 'approved' else '❌ Rejected'} — **{submitter_identity(interaction.guild, sub).display_name}**.",
+        ephemeral=True,
+    )
+    return outcome
+
+
+def submitter_identity(guild: discord.Guild, sub: Submission) -> MemberIdentity:
+    member_id = sub.member_id
+    return member_identity(guild, member_id) or MemberIdentity(member_id, f"User {member_id}", None)
+
+
+def reviewed_embed(
+    guild: discord.Guild,
+    sub: Submission,
+    status: str,
+    weekly_total: int,
+    monthly_total: int,
+    reviewer_name: str,
+) -> discord.Embed:
+    embed = build_submission_embed(
+        member        = submitter_identity(guild, sub),
+        task          = sub.task,
+        amount        = sub.amount,
+        earned_points = sub.earned_points,
+        weekly_total  = weekly_total,
+        monthly_total = monthly_total,
+        status        = status,
+    )
+    embed.set_footer(text=f"Reviewed by {reviewer_name}")
+    return embed
+
+
+@timed_interaction
+async def task_autocomplete(ctx: discord.AutocompleteContext) -> list[discord.OptionChoice]:
+    catalog = guild_state(ctx.interaction.guild).catalog
+    return [discord.OptionChoice(name=task.name[:100], value=task_key) for task_key, task in catalog.search(ctx.value or "")]
+
+
+# ── Bulk Review ───────────────────────────────────────────────────
+# One surface for working through a backlog: selections survive paging,
+# and every decision is applied as one state commit with one refresh per
+# leaderboard. Message edits are queued behind member-facing traffic.
+class BulkReviewView(discord.ui.View):
+    PER_PAGE = 25  # Discord's select option limit
+
+    def __init__(self, guild: discord.Guild, reviewer: discord.Member, task: str | None = None, member: discord.Member | None = None):
+        super().__init__(timeout=600)
+        self.guild    = guild
+        self.reviewer = reviewer
+        self.task     = task.lower() if task else None
+        self.member   = member
+        self.selected = {}  # submission_id -> None, in selection order
+        self.page     = 0
+        self.render()
+
+    def matches(self, sub: Submission) -> bool:
+        if self.member is not None and sub.member_id != self.member.id:
+            return False
+        if self.task is not None and self.task not in (sub.task_key, sub.task.name.lower()):
+            return False
+        return True
+
+    def pending(self) -> list[tuple[str, Submission]]:
+        return [(sub_id, sub) for sub_id, sub in guild_state(self.guild).pending_submissions().items() if self.matches(sub)]
+
+    def render(self) -> None:
+        pending          = self.pending()
+        self.total_pages = max(1, -(-len(pending) // self.PER_PAGE))
+        self.page        = min(self.page, self.total_pages - 1)
+        start            = self.page * self.PER_PAGE
+        self.page_rows   = pending[start : start + self.PER_PAGE]
+        self.total       = len(pending)
+        live             = {sub_id for sub_id, _ in pending}
+        self.selected    = {sub_id: None for sub_id in self.selected if sub_id in live}
+        self.clear_items()
+        if self.page_rows:
+            self.add_item(BulkReviewSelect(self))
+        self.add_item(BulkReviewButton("Approve selected", discord.ButtonStyle.green, "✅", "approved", row=1))
+        self.add_item(BulkReviewButton("Reject selected", discord.ButtonStyle.red, "❌", "rejected", row=1))
+        self.add_item(BulkReviewButton("Select page", discord.ButtonStyle.grey, "☑️", "select_page", row=1))
+        if self.page > 0:
+            self.add_item(BulkReviewButton("◀ Previous", discord.ButtonStyle.grey, None, "prev", row=2))
+        if self.page < self.total_pages - 1:
+            self.add_item(BulkReviewButton("Next ▶", discord.ButtonStyle.grey, None, "next", row=2))
+
+    def build_embed(self, note: str = "") -> discord.Embed:
+        embed = discord.Embed(title="🗂️ Bulk Review", color=discord.Color.orange())
+        lines = []
+        for sub_id, sub in self.page_rows:
+            mark = "☑️" if sub_id in self.selected else "▫️"
+            name = submitter_identity(self.guild, sub).display_name
+            lines.append(f"{mark} **{name}** — {sub.task.name} ×{sub.amount} · {sub.earned_points} pts")
+        embed.description = "\n".join(lines) if lines else "*No pending submissions match.*"
+        footer = f"{len(self.selected)} selected · {self.total} pending"
+        if self.total_pages > 1:
+            footer = f"Page {self.page + 1} / {self.total_pages} · " + footer
+        embed.set_footer(text=footer)
+        if note:
+            embed.add_field(name="Result", value=note, inline=False)
+        return embed
+
+    async def refresh(self, interaction: discord.Interaction, note: str = "") -> None:
+        self.render()
+        await interaction.response.edit_message(embed=self.build_embed(note), view=self)
+
+    async def apply(self, interaction: discord.Interaction, status: str) -> None:
+        if not self.selected:
+            await self.refresh(interaction, "Nothing selected.")
+            return
+        state     = guild_state(self.guild)
+        decisions = [(sub_id, status) for sub_id in self.selected]
+        traced    = [
+            tracer.submission_fields(self.guild.id, sub_id, state.submissions[sub_id])
+            for sub_id in self.selected if sub_id in state.submissions
+        ] if tracer.enabled else []
+        results   = await state.mutations.submit(
+            state.review_many, decisions, str(self.reviewer.id), self.reviewer.display_name,
         )
-        new_embed.set_footer(text=f"Reviewed by {interaction.user.display_name}")
-        await interaction.response.edit_message(embed=new_embed, view=discord.ui.View())
-        claim_channel = discord.utils.get(interaction.guild.text_channels, name=CLAIM_CHANNEL_NAME)
-        if claim_channel and sub.get("claim_message_id"):
+        self.selected = {}
+        done = [(sub, weekly_total, monthly_total) for _, outcome, sub, weekly_total, monthly_total in results if outcome == "ok"]
+        queue_review_edits(self.guild, done, status, self.reviewer.display_name)
+        if status == "approved" and done:
+            leaderboard_refresh.mark(self.guild, "weekly")
+            leaderboard_refresh.mark(self.guild, "monthly")
+        skipped = len(results) - len(done)
+        note    = f"{'✅ Approved' if status == 'approved' else '❌ Rejected'} **{len(done)}** submission(s)."
+        if skipped:
+            note += f" {skipped} were already reviewed."
+        await self.refresh(interaction, note)
+        if traced:
+            tracer.record(
+                "bulk_review", interaction,
+                guild    = tracer.anon("g", self.guild.id),
+                reviewer = tracer.anon("m", self.reviewer.id),
+                status   = status,
+                items    = traced,
+            )
+
+
+class BulkReviewSelect(discord.ui.Select):
+    def __init__(self, review: BulkReviewView):
+        options = [
+            discord.SelectOption(
+                label       = f"{submitter_identity(review.guild, sub).display_name} — {sub.task.name}"[:100],
+                value       = sub_id,
+                description = f"×{sub.amount} · {sub.earned_points} pts",
+                default     = sub_id in review.selected,
+            )
+            for sub_id, sub in review.page_rows
+        ]
+        super().__init__(placeholder="Select submissions...", min_values=0, max_values=len(options), options=options, row=0)
+        self.review = review
+
+    @timed_interaction
+    async def callback(self, interaction: discord.Interaction):
+        # Replace this page's part of the selection, keep the other pages'.
+        for sub_id, _ in self.review.page_rows:
+            self.review.selected.pop(sub_id, None)
+        for sub_id in self.values:
+            self.review.selected[sub_id] = None
+        await self.review.refresh(interaction)
+
+
+class BulkReviewButton(discord.ui.Button):
+    def __init__(self, label: str, style: discord.ButtonStyle, emoji: str | None, action: str, row: int):
+        super().__init__(label=label, style=style, emoji=emoji, row=row)
+        self.action = action
+
+    @timed_interaction
+    async def callback(self, interaction: discord.Interaction):
+        review = self.view
+        if self.action in ("approved", "rejected"):
+            await review.apply(interaction, self.action)
+            return
+        if self.action == "select_page":
+            for sub_id, _ in review.page_rows:
+                review.selected[sub_id] = None
+        elif self.action == "prev":
+            review.page -= 1
+        elif self.action == "next":
+            review.page += 1
+        await review.refresh(interaction)
+
+
+def queue_review_edits(guild: discord.Guild, done: list, status: str, reviewer_name: str) -> None:
+    """Queue the claim and approval message edits for reviewed submissions."""
+    claim_channel    = discord.utils.get(guild.text_channels, name=CLAIM_CHANNEL_NAME)
+    approval_channel = discord.utils.get(guild.text_channels, name=APPROVAL_CHANNEL_NAME)
+    for sub, weekly_total, monthly_total in done:
+        embed = reviewed_embed(guild, sub, status, weekly_total, monthly_total, reviewer_name)
+        if claim_channel and sub.claim_message_id:
+            msg = claim_channel.get_partial_message(sub.claim_message_id)
+            outbound.submit(lambda msg=msg, embed=embed: msg.edit(embed=embed), PANEL, message_route(claim_channel))
+        if approval_channel and sub.approval_message_id:
+            msg = approval_channel.get_partial_message(sub.approval_message_id)
+            outbound.submit(
+                lambda msg=msg, embed=embed: msg.edit(embed=embed, view=discord.ui.View()),
+                PANEL, message_route(approval_channel),
+            )
+
+
+@bot.slash_command(name="review", description="Approve or reject many pending submissions at once")
+async def review_command(
+    ctx: discord.ApplicationContext,
+    task: discord.Option(str, "Only submissions for this task", required=False, default=None, autocomplete=task_autocomplete),
+    member: discord.Option(discord.Member, "Only submissions by this member", required=False, default=None),
+):
+    if not has_admin_role(ctx.interaction):
+        await ctx.respond(f"🚫 You need the **{ADMIN_ROLE_NAME}** role.", ephemeral=True)
+        return
+    view = BulkReviewView(ctx.guild, ctx.author, task, member)
+    await ctx.respond(embed=view.build_embed(), view=view, ephemeral=True)
+
+
+# ── Historical Stats ──────────────────────────────────────────────
+# /stats answers from the columnar period archives written at each reset,
+# never from raw submissions. The live epoch is not included.
+STATS_ROWS = 10
+STATS_BAR  = 12  # characters of the longest trend bar
+
+
+def stats_lines(guild: discord.Guild, view: str, rows: list, task_key: str | None) -> list[str]:
+    if view == "trend":
+        peak = max((value for _, value in rows), default=0) or 1
+        return [
+            f"`{epoch}` {'▇' * round(STATS_BAR * value / peak) or '▏'} **{value} pts**"
+            for epoch, value in rows
+        ]
+    medals = {1: "🥇", 2: "🥈", 3: "🥉"}
+    lines  = []
+    for rank, (key, value) in enumerate(rows, start=1):
+        icon = medals.get(rank, f"**#{rank}**")
+        if view == "tasks":
+            task = load_tasks(guild).get(key)
+            name = task.name if task else key
+            lines.append(f"{icon} {name} — **{value}×**")
+        else:
+            member = member_identity(guild, key)
+            name   = member.display_name if member else f"User {key}"
+            lines.append(f"{icon} {name} — **{value}{'×' if task_key else ' pts'}**")
+    return lines
+
+
+@bot.slash_command(name="stats", description="Points and completions across past weeks or months")
+async def stats_command(
+    ctx: discord.ApplicationContext,
+    view: discord.Option(str, "What to show", choices=["members", "tasks", "trend"], default="members"),
+    period: discord.Option(str, "Weekly or monthly periods", choices=["weekly", "monthly"], default="monthly"),
+    periods: discord.Option(int, "How many closed periods to include", min_value=1, max_value=104, default=6),
+    member: discord.Option(discord.Member, "Only this member (tasks, trend)", required=False, default=None),
+    task: discord.Option(str, "Only this task (members)", required=False, default=None, autocomplete=task_autocomplete),
+):
+    started   = time.perf_counter()
+    history   = await guild_state(ctx.guild).period_history(period, periods)
+    member_id = member.id if member else None
+    if view == "trend":
+        rows  = stats.trend(history, member_id)
+        title = f"📈 {member.display_name if member else 'Server'} — {period} trend"
+    elif view == "tasks":
+        rows  = stats.top_tasks(history, STATS_ROWS, member_id)
+        title = f"📋 Top tasks{f' of {member.display_name}' if member else ''}"
+    elif task:
+        found    = resolve_task(ctx.guild, task)
+        task_key = found[0] if found else task
+        rows     = stats.task_contributors(history, task_key, STATS_ROWS)
+        title    = f"🏅 Top members for {found[1].name if found else task}"
+    else:
+        rows  = stats.top_members(history, STATS_ROWS)
+        title = "🏆 Top members"
+    lines   = stats_lines(ctx.guild, view, rows, task if view == "members" else None)
+    elapsed = (time.perf_counter() - started) * 1000
+    embed   = discord.Embed(
+        title       = title,
+        color       = discord.Color.blurple(),
+        description = "\n".join(lines) if lines else "*No closed periods recorded yet.*",
+    )
+    embed.set_footer(text=f"{len(history)} closed {period} period(s) · {elapsed:.1f} ms")
+    await ctx.respond(embed=embed, ephemeral=True)
+
+
+# ── Metrics Endpoint & Profiler ───────────────────────────────────
+metrics_server = MetricsServer(metrics, METRICS_HOST, METRICS_PORT)
+profiler       = SamplingProfiler()
+_command_started = {}  # interaction id -> perf_counter at dispatch
+
+
+def instrument_http(http) -> None:
+    """Time every REST request the library sends, labelled by route template."""
+    request = http.request
+
+    async def timed_request(route, **kwargs):
+        with metrics.timer("discord_request", method=route.method, route=route.path):
             try:
-                claim_msg = await claim_channel.fetch_message(int(sub["claim_message_id"]))
-                await claim_msg.edit(embed=new_embed)
-            except discord.NotFound:
-                pass
-        if status == "approved":
-            await update_leaderboard_channel(interaction.guild, "weekly")
-            await update_leaderboard_channel(interaction.guild, "monthly")
-        await interaction.followup.send(
-            f"{'✅ Approved' if status == 'approved' else '❌ Rejected'} — **{member.display_name}**.",
-            ephemeral=True,
-        )
+                return await request(route, **kwargs)
+            except discord.HTTPException as e:
+                metrics.inc("discord_request_errors_total", status=e.status, route=route.path)
+                raise
+
+    http.request = timed_request
+
+
+class RateLimitCounter(logging.Handler):
+    """Counts the 429 warnings the HTTP client logs before it retries.
+
+    Every 429 logs "We are being rate limited…", and a global one follows
+    it at once with "Global rate limit has been hit…". The count is taken
+    on the next loop iteration, after both, so each 429 counts once.
+    """
+
+    def __init__(self, level: int = logging.NOTSET):
+        super().__init__(level)
+        self._pending = None  # scope of the 429 being logged
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = str(record.msg)
+        if message.startswith("We are being rate limited"):
+            self._commit()
+            self._pending = "bucket"
+            try:
+                asyncio.get_running_loop().call_soon(self._commit)
+            except RuntimeError:
+                self._commit()
+        elif message.startswith("Global rate limit has been hit"):
+            if self._pending is None:
+                metrics.inc("discord_rate_limits_total", scope="global")
+            else:
+                self._pending = "global"
+
+    def _commit(self) -> None:
+        if self._pending is not None:
+            metrics.inc("discord_rate_limits_total", scope=self._pending)
+            self._pending = None
+
+
+instrument_http(bot.http)
+logging.getLogger("discord.http").addHandler(RateLimitCounter(logging.WARNING))
+
+
+def state_file_sizes() -> list:
+    samples = []
+    if not os.path.isdir(DATA_DIR):
+        return samples
+    for guild_dir in os.scandir(DATA_DIR):
+        if not guild_dir.is_dir() or not guild_dir.name.isdigit():
+            continue
+        for entry in os.scandir(guild_dir.path):
+            if entry.is_file():
+                size = entry.stat().st_size
+            else:
+                size = sum(
+                    os.path.getsize(os.path.join(root, name))
+                    for root, _, files in os.walk(entry.path) for name in files
+                )
+            samples.append(({"guild": guild_dir.name, "file": entry.name}, size))
+    return samples
+
+
+metrics.gauge("state_bytes", state_file_sizes, "Size of each guild's state files and archive directories")
+metrics.gauge(
+    "pending_submissions",
+    lambda: [({"guild": guild_id}, len(state.submissions)) for guild_id, state in states],
+    "Submissions waiting for review",
+)
+metrics.gauge(
+    "outbound_queued",
+    lambda: [({"priority": name}, stats["queued"]) for name, stats in outbound.stats().items()],
+    "Outbound REST calls waiting in the scheduler",
+)
+metrics.gauge(
+    "outbound_max_wait_seconds",
+    lambda: [({"priority": name}, stats["max_wait_ms"] / 1000) for name, stats in outbound.stats().items()],
+    "Longest queue wait per priority, including per-channel pacing",
+)
+metrics.gauge(
+    "member_cache",
+    lambda: [({"field": key}, value) for key, value in members.stats().items()],
+    "Member identity cache size, hits and misses",
+)
+
+
+@bot.listen("on_application_command")
+async def _command_dispatched(ctx: discord.ApplicationContext):
+    _command_started[ctx.interaction.id] = time.perf_counter()
+
+
+def _command_finished(ctx: discord.ApplicationContext, outcome: str) -> None:
+    started = _command_started.pop(ctx.interaction.id, None)
+    if started is None:
+        return
+    handler = f"/{ctx.command.qualified_name}"
+    metrics.observe("interaction_seconds", time.perf_counter() - started, handler=handler)
+    metrics.inc("interaction_total", outcome=outcome, handler=handler)
+
+
+@bot.listen("on_application_command_completion")
+async def _command_completed(ctx: discord.ApplicationContext):
+    _command_finished(ctx, "ok")
+
+
+@bot.listen("on_application_command_error")
+async def _command_failed(ctx: discord.ApplicationContext, error: Exception):
+    _command_finished(ctx, "error")
+    # A listener replaces the library's default report, so keep the traceback.
+    print(f"⚠️ /{ctx.command.qualified_name} failed: {error}")
+    traceback.print_exception(type(error), error, error.__traceback__)
+
+
+def metrics_embed(guild: discord.Guild) -> discord.Embed:
+    def table(rows: list, limit: int = 8) -> str:
+        lines = [
+            f"`{label[:38]}` {count}× · p50 {p50 * 1000:.1f} ms · p95 {p95 * 1000:.1f} ms"
+            for label, count, p50, p95 in rows[:limit]
+        ]
+        return "\n".join(lines) or "*No calls yet.*"
+
+    uptime = timedelta(seconds=int(time.time() - metrics.started_at))
+    embed  = discord.Embed(title="📊 Bot Metrics", color=discord.Color.dark_teal())
+    embed.add_field(name="⏱️ Interactions", value=table(metrics.summary("interaction_seconds", "handler")), inline=False)
+    embed.add_field(name="🗄️ Storage", value=table(metrics.summary("storage_seconds", "op"), 6), inline=False)
+    embed.add_field(name="🌐 Discord REST", value=table(metrics.summary("discord_request_seconds", "route"), 6), inline=False)
+    errors      = int(metrics.total("interaction_total", outcome="error"))
+    rate_limits = int(metrics.total("discord_rate_limits_total"))
+    queued      = sum(stats["queued"] for stats in outbound.stats().values())
+    cache       = members.stats()
+    state_bytes = sum(size for labels, size in state_file_sizes() if labels["guild"] == str(guild.id))
+    embed.add_field(name="⚠️ Errors", value=f"{errors} handler · {rate_limits} rate limits", inline=True)
+    embed.add_field(name="📤 Outbound", value=f"{queued} queued", inline=True)
+    embed.add_field(name="👥 Members", value=f"{cache['entries']} cached · {cache['hit_rate']:.0%} hits", inline=True)
+    embed.add_field(name="💾 State", value=f"{state_bytes / 1024:.0f} KiB", inline=True)
+    footer = f"Uptime {uptime}"
+    if metrics_server.port:
+        footer += f" · Prometheus on {metrics_server.host}:{metrics_server.port}/metrics"
+    embed.set_footer(text=footer)
+    return embed
+
+
+@bot.slash_command(name="metrics", description="Latency, call counts and state size; optionally profile the bot")
+async def metrics_command(
+    ctx: discord.ApplicationContext,
+    profile: discord.Option(int, "Sample the event loop for this many seconds", min_value=0, max_value=PROFILE_MAX_SECONDS, default=0),
+):
+    if not has_admin_role(ctx.interaction):
+        await ctx.respond(f"🚫 You need the **{ADMIN_ROLE_NAME}** role.", ephemeral=True)
+        return
+    if not profile:
+        await ctx.respond(embed=metrics_embed(ctx.guild), ephemeral=True)
+        return
+    if profiler.running:
+        await ctx.respond("⏳ A profile is already being captured.", ephemeral=True)
+        return
+    await ctx.defer(ephemeral=True)
+    result = await profiler.capture(profile, threading.get_ident())
+    lines  = [
+        f"`{function[:60]}` {own / result.samples:.0%} self · {total / result.samples:.0%} total"
+        for function, own, total in result.top(15)
+    ]
+    embed = discord.Embed(
+        title       = f"🔬 Event loop profile — {profile}s, {result.samples} samples",
+        color       = discord.Color.dark_teal(),
+        description = "\n".join(lines) or "*No samples.*",
+    )
+    embed.set_footer(text="Attached: folded stacks for flame graph tools")
+    file = discord.File(io.BytesIO(result.folded().encode("utf-8")), filename="profile.folded")
+    await ctx.followup.send(embed=embed, file=file, ephemeral=True)
 
 
 # ════════════════════════════════════════════════════════════════
@@ -371,29 +1244,63 @@ class ClaimControlView(discord.ui.View):
         super().__init__(timeout=None)
 
     @discord.ui.button(label="Submit Task", style=discord.ButtonStyle.green, emoji="🏆", custom_id="btn_submit_task")
+    @timed_interaction
     async def submit_task(self, button: discord.ui.Button, interaction: discord.Interaction):
-        tasks = load_tasks()
+        tasks = load_tasks(interaction.guild)
         if not tasks:
             await interaction.response.send_message("📭 No open orders available.", ephemeral=True)
             return
-        view = TaskSelectView(tasks)
-        await interaction.response.send_message(
-            embed=discord.Embed(
-                title="📋 Select a Task",
-                description="Choose the task you completed from the dropdown below:",
-                color=discord.Color.blurple(),
-            ),
-            view=view,
-            ephemeral=True,
-        )
+        view = TaskSelectView(interaction.guild)
+        await interaction.response.send_message(embed=view.build_embed(), view=view, ephemeral=True)
         view.message = await interaction.original_response()
 
 
 class TaskSelectView(discord.ui.View):
-    def __init__(self, tasks: dict):
+    """Task picker: pages of 25 (Discord's select limit) or the catalog's best matches."""
+
+    PER_PAGE = 25
+
+    def __init__(self, guild: discord.Guild, query: str = "", page: int = 0):
         super().__init__(timeout=300)
-        self.add_item(TaskDropdown(tasks))
+        self.guild   = guild
+        self.query   = query
+        self.page    = page
         self.message = None
+        catalog = guild_state(guild).catalog
+        if query:
+            rows             = catalog.search(query, self.PER_PAGE)
+            self.total_pages = 1
+        else:
+            rows, self.total_pages = catalog.page(page, self.PER_PAGE)
+        self.rows = rows
+        if rows:
+            self.add_item(TaskDropdown(dict(rows)))
+        self.add_item(TaskPickerButton("Search", "🔍", "search"))
+        if query:
+            self.add_item(TaskPickerButton("Show all", None, "clear"))
+        if page > 0:
+            self.add_item(TaskPickerButton("◀ Previous", None, "prev"))
+        if page < self.total_pages - 1:
+            self.add_item(TaskPickerButton("Next ▶", None, "next"))
+
+    def build_embed(self) -> discord.Embed:
+        if self.query:
+            description = (
+                f"Best matches for **{self.query}**:" if self.rows
+                else f"No task matches **{self.query}**. Try another search."
+            )
+        else:
+            description = "Choose the task you completed from the dropdown below:"
+        embed = discord.Embed(title="📋 Select a Task", description=description, color=discord.Color.blurple())
+        if self.total_pages > 1:
+            embed.set_footer(text=f"Page {self.page + 1} / {self.total_pages} · or use 🔍 Search")
+        return embed
+
+    async def show(self, interaction: discord.Interaction, query: str, page: int = 0):
+        view         = TaskSelectView(self.guild, query, page)
+        view.message = self.message
+        self.stop()
+        await interaction.response.edit_message(embed=view.build_embed(), view=view)
 
     async def on_timeout(self):
         if self.message:
@@ -403,14 +1310,41 @@ class TaskSelectView(discord.ui.View):
                 pass
 
 
+class TaskPickerButton(discord.ui.Button):
+    def __init__(self, label: str, emoji: str | None, action: str):
+        super().__init__(label=label, style=discord.ButtonStyle.grey, emoji=emoji, row=1)
+        self.action = action
+
+    @timed_interaction
+    async def callback(self, interaction: discord.Interaction):
+        picker = self.view
+        if self.action == "search":
+            await interaction.response.send_modal(TaskSearchModal(picker))
+        elif self.action == "clear":
+            await picker.show(interaction, "")
+        else:
+            await picker.show(interaction, "", picker.page + (1 if self.action == "next" else -1))
+
+
+class TaskSearchModal(discord.ui.Modal):
+    def __init__(self, picker: TaskSelectView):
+        super().__init__(title="🔍 Search Tasks")
+        self.picker = picker
+        self.add_item(discord.ui.InputText(label="Task name", placeholder="e.g. wood", min_length=1, max_length=100))
+
+    @timed_interaction
+    async def callback(self, interaction: discord.Interaction):
+        await self.picker.show(interaction, self.children[0].value.strip())
+
+
 class TaskDropdown(discord.ui.Select):
     def __init__(self, tasks: dict):
         self.tasks = tasks
         options = [
             discord.SelectOption(
-                label=task["name"],
+                label=task.name,
                 value=task_key,
-                description=f"{task['points']} pts · Max {task['max_completions'] if task['max_completions'] != 0 else '∞'}x",
+                description=f"{task.points} pts · Max {task.max_completions if task.max_completions != 0 else '∞'}x",
                 emoji="📌",
             )
             for task_key, task in tasks.items()
@@ -423,6 +1357,7 @@ class TaskDropdown(discord.ui.Select):
             custom_id="task_select_dropdown",
         )
 
+    @timed_interaction
     async def callback(self, interaction: discord.Interaction):
         selected_key  = self.values[0]
         selected_task = self.tasks[selected_key]
@@ -431,7 +1366,7 @@ class TaskDropdown(discord.ui.Select):
             await interaction.edit_original_response(
                 embed=discord.Embed(
                     title="📋 Task Selected",
-                    description=f"Submission form opened for **{selected_task['name']}**.",
+                    description=f"Submission form opened for **{selected_task.name}**.",
                     color=discord.Color.blurple(),
                 ),
                 view=discord.ui.View(),
@@ -441,23 +1376,22 @@ class TaskDropdown(discord.ui.Select):
 
 
 class AmountModal(discord.ui.Modal):
-    def __init__(self, task_key: str, task: dict):
-        max_label = "unlimited" if task["max_completions"] == 0 else str(task["max_completions"])
-        super().__init__(title=f"📌 {task['name']}")
+    def __init__(self, task_key: str, task: Task):
+        max_label = "unlimited" if task.max_completions == 0 else str(task.max_completions)
+        super().__init__(title=f"📌 {task.name}")
         self.task_key = task_key
         self.task     = task
         self.add_item(discord.ui.InputText(
             label=f"Number of Completions (max: {max_label})",
-            placeholder=f"Enter a number (1–{max_label})" if task["max_completions"] != 0 else "Enter a number (e.g. 3)",
+            placeholder=f"Enter a number (1–{max_label})" if task.max_completions != 0 else "Enter a number (e.g. 3)",
             min_length=1,
             max_length=4,
             style=discord.InputTextStyle.short,
         ))
 
+    @timed_interaction
     async def callback(self, interaction: discord.Interaction):
         amount_raw = self.children[0].value.strip()
-        task       = self.task
-        user       = interaction.user
         try:
             amount = int(amount_raw)
             if amount <= 0:
@@ -465,56 +1399,111 @@ class AmountModal(discord.ui.Modal):
         except ValueError:
             await interaction.response.send_message("❌ Please enter a valid positive integer.", ephemeral=True)
             return
-        points_data = ensure_points_structure(load_points())
-        member_id   = str(user.id)
-        if task["max_completions"] != 0:
-            already_done = points_data["weekly"].get(member_id, {}).get("completions", {}).get(self.task_key, 0)
-            remaining    = task["max_completions"] - already_done
-            if remaining <= 0:
-                await interaction.response.send_message(
-                    f"⛔ You've reached the maximum completions (**{task['max_completions']}x**) for **{task['name']}**.",
-                    ephemeral=True,
-                )
-                return
-            if amount > remaining:
-                await interaction.response.send_message(
-                    f"⚠️ You can only submit **{remaining}** more completion(s) for **{task['name']}**.",
-                    ephemeral=True,
-                )
-                return
-        earned_points = task["points"] * amount
-        for period in ("weekly", "monthly"):
-            if member_id not in points_data[period]:
-                points_data[period][member_id] = {"total_points": 0, "completions": {}}
-            prev = points_data[period][member_id]["completions"].get(self.task_key, 0)
-            points_data[period][member_id]["completions"][self.task_key] = prev + amount
-        save_points(points_data)
-        weekly_total  = points_data["weekly"].get(member_id,  {}).get("total_points", 0)
-        monthly_total = points_data["monthly"].get(member_id, {}).get("total_points", 0)
-        await interaction.response.send_message("✅ Your submission has been sent for approval!", ephemeral=True)
-        claim_channel = discord.utils.get(interaction.guild.text_channels, name=CLAIM_CHANNEL_NAME)
-        claim_msg_id  = None
+        await submit_claim(interaction, self.task_key, self.task, amount)
+
+
+async def submit_claim(interaction: discord.Interaction, task_key: str, task: Task, amount: int):
+    """Check the quota, record the claim and post it for review; one interaction response."""
+    outcome = await _submit_claim(interaction, task_key, task, amount)
+    if tracer.enabled:
+        guild_id = interaction.guild.id
+        tracer.record(
+            "claim", interaction,
+            guild           = tracer.anon("g", guild_id),
+            member          = tracer.anon("m", interaction.user.id),
+            task            = tracer.anon("t", f"{guild_id}:{task_key}"),
+            points          = task.points,
+            max_completions = task.max_completions,
+            amount          = amount,
+            submission      = tracer.anon("s", f"{interaction.user.id}_{interaction.id}"),
+            outcome         = outcome,
+        )
+
+
+async def _submit_claim(interaction: discord.Interaction, task_key: str, task: Task, amount: int) -> str:
+    user          = interaction.user
+    member_id     = user.id
+    state         = guild_state(interaction.guild)
+    submission_id = f"{member_id}_{interaction.id}"
+    remaining, weekly_total, monthly_total = await state.mutations.submit(
+        state.claim, member_id, task_key, task, amount, submission_id,
+    )
+    if remaining == 0:
+        await interaction.response.send_message(
+            f"⛔ You've reached the maximum completions (**{task.max_completions}x**) for **{task.name}**.",
+            ephemeral=True,
+        )
+        return "limited"
+    if remaining is not None:
+        await interaction.response.send_message(
+            f"⚠️ You can only submit **{remaining}** more completion(s) for **{task.name}**.",
+            ephemeral=True,
+        )
+        return "limited"
+    earned_points = task.points * amount
+    member        = identity_of(user)
+    members.put(interaction.guild.id, member)
+    await interaction.response.send_message("✅ Your submission has been sent for approval!", ephemeral=True)
+    pending_embed    = build_submission_embed(member, task, amount, earned_points, weekly_total, monthly_total, "pending")
+    claim_channel    = discord.utils.get(interaction.guild.text_channels, name=CLAIM_CHANNEL_NAME)
+    approval_channel = discord.utils.get(interaction.guild.text_channels, name=APPROVAL_CHANNEL_NAME)
+
+    async def post_claim():
         if claim_channel:
-            pending_embed = build_submission_embed(user, task, amount, earned_points, weekly_total, monthly_total, "pending")
-            claim_msg     = await claim_channel.send(embed=pending_embed)
-            claim_msg_id  = str(claim_msg.id)
-            await send_claim_message(claim_channel)
-        submission_id    = f"{member_id}_{interaction.id}"
-        approval_channel = discord.utils.get(interaction.guild.text_channels, name=APPROVAL_CHANNEL_NAME)
+            msg = await outbound.call(lambda: claim_channel.send(embed=pending_embed), USER, channel_route(claim_channel))
+            return msg.id
+
+    async def post_approval():
         if approval_channel:
-            approval_embed = build_submission_embed(user, task, amount, earned_points, weekly_total, monthly_total, "pending")
-            await approval_channel.send(embed=approval_embed, view=ApprovalView(submission_id))
-        submissions = load_submissions()
-        submissions[submission_id] = {
-            "member_id":        member_id,
-            "task_key":         self.task_key,
-            "task":             task,
-            "amount":           amount,
-            "earned_points":    earned_points,
-            "status":           "pending",
-            "claim_message_id": claim_msg_id,
-        }
-        save_submissions(submissions)
+            view = ApprovalView(submission_id)
+            msg  = await outbound.call(
+                lambda: approval_channel.send(embed=pending_embed, view=view),
+                USER, channel_route(approval_channel),
+            )
+            return msg.id
+
+    # The claim panel stays pinned, so nothing is reposted after the claim.
+    claim_posted, approval_posted = await asyncio.gather(post_claim(), post_approval(), return_exceptions=True)
+    if isinstance(approval_posted, BaseException):
+        # Nobody would see the claim: give the member their quota back.
+        print(f"⚠️ Could not post submission {submission_id} for approval: {approval_posted}")
+        await state.mutations.submit(state.withdraw_claim, submission_id)
+        if claim_channel and not isinstance(claim_posted, BaseException) and claim_posted:
+            try:
+                await outbound.call(lambda: claim_channel.get_partial_message(claim_posted).delete(), USER, message_route(claim_channel))
+            except discord.HTTPException:
+                pass
+        await interaction.followup.send("❌ Your submission could not be posted for review. Please submit it again.", ephemeral=True)
+        return "failed"
+    if isinstance(claim_posted, BaseException):
+        print(f"⚠️ Could not post submission {submission_id} to #{CLAIM_CHANNEL_NAME}: {claim_posted}")
+        claim_posted = None
+    await state.mutations.submit(state.attach_messages, submission_id, claim_posted, approval_posted)
+    return "ok"
+
+
+def resolve_task(guild: discord.Guild, value: str) -> tuple[str, Task] | None:
+    """Task for a /claim option: a key picked from autocomplete or a typed name."""
+    tasks = load_tasks(guild)
+    if value in tasks:
+        return value, tasks[value]
+    for task_key, task in guild_state(guild).catalog.search(value, limit=5):
+        if task.name.casefold() == value.strip().casefold():
+            return task_key, task
+    return None
+
+
+@bot.slash_command(name="claim", description="Submit completed tasks for approval")
+async def claim_command(
+    ctx: discord.ApplicationContext,
+    task: discord.Option(str, "The task you completed", autocomplete=task_autocomplete),
+    amount: discord.Option(int, "Number of completions", min_value=1, max_value=9999),
+):
+    found = resolve_task(ctx.guild, task)
+    if found is None:
+        await ctx.respond(f"❓ Unknown task **{task}**. Pick one from the suggestions.", ephemeral=True)
+        return
+    await submit_claim(ctx.interaction, *found, amount)
 
 
 # ════════════════════════════════════════════════════════════════
@@ -528,6 +1517,7 @@ class TaskCreateModal(discord.ui.Modal):
         self.add_item(discord.ui.InputText(label="Points per Completion (integer)", placeholder="e.g. 10", min_length=1, max_length=6, style=discord.InputTextStyle.short))
         self.add_item(discord.ui.InputText(label="Max Completions per Member (0 = unlimited)", placeholder="e.g. 5   |   0 for unlimited", min_length=1, max_length=4, style=discord.InputTextStyle.short))
 
+    @timed_interaction
     async def callback(self, interaction: discord.Interaction):
         task_name  = self.children[0].value.strip()
         points_raw = self.children[1].value.strip()
@@ -549,14 +1539,13 @@ class TaskCreateModal(discord.ui.Modal):
             await interaction.response.send_message("❌ **Error:**\n" + "\n".join(f"• {e}" for e in errors), ephemeral=True)
             await send_control_message(interaction.channel)
             return
-        tasks    = load_tasks()
+        tasks    = load_tasks(interaction.guild)
         task_key = task_name.lower().replace(" ", "_")
         if task_key in tasks:
             await interaction.response.send_message(f"⚠️ An order named **{task_name}** already exists.", ephemeral=True)
             await send_control_message(interaction.channel)
             return
-        tasks[task_key] = {"name": task_name, "points": points, "max_completions": max_completions}
-        save_tasks(tasks)
+        guild_state(interaction.guild).put_task(Task(task_key, task_name, points, max_completions))
         max_display = "Unlimited" if max_completions == 0 else str(max_completions)
         embed = discord.Embed(title="✅ Order Created", color=discord.Color.green())
         embed.add_field(name="📌 Order",                value=task_name,   inline=False)
@@ -574,16 +1563,16 @@ class TaskDeleteButton(discord.ui.Button):
         self.task_key  = task_key
         self.task_name = task_name
 
+    @timed_interaction
     async def callback(self, interaction: discord.Interaction):
         if not has_admin_role(interaction):
             await interaction.response.send_message(f"🚫 You need the **{ADMIN_ROLE_NAME}** role.", ephemeral=True)
             return
-        tasks = load_tasks()
+        tasks = load_tasks(interaction.guild)
         if self.task_key not in tasks:
             await interaction.response.send_message(f"⚠️ **{self.task_name}** has already been deleted.", ephemeral=True)
         else:
-            del tasks[self.task_key]
-            save_tasks(tasks)
+            guild_state(interaction.guild).delete_task(self.task_key)
             embed = discord.Embed(title="🗑️ Order Deleted", color=discord.Color.red())
             embed.add_field(name="Order", value=self.task_name, inline=False)
             embed.set_footer(text=f"Deleted by {interaction.user.display_name}")
@@ -599,8 +1588,9 @@ class NavButton(discord.ui.Button):
         super().__init__(label=label, style=discord.ButtonStyle.grey, custom_id=custom_id, row=row)
         self.target_page = target_page
 
+    @timed_interaction
     async def callback(self, interaction: discord.Interaction):
-        tasks    = load_tasks()
+        tasks    = load_tasks(interaction.guild)
         new_view = DeleteTaskView(tasks, page=self.target_page)
         await interaction.response.edit_message(embed=new_view.build_embed(), view=new_view)
 
@@ -616,7 +1606,7 @@ class DeleteTaskView(discord.ui.View):
         start            = page * self.TASKS_PER_PAGE
         self.page_tasks  = self.all_tasks[start : start + self.TASKS_PER_PAGE]
         for row_idx, (task_key, task) in enumerate(self.page_tasks):
-            self.add_item(TaskDeleteButton(task_key, task["name"], row=row_idx))
+            self.add_item(TaskDeleteButton(task_key, task.name, row=row_idx))
         if self.total_pages > 1:
             if page > 0:
                 self.add_item(NavButton("◀ Previous", "nav_prev", page - 1, row=4))
@@ -626,8 +1616,8 @@ class DeleteTaskView(discord.ui.View):
     def build_embed(self) -> discord.Embed:
         embed = discord.Embed(title="🗑️ Delete Order", description="Press **Delete** next to the order you want to remove:", color=discord.Color.red())
         for task_key, task in self.page_tasks:
-            max_display = "Unlimited" if task["max_completions"] == 0 else f"{task['max_completions']}x"
-            embed.add_field(name=f"📌 {task['name']}", value=f"⭐ **{task['points']} Points** | 🔄 Max. **{max_display}**", inline=True)
+            max_display = "Unlimited" if task.max_completions == 0 else f"{task.max_completions}x"
+            embed.add_field(name=f"📌 {task.name}", value=f"⭐ **{task.points} Points** | 🔄 Max. **{max_display}**", inline=True)
             embed.add_field(name="\u200b", value="\u200b", inline=True)
             embed.add_field(name="\u200b", value="\u200b", inline=False)
         if self.total_pages > 1:
@@ -640,6 +1630,7 @@ class TaskControlView(discord.ui.View):
         super().__init__(timeout=None)
 
     @discord.ui.button(label="Create Order", style=discord.ButtonStyle.green, emoji="➕", custom_id="btn_create_order")
+    @timed_interaction
     async def create_order(self, button: discord.ui.Button, interaction: discord.Interaction):
         if not has_admin_role(interaction):
             await interaction.response.send_message(f"🚫 You need the **{ADMIN_ROLE_NAME}** role.", ephemeral=True)
@@ -647,11 +1638,12 @@ class TaskControlView(discord.ui.View):
         await interaction.response.send_modal(TaskCreateModal())
 
     @discord.ui.button(label="Delete Order", style=discord.ButtonStyle.red, emoji="🗑️", custom_id="btn_delete_order")
+    @timed_interaction
     async def delete_order(self, button: discord.ui.Button, interaction: discord.Interaction):
         if not has_admin_role(interaction):
             await interaction.response.send_message(f"🚫 You need the **{ADMIN_ROLE_NAME}** role.", ephemeral=True)
             return
-        tasks = load_tasks()
+        tasks = load_tasks(interaction.guild)
         if not tasks:
             await interaction.response.send_message("📭 No orders available to delete.", ephemeral=True)
             return
@@ -659,7 +1651,89 @@ class TaskControlView(discord.ui.View):
         await interaction.response.send_message(embed=view.build_embed(), view=view, ephemeral=True)
 
 
+# ── Guild Bootstrap ───────────────────────────────────────────────
+async def initialize_guild(guild: discord.Guild, limit: asyncio.Semaphore):
+    async with limit:
+        started       = time.perf_counter()
+        task_channel  = discord.utils.get(guild.text_channels, name=TASK_CHANNEL_NAME)
+        claim_channel = discord.utils.get(guild.text_channels, name=CLAIM_CHANNEL_NAME)
+        # Warm the names the first renders need: everyone on a live top page
+        # and everyone with a submission waiting for review.
+        state      = guild_state(guild)
+        member_ids = {member_id for index in state.ranks.values() for member_id, _ in index.page(0)}
+        member_ids |= {sub.member_id for sub in state.pending_submissions().values()}
+        await warm_members(guild, [member_id for member_id in member_ids if guild.get_member(member_id) is None])
+        steps = [update_open_tasks_channel(guild)]
+        if task_channel:
+            steps.append(send_control_message(task_channel))
+        if claim_channel:
+            steps.append(send_claim_message(claim_channel))
+        steps.append(update_leaderboard_channel(guild, "weekly"))
+        steps.append(update_leaderboard_channel(guild, "monthly"))
+        # Every step works on its own channel, so they can overlap.
+        results = await asyncio.gather(*steps, return_exceptions=True)
+        errors  = [r for r in results if isinstance(r, BaseException)]
+        elapsed = time.perf_counter() - started
+        for e in errors:
+            print(f"⚠️ Error initializing {guild.name}: {e}")
+        return elapsed, not errors
+
+
+async def load_guilds(guilds: list):
+    """Read each guild's partition on a worker thread before handlers and resets touch it."""
+    limit = asyncio.Semaphore(GUILD_INIT_CONCURRENCY)
+
+    async def load(guild: discord.Guild):
+        async with limit:
+            await states.load(guild.id)
+
+    results = await asyncio.gather(*(load(guild) for guild in guilds), return_exceptions=True)
+    for guild, result in zip(guilds, results):
+        if isinstance(result, BaseException):
+            print(f"⚠️ Could not load the data of {guild.name}: {result}")
+
+
+async def initialize_guilds(guilds: list):
+    limit   = asyncio.Semaphore(GUILD_INIT_CONCURRENCY)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(initialize_guild(guild, limit) for guild in guilds),
+        return_exceptions=True,
+    )
+    failed = 0
+    for guild, result in zip(guilds, results):
+        if isinstance(result, BaseException):
+            print(f"⚠️ Error initializing {guild.name}: {result}")
+            failed += 1
+            continue
+        elapsed, ok = result
+        failed += not ok
+        print(f"{'🏠' if ok else '⚠️'} {guild.name} ready in {elapsed:.2f}s")
+    print(f"✅ Initialized {len(guilds) - failed}/{len(guilds)} guilds in {time.perf_counter() - started:.2f}s")
+
+
 # ── Bot Events ────────────────────────────────────────────────────
+@bot.event
+async def on_guild_join(guild: discord.Guild):
+    if await claim_guild(guild.id):
+        await load_guilds([guild])
+
+
+@bot.event
+async def on_member_join(member: discord.Member):
+    members.put(member.guild.id, identity_of(member))
+
+
+@bot.event
+async def on_member_update(before: discord.Member, after: discord.Member):
+    members.put(after.guild.id, identity_of(after))
+
+
+@bot.event
+async def on_member_remove(member: discord.Member):
+    members.forget(member.guild.id, member.id)
+
+
 @bot.event
 async def on_ready():
     print(f"✅ Bot online: {bot.user}")
@@ -667,29 +1741,26 @@ async def on_ready():
     # Register persistent views
     bot.add_view(TaskControlView())
     bot.add_view(ClaimControlView())
-    submissions = load_submissions()
-    for sub_id, sub in submissions.items():
-        if sub.get("status") == "pending":
-            bot.add_view(ApprovalView(sub_id))
+    bot.add_view(LeaderboardView("weekly"))
+    bot.add_view(LeaderboardView("monthly"))
+    await bus.start()
+    claimed = await asyncio.gather(*(claim_guild(guild.id) for guild in bot.guilds))
+    guilds  = [guild for guild, ok in zip(bot.guilds, claimed) if ok]
+    import_legacy_store(guilds)
+    await load_guilds(guilds)
     
     # Start scheduled tasks (only once)
-    if not check_resets.is_running():
-        check_resets.start()
+    states.start()
+    outbound.start()
+    if not resets.is_running():
+        resets.start()
+    try:
+        await metrics_server.start()
+    except OSError as e:
+        print(f"⚠️ Metrics endpoint unavailable on {METRICS_HOST}:{METRICS_PORT}: {e}")
     
     # Initialize channels
-    for guild in bot.guilds:
-        try:
-            task_channel = discord.utils.get(guild.text_channels, name=TASK_CHANNEL_NAME)
-            if task_channel:
-                await send_control_message(task_channel)
-            await update_open_tasks_channel(guild)
-            claim_channel = discord.utils.get(guild.text_channels, name=CLAIM_CHANNEL_NAME)
-            if claim_channel:
-                await send_claim_message(claim_channel)
-            await update_leaderboard_channel(guild, "weekly")
-            await update_leaderboard_channel(guild, "monthly")
-        except Exception as e:
-            print(f"⚠️ Error initializing {guild.name}: {e}")
+    await initialize_guilds(guilds)
 
 
 if __name__ == "__main__":
@@ -699,3 +1770,5 @@ if __name__ == "__main__":
         print("🛑 Bot stopped")
     except Exception as e:
         print(f"❌ Bot error: {e}")
+    finally:
+        states.flush_sync()
@@ -0,0 +1,123 @@
+import heapq
+import itertools
+import math
+
+from sortedcontainers import SortedList
+
+from models import Task
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+# ── Task Catalog ──────────────────────────────────────────────────
+class TaskCatalog:
+    """Search index over one guild's tasks for pickers and autocomplete.
+
+    Every word of a task name (and the task key) sits in a sorted token
+    list, so prefix matches are a range scan. Names are also indexed by
+    trigram to catch typos and infixes when prefixes run out. ``put`` and
+    ``delete`` touch only the entries of one task.
+    """
+
+    MIN_SIMILARITY = 0.34  # share of the query's trigrams a fuzzy hit must contain
+    SCAN_LIMIT     = 8     # prefix tokens examined per requested result
+
+    def __init__(self, tasks: dict):
+        self.tasks   = tasks  # the live dict; the catalog only indexes it
+        self._tokens = SortedList()  # (token, task_key)
+        self._grams  = {}            # trigram -> {task_key}
+        self._keys   = {}            # task_key -> (name, tokens, grams) as indexed
+        for task_key, task in tasks.items():
+            self._index(task_key, task)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def put(self, task_key: str, task: Task) -> None:
+        self._unindex(task_key)
+        self._index(task_key, task)
+
+    def delete(self, task_key: str) -> None:
+        self._unindex(task_key)
+
+    def _index(self, task_key: str, task: Task) -> None:
+        name   = normalize(task.name)
+        tokens = {name, normalize(task_key.replace("_", " ")), *name.split()}
+        grams  = trigrams(name)
+        for token in tokens:
+            self._tokens.add((token, task_key))
+        for gram in grams:
+            self._grams.setdefault(gram, set()).add(task_key)
+        self._keys[task_key] = (name, tokens, grams)
+
+    def _unindex(self, task_key: str) -> None:
+        indexed = self._keys.pop(task_key, None)
+        if indexed is None:
+            return
+        _, tokens, grams = indexed
+        for token in tokens:
+            self._tokens.discard((token, task_key))
+        for gram in grams:
+            keys = self._grams.get(gram)
+            if keys is not None:
+                keys.discard(task_key)
+                if not keys:
+                    del self._grams[gram]
+
+    def page(self, page: int, per_page: int = 25) -> tuple[list[tuple[str, Task]], int]:
+        """Tasks on ``page`` in catalog order, and the number of pages."""
+        total = max(1, -(-len(self.tasks) // per_page))
+        start = page * per_page
+        return list(itertools.islice(self.tasks.items(), start, start + per_page)), total
+
+    def search(self, query: str, limit: int = 25) -> list[tuple[str, Task]]:
+        """Best matches for ``query``: name prefixes, then word prefixes, then fuzzy."""
+        query = normalize(query)
+        if not query:
+            return [(key, self.tasks[key]) for key in itertools.islice(self._keys, limit)]
+        ranked = {}
+        start  = self._tokens.bisect_left((query, ""))
+        # A short query can match thousands of tokens; a bounded scan is plenty for one page.
+        for token, task_key in self._tokens.islice(start, start + self.SCAN_LIMIT * limit):
+            if not token.startswith(query):
+                break
+            name_prefix = self._keys[task_key][0].startswith(query)
+            rank        = (0 if name_prefix else 1, len(token))
+            if task_key not in ranked or rank < ranked[task_key]:
+                ranked[task_key] = rank
+        best = sorted(ranked, key=lambda key: (ranked[key], self._keys[key][0]))[:limit]
+        if len(best) < limit:
+            best += self._fuzzy(query, limit - len(best), ranked.keys())
+        return [(task_key, self.tasks[task_key]) for task_key in best]
+
+    def _fuzzy(self, query: str, limit: int, exclude) -> list[str]:
+        query_grams = trigrams(query)
+        size        = len(query_grams)
+        needed      = math.ceil(self.MIN_SIMILARITY * size)
+        # Any hit shares at least one of the size - needed + 1 rarest grams,
+        # so only their postings are walked, rarest first. A task missing
+        # the first n of them shares at most size - n grams, so the walk
+        # stops once ``limit`` hits already share more than that.
+        rarest = sorted(query_grams, key=lambda gram: len(self._grams.get(gram, ())))
+        seen   = set(exclude)
+        hits   = [0] * (size + 1)  # scored tasks by number of shared grams
+        scored = []                # (-shared grams, name, task_key) of hits
+        for walked, gram in enumerate(rarest[: size - needed + 1], 1):
+            posting = self._grams.get(gram, set())
+            for task_key in posting - seen:
+                name, _, grams = self._keys[task_key]
+                shared = len(query_grams & grams)
+                hits[shared] += 1
+                if shared >= needed:
+                    scored.append((-shared, name, task_key))
+            seen |= posting
+            if sum(hits[size - walked + 1 :]) >= limit:
+                break
+        return [task_key for _, _, task_key in heapq.nsmallest(limit, scored)]
@@ -0,0 +1,146 @@
+import asyncio
+import itertools
+
+from sortedcontainers import SortedList
+
+
+# ── Ranked Index ──────────────────────────────────────────────────
+# Page versions come from one counter so a fresh index never reuses a
+# version that a cached page of an older index carried.
+_versions = itertools.count(1)
+
+
+class RankIndex:
+    """Members of one period ordered by ``total_points``, highest first.
+
+    Only members with points are ranked. Every update costs O(log n) and
+    bumps the version of each page whose rows moved, so renderers can
+    cache pages and redraw only the ones that changed.
+    """
+
+    def __init__(self, page_size: int = 20):
+        self.page_size = page_size
+        self._order    = SortedList()  # (-points, member_id)
+        self._points   = {}
+        self._versions = {}
+        self._base     = next(_versions)
+
+    @classmethod
+    def from_totals(cls, totals, page_size: int = 20) -> "RankIndex":
+        """Index ``(member_id, total_points)`` pairs."""
+        index = cls(page_size)
+        for member_id, points in totals:
+            if points > 0:
+                index._points[member_id] = points
+        index._order.update((-points, member_id) for member_id, points in index._points.items())
+        return index
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def total_pages(self) -> int:
+        return max(1, -(-len(self._order) // self.page_size))
+
+    def points(self, member_id: int) -> int:
+        return self._points.get(member_id, 0)
+
+    def rank(self, member_id: int) -> int | None:
+        points = self._points.get(member_id)
+        if points is None:
+            return None
+        return self._order.index((-points, member_id)) + 1
+
+    def update(self, member_id: int, points: int) -> None:
+        old = self._points.get(member_id)
+        if old == points or (old is None and points <= 0):
+            return
+        last = len(self._order)
+        if old is None:
+            first_changed = last
+        else:
+            first_changed = self._order.index((-old, member_id))
+            self._order.remove((-old, member_id))
+            del self._points[member_id]
+        if points > 0:
+            self._order.add((-points, member_id))
+            self._points[member_id] = points
+            position = self._order.index((-points, member_id))
+        else:
+            position = len(self._order)
+        if old is not None and points > 0:
+            # A move only shifts the ranks between the old and new position.
+            self._touch(min(first_changed, position), max(first_changed, position))
+        else:
+            # An insert or removal shifts everything below it.
+            self._touch(min(first_changed, position), max(last, len(self._order)))
+
+    def clear(self) -> None:
+        self._touch(0, len(self._order))
+        self._order.clear()
+        self._points.clear()
+
+    def page(self, page: int) -> list[tuple[int, int]]:
+        start = page * self.page_size
+        return [(member_id, -neg) for neg, member_id in self._order[start : start + self.page_size]]
+
+    def page_version(self, page: int) -> int:
+        return self._versions.get(page, self._base)
+
+    def _touch(self, first: int, last: int) -> None:
+        stamp = next(_versions)
+        for page in range(first // self.page_size, last // self.page_size + 1):
+            self._versions[page] = stamp
+
+
+# ── Debounced Refresh ─────────────────────────────────────────────
+class RefreshScheduler:
+    """Coalesces refresh requests so each key is redrawn at most once per ``interval``.
+
+    ``mark`` only flags a key as dirty; the first mark after a quiet
+    period refreshes right away, later ones wait for the window to close
+    and then render the latest state once.
+    """
+
+    def __init__(self, refresh, interval: float):
+        self.refresh  = refresh
+        self.interval = interval
+        self._pending = {}
+        self._last    = {}
+
+    def mark(self, *key) -> None:
+        if key in self._pending:
+            return
+        loop  = asyncio.get_running_loop()
+        last  = self._last.get(key)
+        delay = 0.0 if last is None else max(0.0, last + self.interval - loop.time())
+        self._pending[key] = asyncio.create_task(self._run(key, delay))
+
+    async def _run(self, key: tuple, delay: float) -> None:
+        await asyncio.sleep(delay)
+        # Marks arriving while we render schedule the next window.
+        del self._pending[key]
+        self._last[key] = asyncio.get_running_loop().time()
+        await self._refresh(key)
+
+    async def _refresh(self, key: tuple) -> None:
+        try:
+            await self.refresh(*key)
+        except Exception as e:
+            print(f"⚠️ Refresh failed for {key}: {e}")
+
+    def cancel(self, *key) -> bool:
+        """Drop a pending refresh of ``key``; ``True`` if one was waiting."""
+        task = self._pending.pop(key, None)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    async def flush(self) -> None:
+        """Run every pending refresh now; used on shutdown."""
+        pending, self._pending = self._pending, {}
+        for key, task in pending.items():
+            task.cancel()
+        for key in pending:
+            await self._refresh(key)
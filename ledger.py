@@ -0,0 +1,82 @@
+import sys
+import time
+
+from models import MemberPeriodStats
+from storage import Storage
+
+
+# ── Entries ───────────────────────────────────────────────────────
+# claim:  a submission reserved ``amount`` completions (no points yet)
+# award:  an approval added ``points`` and ``amount`` completions
+# reject: a rejection released ``amount`` completions again
+# reset:  ``period`` started a new, empty epoch
+ENTRY_KINDS = ("claim", "award", "reject", "reset")
+
+
+def make_entry(
+    seq: int,
+    kind: str,
+    member_id: int | None = None,
+    task_key: str | None = None,
+    amount: int = 0,
+    points: int = 0,
+    reviewer: str | None = None,
+    period: str | None = None,
+) -> dict:
+    if kind not in ENTRY_KINDS:
+        raise ValueError(f"Unknown ledger entry kind: {kind!r}")
+    return {
+        "seq":       seq,
+        "kind":      kind,
+        "period":    period,
+        "member_id": member_id,
+        "task_key":  task_key,
+        "amount":    amount,
+        "points":    points,
+        "ts":        time.time(),
+        "reviewer":  reviewer,
+    }
+
+
+# ── Replay ────────────────────────────────────────────────────────
+def apply_entry(points: dict, entry: dict) -> None:
+    """Fold one entry into the ``points[period][member_id]`` totals."""
+    kind = entry["kind"]
+    if kind == "reset":
+        # The closed bucket is archived by whoever recorded the reset.
+        points[entry["period"]] = {}
+        return
+    member_id = int(entry["member_id"])  # stored as text by the SQLite ledger
+    task_key  = sys.intern(entry["task_key"])
+    for period in Storage.PERIODS:
+        data = points[period].get(member_id)
+        if kind == "reject":
+            if data is not None:
+                completions = data.completions
+                completions[task_key] = max(0, completions.get(task_key, 0) - entry["amount"])
+            continue
+        if data is None:
+            data = points[period][member_id] = MemberPeriodStats()
+        data.total_points += entry["points"]
+        completions = data.completions
+        completions[task_key] = completions.get(task_key, 0) + entry["amount"]
+
+
+def replay(points: dict, entries) -> int:
+    """Apply ``entries`` in order and return the last sequence number seen."""
+    seq = 0
+    for entry in entries:
+        apply_entry(points, entry)
+        seq = entry["seq"]
+    return seq
+
+
+def rebuild(storage: Storage) -> tuple[dict, int]:
+    """Recompute totals from the stored snapshot and ledger tail.
+
+    Reads only from ``storage``, so it can audit the live state without
+    touching it.
+    """
+    points, seq = storage.load_snapshot()
+    last_seq    = replay(points, storage.load_ledger(after_seq=seq))
+    return points, max(seq, last_seq)
@@ -0,0 +1,93 @@
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+
+# ── Identities ────────────────────────────────────────────────────
+class MemberIdentity(NamedTuple):
+    id: int
+    display_name: str
+    avatar_url: str | None
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+
+def identity_of(member) -> MemberIdentity:
+    """Snapshot of what the bot renders for a ``discord.Member`` or ``User``."""
+    return MemberIdentity(member.id, member.display_name, member.display_avatar.url)
+
+
+# ── Cache ─────────────────────────────────────────────────────────
+class MemberCache:
+    """Bounded LRU of member identities per guild with a time-to-live.
+
+    Entries are refreshed by gateway events and batch warming, so rendering
+    never has to ask Discord about a single member. A ``None`` entry
+    records a member that could not be found, so a departed member is not
+    queried again until it expires. ``generation(guild_id)`` changes
+    whenever a cached name or avatar changes, letting renderers invalidate
+    their own caches.
+    """
+
+    def __init__(self, capacity: int = 10000, ttl: float = 6 * 3600, clock=time.monotonic):
+        self.capacity = capacity
+        self.ttl      = ttl
+        self.clock    = clock
+        self._entries     = OrderedDict()  # (guild_id, member_id) -> (identity | None, stored_at)
+        self._generations = {}
+        self.hits   = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, guild_id: int, member_id: int) -> MemberIdentity | None:
+        return self.lookup(guild_id, member_id)[1]
+
+    def lookup(self, guild_id: int, member_id: int) -> tuple[bool, MemberIdentity | None]:
+        """``(known, identity)``; known but ``None`` means looked up and not found."""
+        key   = (guild_id, member_id)
+        entry = self._entries.get(key)
+        if entry is None or self.clock() - entry[1] > self.ttl:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self, guild_id: int, identity: MemberIdentity) -> None:
+        self._store((guild_id, identity.id), identity)
+
+    def put_missing(self, guild_id: int, member_id: int) -> None:
+        self._store((guild_id, member_id), None)
+
+    def forget(self, guild_id: int, member_id: int) -> None:
+        if self._entries.pop((guild_id, member_id), None) is not None:
+            self._bump(guild_id)
+
+    def generation(self, guild_id: int) -> int:
+        return self._generations.get(guild_id, 0)
+
+    def _store(self, key: tuple, identity: MemberIdentity | None) -> None:
+        previous = self._entries.pop(key, None)
+        self._entries[key] = (identity, self.clock())
+        if previous is None or previous[0] != identity:
+            self._bump(key[0])
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def _bump(self, guild_id: int) -> None:
+        self._generations[guild_id] = self._generations.get(guild_id, 0) + 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries":  len(self._entries),
+            "hits":     self.hits,
+            "misses":   self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,292 @@
+import asyncio
+import bisect
+import functools
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+# ── Registry ──────────────────────────────────────────────────────
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in seconds, as Prometheus expects."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last slot is +Inf
+        self.count  = 0
+        self.sum    = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum   += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate from the buckets, interpolating inside the one that holds ``q``."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+
+def _labels(labels: dict) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class Metrics:
+    """Counters, histograms and scrape-time gauges for one process.
+
+    Updates are single dict operations under the GIL, so the flush thread
+    can record alongside the event loop; readers copy a series before
+    iterating it. ``render`` produces the Prometheus text format; gauges
+    are computed by their callbacks at that time.
+    """
+
+    def __init__(self, prefix: str = "bot"):
+        self.prefix      = prefix
+        self.counters    = {}  # name -> {labels: value}
+        self.histograms  = {}  # name -> {labels: Histogram}
+        self.gauges      = {}  # name -> () -> [(labels dict, value)]
+        self.help        = {}
+        self.started_at  = time.time()
+
+    def describe(self, name: str, text: str) -> None:
+        self.help[name] = text
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        series = self.counters.setdefault(name, {})
+        key    = _labels(labels)
+        series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        series = self.histograms.setdefault(name, {})
+        key    = _labels(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(seconds)
+
+    def gauge(self, name: str, collect, text: str = "") -> None:
+        self.gauges[name] = collect
+        if text:
+            self.help[name] = text
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Time the block into ``<name>_seconds`` and count it in ``<name>_total`` by outcome."""
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except BaseException as e:
+            outcome = "cancelled" if isinstance(e, asyncio.CancelledError) else "error"
+            raise
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - started, **labels)
+            self.inc(f"{name}_total", outcome=outcome, **labels)
+
+    def track(self, name: str, **labels):
+        """Decorator timing a coroutine function, labelled with its qualified name."""
+        def decorate(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.timer(name, handler=func.__qualname__, **labels):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def summary(self, name: str, by: str) -> list[tuple[str, int, float, float]]:
+        """``(label, count, p50, p95)`` of one histogram grouped by one label, busiest first."""
+        merged = {}
+        for labels, histogram in list(self.histograms.get(name, {}).items()):
+            value  = dict(labels).get(by, "")
+            target = merged.get(value)
+            if target is None:
+                target = merged[value] = Histogram(histogram.bounds)
+            for i, count in enumerate(histogram.counts):
+                target.counts[i] += count
+            target.count += histogram.count
+            target.sum   += histogram.sum
+        rows = [(value, h.count, h.quantile(0.5), h.quantile(0.95)) for value, h in merged.items()]
+        return sorted(rows, key=lambda row: -row[1])
+
+    def total(self, name: str, **match) -> float:
+        wanted = set(_labels(match))
+        return sum(value for labels, value in list(self.counters.get(name, {}).items()) if wanted <= set(labels))
+
+    def render(self) -> str:
+        lines = []
+
+        def header(name: str, kind: str) -> str:
+            full = f"{self.prefix}_{name}"
+            if name in self.help:
+                lines.append(f"# HELP {full} {self.help[name]}")
+            lines.append(f"# TYPE {full} {kind}")
+            return full
+
+        for name, series in sorted(self.counters.items()):
+            full = header(name, "counter")
+            for labels, value in list(series.items()):
+                lines.append(f"{full}{_format_labels(labels)} {value}")
+        for name, series in sorted(self.histograms.items()):
+            full = header(name, "histogram")
+            for labels, histogram in list(series.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.bounds + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{full}_bucket{_format_labels(labels, (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{full}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+                lines.append(f"{full}_count{_format_labels(labels)} {histogram.count}")
+        for name, collect in sorted(self.gauges.items()):
+            try:
+                samples = collect()
+            except Exception as e:
+                print(f"⚠️ Metric {name} could not be collected: {e}")
+                continue
+            full = header(name, "gauge")
+            for labels, value in samples:
+                lines.append(f"{full}{_format_labels(_labels(labels))} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class TimedProxy:
+    """Wraps an object so every method call lands in ``<name>_seconds{op=...}``."""
+
+    def __init__(self, target, metrics: Metrics, name: str):
+        self._target  = target
+        self._metrics = metrics
+        self._name    = name
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._target, attr)
+        if attr.startswith("_") or not callable(value):
+            return value
+
+        @functools.wraps(value)
+        def timed(*args, **kwargs):
+            with self._metrics.timer(self._name, op=attr):
+                return value(*args, **kwargs)
+        return timed
+
+
+# ── HTTP Endpoint ─────────────────────────────────────────────────
+class MetricsServer:
+    """Minimal HTTP server answering ``GET /metrics`` with ``metrics.render()``."""
+
+    def __init__(self, metrics: Metrics, host: str = "127.0.0.1", port: int = 9108):
+        self.metrics = metrics
+        self.host    = host
+        self.port    = port
+        self._server = None
+
+    async def start(self) -> None:
+        if self._server is None and self.port:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+            method, path, *_ = request.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+            if method == "GET" and path.split("?", 1)[0] == "/metrics":
+                status, body = "200 OK", self.metrics.render().encode("utf-8")
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+# ── Sampling Profiler ─────────────────────────────────────────────
+class SamplingProfiler:
+    """Samples the stack of one thread (the event loop) from a helper thread.
+
+    Sampling costs the loop only the GIL hand-off, so it can run against
+    live traffic. Stacks are aggregated as folded ``caller;callee`` lines,
+    the input format of common flame graph tools.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        self.interval  = interval
+        self.max_depth = max_depth
+        self._lock     = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    async def capture(self, seconds: float, thread_id: int | None = None) -> "Profile":
+        """Sample ``thread_id`` (default: the calling thread) for ``seconds``."""
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already being captured")
+        thread_id = thread_id or threading.get_ident()
+        try:
+            return await asyncio.to_thread(self._sample, thread_id, seconds)
+        finally:
+            self._lock.release()
+
+    def _sample(self, thread_id: int, seconds: float) -> "Profile":
+        stacks   = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                stacks[tuple(reversed(stack))] += 1
+            time.sleep(self.interval)
+        return Profile(stacks, seconds)
+
+
+class Profile:
+    def __init__(self, stacks: Counter, seconds: float):
+        self.stacks  = stacks
+        self.seconds = seconds
+        self.samples = sum(stacks.values())
+
+    def folded(self) -> str:
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top(self, limit: int = 15) -> list[tuple[str, int, int]]:
+        """``(function, self samples, inclusive samples)``, by self time."""
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for function in set(stack):
+                inclusive[function] += count
+        return [(function, count, inclusive[function]) for function, count in own.most_common(limit)]
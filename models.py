@@ -0,0 +1,273 @@
+import gc
+import struct
+import sys
+from array import array
+from itertools import repeat
+
+
+# ── Records ───────────────────────────────────────────────────────
+class Task:
+    """One task definition.
+
+    Tasks are replaced, never changed in place: a pending submission
+    keeps a reference to the version it was claimed against instead of
+    a copy of it.
+    """
+
+    __slots__ = ("key", "name", "points", "max_completions")
+
+    def __init__(self, key: str, name: str, points: int, max_completions: int):
+        self.key             = sys.intern(key)
+        self.name            = name
+        self.points          = points
+        self.max_completions = max_completions
+
+    @classmethod
+    def from_dict(cls, key: str, data: dict) -> "Task":
+        return cls(key, data["name"], data["points"], data["max_completions"])
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "points": self.points, "max_completions": self.max_completions}
+
+    def _fields(self) -> tuple:
+        return self.key, self.name, self.points, self.max_completions
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Task) and self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash(self._fields())
+
+    def __repr__(self) -> str:
+        return f"Task({self.key!r}, {self.name!r}, points={self.points}, max_completions={self.max_completions})"
+
+
+def _message_id(value) -> int | None:
+    return int(value) if value else None
+
+
+class Submission:
+    """A claim waiting for review, or a resolved one on its way to the archive."""
+
+    __slots__ = (
+        "member_id", "task", "amount", "earned_points", "status",
+        "claim_message_id", "approval_message_id", "reviewed_by", "resolved_at",
+    )
+
+    def __init__(
+        self,
+        member_id: int,
+        task: Task,
+        amount: int,
+        earned_points: int,
+        status: str = "pending",
+        claim_message_id: int | None = None,
+        approval_message_id: int | None = None,
+        reviewed_by: str | None = None,
+        resolved_at: float | None = None,
+    ):
+        self.member_id           = member_id
+        self.task                = task
+        self.amount              = amount
+        self.earned_points       = earned_points
+        self.status              = status
+        self.claim_message_id    = claim_message_id
+        self.approval_message_id = approval_message_id
+        self.reviewed_by         = reviewed_by
+        self.resolved_at         = resolved_at
+
+    @property
+    def task_key(self) -> str:
+        return self.task.key
+
+    @classmethod
+    def from_dict(cls, data: dict, tasks: dict | None = None) -> "Submission":
+        """Build from a stored row; a task copy equal to the live task shares it."""
+        task = Task.from_dict(data["task_key"], data["task"])
+        live = tasks.get(task.key) if tasks else None
+        return cls(
+            member_id           = int(data["member_id"]),
+            task                = live if live == task else task,
+            amount              = data["amount"],
+            earned_points       = data["earned_points"],
+            status              = data["status"],
+            claim_message_id    = _message_id(data.get("claim_message_id")),
+            approval_message_id = _message_id(data.get("approval_message_id")),
+            reviewed_by         = data.get("reviewed_by"),
+            resolved_at         = data.get("resolved_at"),
+        )
+
+    def to_dict(self) -> dict:
+        """The stored row: the established field names, ids as strings."""
+        data = {
+            "member_id":           str(self.member_id),
+            "task_key":            self.task.key,
+            "task":                self.task.to_dict(),
+            "amount":              self.amount,
+            "earned_points":       self.earned_points,
+            "status":              self.status,
+            "claim_message_id":    str(self.claim_message_id) if self.claim_message_id else None,
+            "approval_message_id": str(self.approval_message_id) if self.approval_message_id else None,
+        }
+        if self.reviewed_by is not None:
+            data["reviewed_by"] = self.reviewed_by
+        if self.resolved_at is not None:
+            data["resolved_at"] = self.resolved_at
+        return data
+
+    def copy(self) -> "Submission":
+        return Submission(
+            self.member_id, self.task, self.amount, self.earned_points, self.status,
+            self.claim_message_id, self.approval_message_id, self.reviewed_by, self.resolved_at,
+        )
+
+
+class MemberPeriodStats:
+    """One member's totals in one period.
+
+    Members loaded from a snapshot keep their completions packed in the
+    snapshot's arrays until first read, so a guild starts without
+    building a dict for every member.
+    """
+
+    __slots__ = ("total_points", "_completions", "_cells", "_start", "_end")
+
+    def __init__(self, total_points: int = 0, cells: tuple | None = None, start: int = 0, end: int = 0):
+        self.total_points = total_points
+        self._completions = None if cells is not None else {}
+        self._cells       = cells  # (task keys, task index array, count array)
+        self._start       = start
+        self._end         = end
+
+    @property
+    def completions(self) -> dict:
+        """``{task_key: count}``, unpacked on first use."""
+        completions = self._completions
+        if completions is None:
+            keys, tasks, counts = self._cells
+            completions = self._completions = {
+                keys[tasks[i]]: counts[i] for i in range(self._start, self._end)
+            }
+            self._cells = None
+        return completions
+
+    def completion_items(self):
+        """``(task_key, count)`` pairs without unpacking them."""
+        if self._completions is not None:
+            return self._completions.items()
+        keys, tasks, counts = self._cells
+        return ((keys[tasks[i]], counts[i]) for i in range(self._start, self._end))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MemberPeriodStats":
+        stats = cls(data.get("total_points", 0))
+        stats._completions = {sys.intern(key): count for key, count in data.get("completions", {}).items()}
+        return stats
+
+    def to_dict(self) -> dict:
+        return {"total_points": self.total_points, "completions": dict(self.completion_items())}
+
+
+def points_from_dicts(points: dict) -> dict:
+    """``{period: {member_id: MemberPeriodStats}}`` from the JSON-shaped totals."""
+    return {
+        period: {int(member_id): MemberPeriodStats.from_dict(data) for member_id, data in bucket.items()}
+        for period, bucket in points.items()
+    }
+
+
+# ── Binary Snapshot ───────────────────────────────────────────────
+# Little-endian throughout:
+#   magic | seq u64 | period count u32 | task key bytes u32 | task keys, NUL separated
+#   per period: name length u8 | name | members u32 | cells u32
+#               member ids u64[members] | totals i64[members] | cell offsets u32[members + 1]
+#               cell task index u32[cells] | cell count i64[cells]
+# Cells are grouped by member: member ``i`` owns ``offsets[i]:offsets[i + 1]``.
+SNAPSHOT_MAGIC  = b"PTSNAP\x00\x01"
+_SNAPSHOT_HEAD  = struct.Struct("<QII")
+_PERIOD_HEAD    = struct.Struct("<II")
+
+
+def _little(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(typecode: str, view: memoryview, offset: int, count: int) -> tuple[array, int]:
+    values = array(typecode)
+    end    = offset + count * values.itemsize
+    values.frombytes(view[offset:end])
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values, end
+
+
+def encode_points(points: dict, seq: int) -> bytes:
+    """Pack ``{period: {member_id: MemberPeriodStats}}`` and the ledger position."""
+    keys, key_index = [], {}
+    parts = []
+    for period, bucket in points.items():
+        members = array("Q")
+        totals  = array("q")
+        offsets = array("I", [0])
+        tasks   = array("I")
+        counts  = array("q")
+        for member_id, data in bucket.items():
+            members.append(member_id)
+            totals.append(data.total_points)
+            for task_key, count in data.completion_items():
+                index = key_index.get(task_key)
+                if index is None:
+                    index = key_index[task_key] = len(keys)
+                    keys.append(task_key)
+                tasks.append(index)
+                counts.append(count)
+            offsets.append(len(tasks))
+        name = period.encode("utf-8")
+        parts += [
+            bytes((len(name),)), name, _PERIOD_HEAD.pack(len(members), len(tasks)),
+            _little(members), _little(totals), _little(offsets), _little(tasks), _little(counts),
+        ]
+    key_bytes = "\x00".join(keys).encode("utf-8")
+    head      = SNAPSHOT_MAGIC + _SNAPSHOT_HEAD.pack(seq, len(points), len(key_bytes)) + key_bytes
+    return b"".join([head, *parts])
+
+
+def decode_points(data: bytes) -> tuple[dict, int]:
+    """Inverse of ``encode_points``; completions stay packed until read."""
+    view = memoryview(data)
+    if view[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError("Not a points snapshot")
+    offset = len(SNAPSHOT_MAGIC)
+    seq, period_count, key_length = _SNAPSHOT_HEAD.unpack_from(view, offset)
+    offset += _SNAPSHOT_HEAD.size
+    key_text = bytes(view[offset : offset + key_length]).decode("utf-8")
+    keys     = [sys.intern(key) for key in key_text.split("\x00")] if key_text else []
+    offset  += key_length
+    points  = {}
+    # Millions of small objects and no cycles among them: pause the
+    # collector instead of letting it rescan the young heap repeatedly.
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(period_count):
+            name_length = view[offset]
+            period      = bytes(view[offset + 1 : offset + 1 + name_length]).decode("utf-8")
+            offset     += 1 + name_length
+            member_count, cell_count = _PERIOD_HEAD.unpack_from(view, offset)
+            offset += _PERIOD_HEAD.size
+            members, offset = _read_array("Q", view, offset, member_count)
+            totals,  offset = _read_array("q", view, offset, member_count)
+            offsets, offset = _read_array("I", view, offset, member_count + 1)
+            tasks,   offset = _read_array("I", view, offset, cell_count)
+            counts,  offset = _read_array("q", view, offset, cell_count)
+            cells = (keys, tasks, counts)
+            points[period] = dict(zip(
+                members, map(MemberPeriodStats, totals, repeat(cells), offsets, offsets[1:]),
+            ))
+    finally:
+        if collecting:
+            gc.enable()
+    return points, seq
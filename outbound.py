@@ -0,0 +1,173 @@
+import asyncio
+import itertools
+
+
+# ── Priorities ────────────────────────────────────────────────────
+INTERACTION = 0  # responses bound to Discord's 3-second deadline: never queued
+USER        = 1  # messages a member is waiting for (claim / approval embeds)
+PANEL       = 2  # cosmetic refreshes (leaderboards, control panels, open orders)
+PRIORITY_NAMES = {INTERACTION: "interaction", USER: "user", PANEL: "panel"}
+
+
+class RouteBudget:
+    """Fixed window: at most ``capacity`` calls per ``period`` seconds on one route.
+
+    Discord opens a bucket's window with the first request it receives and
+    resets it ``X-RateLimit-Reset-After`` seconds later. The client only
+    sees when that request's response arrives, so a window starts when its
+    first call returns, and the next one opens only once every call of the
+    current window has returned. A call that returns after its window
+    reset (a slow or retried one) may have landed in Discord's next window
+    and is charged to it. Every estimate errs on the late side.
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity  = capacity
+        self.period    = period
+        self.remaining = capacity
+        self.reset_at  = None  # set when the window's first call returns
+        self.in_flight = 0
+        self._carried  = []    # return times of calls charged to the next window
+        self._changed  = None  # future resolved when a call returns
+
+    async def acquire(self) -> None:
+        """Take one call from the window; pair with ``release`` once it returns."""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self.reset_at is not None and now >= self.reset_at and not self.in_flight:
+                self.remaining = self.capacity - len(self._carried)
+                self.reset_at  = self._carried[0] + self.period if self._carried else None
+                self._carried  = []
+                continue
+            if self.remaining > 0 and (self.reset_at is None or now < self.reset_at):
+                self.remaining -= 1
+                self.in_flight += 1
+                return
+            if self.reset_at is None or self.in_flight:
+                if self._changed is None:
+                    self._changed = loop.create_future()
+                await asyncio.shield(self._changed)
+            else:
+                await asyncio.sleep(self.reset_at - now)
+
+    def release(self) -> None:
+        now = asyncio.get_running_loop().time()
+        self.in_flight -= 1
+        if self.reset_at is None:
+            self.reset_at = now + self.period
+        elif now >= self.reset_at:
+            self._carried.append(now)
+        if self._changed is not None:
+            self._changed.set_result(None)
+            self._changed = None
+
+
+# ── Scheduler ─────────────────────────────────────────────────────
+class OutboundScheduler:
+    """Central queue for outbound Discord REST calls.
+
+    Jobs are zero-argument coroutine factories. Lower priority values run
+    first; within a priority, jobs run in submission order. A route (one
+    Discord rate-limit bucket) is held to its own budget so a burst of panel
+    edits cannot starve member-facing sends elsewhere.
+    """
+
+    def __init__(self, workers: int = 4, route_capacity: int = 5, route_period: float = 5.0):
+        self.workers        = workers
+        self.route_capacity = route_capacity
+        self.route_period   = route_period
+        self._queue   = None
+        self._tasks   = []
+        self._seq     = itertools.count()
+        self._budgets = {}
+        self._depth   = {priority: 0 for priority in PRIORITY_NAMES}
+        self._waits   = {priority: {"count": 0, "total": 0.0, "max": 0.0} for priority in PRIORITY_NAMES}
+
+    def start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def call(self, factory, priority: int = PANEL, route: str | None = None):
+        """Run ``factory()`` through the queue and return its result."""
+        if priority == INTERACTION:
+            self._record_wait(priority, 0.0)
+            return await factory()
+        return await self._enqueue(factory, priority, route)
+
+    def submit(self, factory, priority: int = PANEL, route: str | None = None) -> asyncio.Future:
+        """Queue ``factory()`` without waiting; failures are logged."""
+        future = self._enqueue(factory, priority, route)
+        future.add_done_callback(_log_failure)
+        return future
+
+    def _enqueue(self, factory, priority: int, route: str | None) -> asyncio.Future:
+        self.start()
+        loop   = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._depth[priority] += 1
+        self._queue.put_nowait((priority, next(self._seq), route, factory, future, loop.time()))
+        return future
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            priority, _, route, factory, future, enqueued = await self._queue.get()
+            self._depth[priority] -= 1
+            if future.cancelled():
+                continue
+            budget = self._budget(route) if route is not None else None
+            if budget is not None:
+                await budget.acquire()
+            self._record_wait(priority, loop.time() - enqueued)
+            try:
+                result = await factory()
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                if budget is not None:
+                    budget.release()
+
+    def _budget(self, route: str) -> RouteBudget:
+        budget = self._budgets.get(route)
+        if budget is None:
+            budget = self._budgets[route] = RouteBudget(self.route_capacity, self.route_period)
+        return budget
+
+    def _record_wait(self, priority: int, seconds: float) -> None:
+        waits = self._waits[priority]
+        waits["count"] += 1
+        waits["total"] += seconds
+        waits["max"]    = max(waits["max"], seconds)
+
+    def stats(self) -> dict:
+        return {
+            PRIORITY_NAMES[priority]: {
+                "queued":      self._depth[priority],
+                "calls":       waits["count"],
+                "avg_wait_ms": round(1000 * waits["total"] / waits["count"], 2) if waits["count"] else 0.0,
+                "max_wait_ms": round(1000 * waits["max"], 2),
+            }
+            for priority, waits in self._waits.items()
+        }
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        if self._queue is not None:
+            while not self._queue.empty():
+                priority, _, _, _, future, _ = self._queue.get_nowait()
+                self._depth[priority] -= 1
+                future.cancel()
+        self._tasks = []
+        self._queue = None
+
+
+def _log_failure(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        print(f"⚠️ Outbound call failed: {future.exception()}")
@@ -0,0 +1,444 @@
+# ── Trace Replay ──────────────────────────────────────────────────
+# Replays a recorded (TRACE_FILE) or synthesized interaction trace through
+# the real handlers at 1×–100× speed and reports throughput and latency:
+#
+#   python replay.py synth --out monday.jsonl
+#   python replay.py run monday.jsonl --speed 20
+#   python replay.py run traces/prod.jsonl --speed 5 --latency-ms 120 --output report.json
+#
+# Discord is replaced by bench.py's fakes on top of a simulated HTTP
+# layer: each REST call waits a sampled latency, and calls beyond a
+# bucket's budget get a 429 and retry after the advertised delay, the way
+# the library does. Buckets are fixed windows that open with their first
+# request, as Discord's ``X-RateLimit-Reset-After`` describes them.
+#
+# Claims, approvals, bulk reviews and resets are replayed. ``ui`` events
+# (other button, select and modal handlers) are only counted: the trace
+# records which handler ran, not the input it would need to run again.
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+from collections import Counter, defaultdict
+
+import bench
+from models import Submission, Task
+from tracing import TRACE_VERSION, read_trace
+
+REPLAYED = ("claim", "review", "bulk_review", "reset")
+INTERACTION_DEADLINE = 3.0  # seconds Discord waits for the first response
+
+
+# ── Simulated HTTP ────────────────────────────────────────────────
+class SimulatedApi(bench.Api):
+    """REST stand-in with latency and per-bucket rate limits."""
+
+    def __init__(
+        self,
+        rng: random.Random,
+        latency: float = 0.08,
+        jitter: float = 0.04,
+        bucket_capacity: int = 5,
+        bucket_period: float = 5.0,
+    ):
+        super().__init__()
+        self.rng             = rng
+        self.latency         = latency
+        self.jitter          = jitter
+        self.bucket_capacity = bucket_capacity
+        self.bucket_period   = bucket_period
+        self.rate_limited    = Counter()  # endpoint -> 429s answered
+        self.retry_wait      = 0.0
+        self._windows        = {}  # (endpoint family, bucket) -> [reset at, remaining]
+
+    async def request(self, endpoint: str, bucket=None) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self.hit(endpoint)
+            await asyncio.sleep(max(0.0, self.rng.gauss(self.latency, self.jitter)))
+            if bucket is None:
+                return
+            key    = (endpoint.split(".")[0], bucket)
+            window = self._windows.get(key)
+            now    = loop.time()
+            if window is None or now >= window[0]:
+                window = self._windows[key] = [now + self.bucket_period, self.bucket_capacity]
+            if window[1] > 0:
+                window[1] -= 1
+                return
+            retry_after = window[0] - now
+            self.rate_limited[endpoint] += 1
+            self.retry_wait += retry_after
+            await asyncio.sleep(retry_after)
+
+
+class TimedResponse(bench.FakeResponse):
+    """Remembers when the interaction was first answered."""
+
+    acked_at = None
+
+    @property
+    def _done(self) -> bool:
+        return self.acked_at is not None
+
+    @_done.setter
+    def _done(self, value: bool) -> None:
+        if value and self.acked_at is None:
+            self.acked_at = asyncio.get_running_loop().time()
+
+
+# ── Synthetic Traces ──────────────────────────────────────────────
+def synthesize(args) -> None:
+    """A Monday evening: a claim rush, a mass review, then the weekly reset."""
+    rng     = random.Random(args.seed)
+    members = [f"m{i:06d}" for i in range(args.members)]
+    tasks   = {f"t{i:04d}": (rng.choice((5, 10, 15, 25, 50)), rng.choice((0, 0, 3, 5, 10))) for i in range(args.tasks)}
+    events  = []
+    t       = 0.0
+    claims  = []
+    for i in range(args.claims):
+        t += rng.expovariate(args.claims / args.rush)
+        task = rng.choice(list(tasks))
+        points, max_completions = tasks[task]
+        claim = {
+            "t": round(t, 4), "kind": "claim", "ms": None, "guild": "g0",
+            "member": rng.choice(members), "task": task, "points": points,
+            "max_completions": max_completions, "amount": rng.randint(1, 3), "submission": f"s{i:06d}",
+        }
+        events.append(claim)
+        claims.append(claim)
+    t += args.gap
+    reviewers = [f"r{i:02d}" for i in range(args.reviewers)]
+    fields    = ("submission", "member", "task", "points", "max_completions", "amount")
+    pending   = list(claims)
+    rng.shuffle(pending)
+    while pending:
+        reviewer = rng.choice(reviewers)
+        status   = "approved" if rng.random() < 0.9 else "rejected"
+        if rng.random() < args.bulk:
+            batch, pending = pending[:25], pending[25:]
+            t += rng.uniform(2.0, 6.0)
+            events.append({
+                "t": round(t, 4), "kind": "bulk_review", "ms": None, "guild": "g0", "reviewer": reviewer,
+                "status": status, "items": [{key: claim[key] for key in fields} for claim in batch],
+            })
+        else:
+            claim = pending.pop()
+            t += rng.uniform(0.3, 1.5)
+            events.append({
+                "t": round(t, 4), "kind": "review", "ms": None, "guild": "g0", "reviewer": reviewer,
+                "status": status, **{key: claim[key] for key in fields},
+            })
+    t += args.gap
+    events.append({"t": round(t, 4), "kind": "reset", "ms": None, "guild": "g0", "period": "weekly"})
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"trace": TRACE_VERSION, "started_at": None, "synthetic": True}) + "\n")
+        for event in events:
+            f.write(json.dumps(event, separators=(",", ":")) + "\n")
+    print(f"Wrote {len(events)} events spanning {t:.0f} s to {args.out}")
+
+
+# ── Replay ────────────────────────────────────────────────────────
+class Replay:
+    def __init__(self, bot, api: SimulatedApi, events: list, speed: float):
+        self.bot     = bot
+        self.api     = api
+        self.events  = events
+        self.speed   = speed
+        self.guilds  = {}  # pseudonym -> FakeGuild
+        self.members = {}  # pseudonym -> member id
+        self.tasks   = {}  # (guild, pseudonym) -> task key
+        self.claimed = {}  # submission pseudonym -> Future of the real submission id
+        self.latency = defaultdict(list)  # kind -> seconds from due to handler return
+        self.acked   = defaultdict(list)  # kind -> seconds from due to the first response
+        self.errors  = Counter()
+        self.skipped = Counter()
+
+    def guild(self, pseudonym: str) -> bench.FakeGuild:
+        guild = self.guilds.get(pseudonym)
+        if guild is None:
+            bot   = self.bot
+            guild = bench.FakeGuild(self.api, 0, [
+                bot.TASK_CHANNEL_NAME, bot.OPEN_TASKS_CHANNEL_NAME, bot.CLAIM_CHANNEL_NAME,
+                bot.APPROVAL_CHANNEL_NAME, bot.WEEKLY_CHANNEL_NAME, bot.MONTHLY_CHANNEL_NAME,
+            ])
+            # Every guild gets its own channel ids, and so its own rate-limit buckets.
+            guild.id = bench.GUILD_ID + 1000 * len(self.guilds)
+            for offset, channel in enumerate(guild.text_channels):
+                channel.id = guild.id + 10 + offset
+            self.guilds[pseudonym] = guild
+        return guild
+
+    def member(self, guild: bench.FakeGuild, pseudonym: str, admin: bool = False) -> bench.FakeMember:
+        member_id = self.members.get(pseudonym)
+        if member_id is None:
+            member_id = self.members[pseudonym] = bench.MEMBER_BASE + len(self.members)
+        guild.member_count = max(guild.member_count, member_id - bench.MEMBER_BASE + 1)
+        return bench.FakeMember(member_id, roles=list(guild.roles) if admin else None)
+
+    def task(self, guild: bench.FakeGuild, event: dict) -> tuple[str, Task]:
+        key = self.tasks.get((guild.id, event["task"]))
+        if key is None:
+            key = self.tasks[(guild.id, event["task"])] = f"task_{len(self.tasks):05d}"
+            self.bot.guild_state(guild).put_task(
+                Task(key, f"Task {len(self.tasks):05d}", event["points"], event["max_completions"]),
+            )
+        return key, self.bot.guild_state(guild).tasks[key]
+
+    def prepare(self) -> None:
+        """Create tasks and the pending submissions that were claimed before the trace began."""
+        loop = asyncio.get_running_loop()
+        for event in self.events:
+            if event["kind"] in REPLAYED:
+                self.guild(event["guild"])
+            if event["kind"] == "claim":
+                self.task(self.guild(event["guild"]), event)
+                self.claimed[event["submission"]] = loop.create_future()
+        for event in self.events:
+            if event["kind"] not in ("review", "bulk_review"):
+                continue
+            guild = self.guild(event["guild"])
+            for item in event.get("items") or [event]:
+                if item["submission"] in self.claimed:
+                    continue
+                _, task        = self.task(guild, item)
+                member         = self.member(guild, item["member"])
+                submission_id  = f"{member.id}_{self.api.next_id()}"
+                self.bot.guild_state(guild).put_submission(submission_id, Submission(
+                    member_id     = member.id,
+                    task          = task,
+                    amount        = item["amount"],
+                    earned_points = task.points * item["amount"],
+                ))
+                future = self.claimed[item["submission"]] = loop.create_future()
+                future.set_result(submission_id)
+
+    def interaction(self, guild: bench.FakeGuild, user: bench.FakeMember) -> bench.FakeInteraction:
+        """An interaction whose clock starts now: reviews cannot begin before their claim is posted."""
+        interaction = bench.FakeInteraction(self.api, guild, user)
+        interaction.response = TimedResponse(self.api)
+        interaction.ready    = asyncio.get_running_loop().time()
+        return interaction
+
+    async def claim(self, event: dict) -> bench.FakeInteraction:
+        guild          = self.guild(event["guild"])
+        member         = self.member(guild, event["member"])
+        task_key, task = self.task(guild, event)
+        interaction    = self.interaction(guild, member)
+        modal          = self.bot.AmountModal(task_key, task)
+        modal.children[0].value = str(event["amount"])
+        future = self.claimed[event["submission"]]
+        try:
+            await modal.callback(interaction)
+        finally:
+            if not future.done():
+                future.set_result(f"{member.id}_{interaction.id}")
+        return interaction
+
+    async def review(self, event: dict) -> bench.FakeInteraction:
+        guild         = self.guild(event["guild"])
+        reviewer      = self.member(guild, event["reviewer"], admin=True)
+        submission_id = await self.claimed[event["submission"]]
+        interaction   = self.interaction(guild, reviewer)
+        await self.bot.resolve_approval(interaction, submission_id, event["status"])
+        return interaction
+
+    async def bulk_review(self, event: dict) -> bench.FakeInteraction:
+        guild    = self.guild(event["guild"])
+        reviewer = self.member(guild, event["reviewer"], admin=True)
+        ids      = [await self.claimed[item["submission"]] for item in event["items"]]
+        view     = self.bot.BulkReviewView(guild, reviewer)
+        view.selected = dict.fromkeys(ids)
+        interaction   = self.interaction(guild, reviewer)
+        await view.apply(interaction, event["status"])
+        return interaction
+
+    async def reset(self, event: dict) -> None:
+        await self.bot.reset_leaderboard(self.guild(event["guild"]), event["period"])
+
+    async def _run_event(self, event: dict, due: float) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            interaction = await getattr(self, event["kind"])(event)
+        except Exception as e:
+            self.errors[f"{event['kind']}: {type(e).__name__}"] += 1
+            return
+        if interaction is not None:
+            due = max(due, interaction.ready)
+            if interaction.response.acked_at is not None:
+                self.acked[event["kind"]].append(interaction.response.acked_at - due)
+        self.latency[event["kind"]].append(loop.time() - due)
+
+    async def run(self) -> float:
+        loop    = asyncio.get_running_loop()
+        started = loop.time()
+        running = []
+        for event in self.events:
+            if event["kind"] not in REPLAYED:
+                self.skipped[event["kind"]] += 1
+                continue
+            due   = started + event["t"] / self.speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            running.append(asyncio.create_task(self._run_event(event, due)))
+        await asyncio.gather(*running)
+        await self.bot.leaderboard_refresh.flush()
+        return loop.time() - started
+
+
+def latency_summary(samples: list[float]) -> dict:
+    ms = sorted(sample * 1000 for sample in samples)
+    return {
+        "count":  len(ms),
+        "p50_ms": round(bench.percentile(ms, 50), 2),
+        "p95_ms": round(bench.percentile(ms, 95), 2),
+        "p99_ms": round(bench.percentile(ms, 99), 2),
+        "max_ms": round(ms[-1], 2) if ms else 0.0,
+    }
+
+
+async def replay(args, data_dir: str) -> dict:
+    header, events = read_trace(args.trace)
+    if args.limit:
+        events = events[: args.limit]
+    rng = random.Random(args.seed)
+    bot = bench.load_bot(data_dir, args.backend, args.window)
+    api = SimulatedApi(rng, args.latency_ms / 1000, args.jitter_ms / 1000, args.bucket_capacity, args.bucket_period)
+    run = Replay(bot, api, events, args.speed)
+    run.prepare()
+    bot.states.start()
+    bot.outbound.start()
+    # Publish the panels once, as on startup.
+    for guild in run.guilds.values():
+        await bot.update_open_tasks_channel(guild)
+        await bot.update_leaderboard_channel(guild, "weekly")
+        await bot.update_leaderboard_channel(guild, "monthly")
+    api.calls.clear()
+    span = events[-1]["t"] if events else 0.0
+    print(f"Replaying {len(events)} events ({span:.0f} s recorded) at {args.speed:g}× …")
+    try:
+        wall = await run.run()
+        # Queued panel edits belong to the load; wait for them before stopping the clock.
+        loop = asyncio.get_running_loop()
+        drain_started = loop.time()
+        while any(stats["queued"] for stats in bot.outbound.stats().values()):
+            await asyncio.sleep(0.05)
+        wall += loop.time() - drain_started
+    finally:
+        await bot.outbound.close()
+        await bot.states.close()
+
+    replayed = sum(len(samples) for samples in run.latency.values())
+    recorded = defaultdict(list)
+    for event in events:
+        if event.get("ms") is not None:
+            recorded[event["kind"]].append(event["ms"] / 1000)
+    report = {
+        "trace":            os.path.abspath(args.trace),
+        "synthetic":        bool(header.get("synthetic")),
+        "speed":            args.speed,
+        "events":           len(events),
+        "replayed":         replayed,
+        "skipped":          dict(run.skipped),
+        "errors":           dict(run.errors),
+        "wall_seconds":     round(wall, 2),
+        "throughput_per_s": round(replayed / wall, 2) if wall else 0.0,
+        "latency":          {kind: latency_summary(samples) for kind, samples in run.latency.items()},
+        "ack_latency":      {kind: latency_summary(samples) for kind, samples in run.acked.items()},
+        "late_responses":   {
+            kind: late for kind, samples in run.acked.items()
+            if (late := sum(sample > INTERACTION_DEADLINE for sample in samples))
+        },
+        "recorded_latency": {kind: latency_summary(samples) for kind, samples in recorded.items()},
+        "api_calls":        sum(api.calls.values()),
+        "api_calls_by_endpoint": dict(sorted(api.calls.items())),
+        "rate_limited":     sum(api.rate_limited.values()),
+        "rate_limit_wait_s": round(api.retry_wait, 2),
+        "outbound":         bot.outbound.stats(),
+        "simulation": {
+            "latency_ms":      args.latency_ms,
+            "jitter_ms":       args.jitter_ms,
+            "bucket_capacity": args.bucket_capacity,
+            "bucket_period":   args.bucket_period,
+            "backend":         args.backend,
+            "window":          args.window,
+        },
+    }
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{report['replayed']} events in {report['wall_seconds']} s → {report['throughput_per_s']} events/s")
+    print(f"  {'':<12} {'':<7} {'p50':>9}    {'p95':>9}    {'p99':>9}    {'max':>9}    first response p95")
+    for kind, stats in sorted(report["latency"].items()):
+        line = f"  {kind:<12} ×{stats['count']:<6}" + "".join(
+            f" {stats[key]:>9.1f} ms" for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")
+        )
+        if kind in report["ack_latency"]:
+            line += f"   {report['ack_latency'][kind]['p95_ms']:.1f} ms"
+        if kind in report["recorded_latency"]:
+            line += f"   (recorded p95 {report['recorded_latency'][kind]['p95_ms']:.1f} ms)"
+        print(line)
+    print(f"  API calls {report['api_calls']} · 429s {report['rate_limited']} ({report['rate_limit_wait_s']} s waiting)")
+    if report["late_responses"]:
+        print(f"  ⚠️ First response after Discord's {INTERACTION_DEADLINE:g} s deadline: {report['late_responses']}")
+    if report["skipped"]:
+        print(f"  Not replayed: {report['skipped']}")
+    if report["errors"]:
+        print(f"  ⚠️ Errors: {report['errors']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Record-and-replay load testing for the bot")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    synth = commands.add_parser("synth", help="write a synthetic Monday-evening trace")
+    synth.add_argument("--out", default="monday.jsonl")
+    synth.add_argument("--claims", type=int, default=600)
+    synth.add_argument("--rush", type=float, default=600.0, help="seconds the claim rush lasts")
+    synth.add_argument("--gap", type=float, default=60.0, help="seconds between rush, review and reset")
+    synth.add_argument("--members", type=int, default=400)
+    synth.add_argument("--tasks", type=int, default=30)
+    synth.add_argument("--reviewers", type=int, default=3)
+    synth.add_argument("--bulk", type=float, default=0.3, help="share of review steps done in bulk")
+    synth.add_argument("--seed", type=int, default=1)
+
+    run = commands.add_parser("run", help="replay a trace through the handlers")
+    run.add_argument("trace")
+    run.add_argument("--speed", type=float, default=1.0, help="1 = recorded pace, up to 100")
+    run.add_argument("--limit", type=int, help="replay only the first N events")
+    run.add_argument("--latency-ms", type=float, default=80.0)
+    run.add_argument("--jitter-ms", type=float, default=40.0)
+    run.add_argument("--bucket-capacity", type=int, default=5, help="requests per bucket before a 429")
+    run.add_argument("--bucket-period", type=float, default=5.0, help="seconds per bucket window")
+    run.add_argument("--backend", choices=["sqlite", "json"], default="sqlite")
+    run.add_argument("--window", type=float, default=0.05, help="mutation batch window in seconds")
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    if args.command == "synth":
+        synthesize(args)
+        return 0
+    if not 1 <= args.speed <= 100:
+        parser.error("--speed must be between 1 and 100")
+    data_dir = tempfile.mkdtemp(prefix="bot-replay-")
+    try:
+        report = asyncio.run(replay(args, data_dir))
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Report written to {args.output}")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import asyncio
+from datetime import datetime, timedelta
+
+
+# ── Deadlines ─────────────────────────────────────────────────────
+# weekly:  every Monday at 19:00
+# monthly: the 1st of each month at 20:00
+RESET_HOURS = {"weekly": 19, "monthly": 20}
+
+
+def _at(tz, year: int, month: int, day: int, hour: int) -> datetime:
+    # pytz zones need localize(); a plain tzinfo goes in the constructor.
+    naive = datetime(year, month, day, hour)
+    if hasattr(tz, "localize"):
+        return tz.localize(naive)
+    return naive.replace(tzinfo=tz)
+
+
+def _shift_month(year: int, month: int, delta: int) -> tuple[int, int]:
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def last_deadline(period: str, now: datetime) -> datetime:
+    """The most recent reset deadline of ``period`` at or before ``now``."""
+    tz    = now.tzinfo
+    local = now.astimezone(tz)
+    hour  = RESET_HOURS[period]
+    if period == "weekly":
+        day      = local.date() - timedelta(days=local.weekday())
+        deadline = _at(tz, day.year, day.month, day.day, hour)
+        if deadline > now:
+            day      = day - timedelta(days=7)
+            deadline = _at(tz, day.year, day.month, day.day, hour)
+        return deadline
+    deadline = _at(tz, local.year, local.month, 1, hour)
+    if deadline > now:
+        year, month = _shift_month(local.year, local.month, -1)
+        deadline    = _at(tz, year, month, 1, hour)
+    return deadline
+
+
+def next_deadline(period: str, now: datetime) -> datetime:
+    """The first reset deadline of ``period`` strictly after ``now``."""
+    tz   = now.tzinfo
+    last = last_deadline(period, now).astimezone(tz)
+    hour = RESET_HOURS[period]
+    if period == "weekly":
+        day = last.date() + timedelta(days=7)
+        return _at(tz, day.year, day.month, day.day, hour)
+    year, month = _shift_month(last.year, last.month, 1)
+    return _at(tz, year, month, 1, hour)
+
+
+def epoch_label(period: str, start: datetime) -> str:
+    """Label of the ``period`` epoch that began at ``start``: ISO week or year-month."""
+    if period == "weekly":
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}"
+    return f"{start.year}-{start.month:02d}"
+
+
+# ── Scheduler ─────────────────────────────────────────────────────
+class ResetScheduler:
+    """Runs period resets at their deadlines and catches up on missed ones.
+
+    Instead of polling every minute, the loop sleeps until the nearest
+    deadline. Each target (a guild) remembers the deadline of its last
+    reset through ``state_for(target)``, so a reset that was missed while
+    the bot was down runs on the next start, and one that already ran is
+    never repeated. ``clock`` and ``sleep`` can be replaced in tests.
+    """
+
+    def __init__(
+        self,
+        reset,
+        targets,
+        state_for,
+        tz,
+        periods: tuple = ("weekly", "monthly"),
+        clock=None,
+        sleep=asyncio.sleep,
+        max_sleep: float = 3600.0,
+    ):
+        self.reset     = reset      # async (target, period, deadline)
+        self.targets   = targets    # () -> iterable of targets
+        self.state_for = state_for  # target -> object with last_reset / mark_reset
+        self.tz        = tz
+        self.periods   = periods
+        self.clock     = clock or (lambda: datetime.now(tz))
+        self.sleep     = sleep
+        self.max_sleep = max_sleep
+        self._task     = None
+
+    async def run_due(self) -> list[tuple]:
+        """Run every reset whose deadline has passed; returns what ran."""
+        now = self.clock()
+        ran = []
+        for period in self.periods:
+            deadline = last_deadline(period, now)
+            for target in list(self.targets()):
+                state = self.state_for(target)
+                last  = state.last_reset(period)
+                if last is None:
+                    # First start with this store: adopt the current period as-is.
+                    state.mark_reset(period, deadline.timestamp())
+                    continue
+                if last >= deadline.timestamp():
+                    continue
+                try:
+                    await self.reset(target, period, deadline)
+                except Exception as e:
+                    print(f"⚠️ {period.capitalize()} reset failed for {target}: {e}")
+                    continue
+                ran.append((target, period))
+        return ran
+
+    def seconds_until_next(self) -> float:
+        now = self.clock()
+        due = min(next_deadline(period, now) for period in self.periods)
+        return max(0.0, (due - now).total_seconds())
+
+    async def _run(self) -> None:
+        while True:
+            await self.run_due()
+            # Wake at least hourly so clock jumps and DST never stretch a sleep.
+            await self.sleep(min(self.seconds_until_next(), self.max_sleep))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: partitions are not locked there
+    fcntl = None
+
+
+# ── Ownership ─────────────────────────────────────────────────────
+def shard_for(guild_id: int, shard_count: int) -> int:
+    """The shard Discord delivers ``guild_id``'s events to."""
+    return (guild_id >> 22) % shard_count
+
+
+# ── Partition Locks ───────────────────────────────────────────────
+class PartitionLocked(RuntimeError):
+    pass
+
+
+class PartitionLock:
+    """Exclusive lock on one guild directory, held while a process serves it.
+
+    It is an ``flock`` on ``<directory>/.lock``, so the kernel drops it
+    when the process exits and a crashed shard never leaves a guild
+    locked. The holder's pid is written into the file for diagnosis.
+    """
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, ".lock")
+        self._fd  = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode("ascii"))
+        self._fd = fd
+        return True
+
+    async def acquire(self, timeout: float, interval: float = 0.1) -> None:
+        loop     = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.try_acquire():
+            if loop.time() >= deadline:
+                raise PartitionLocked(f"{os.path.dirname(self.path)} is held by pid {self.holder()}")
+            await asyncio.sleep(interval)
+
+    def holder(self) -> str:
+        try:
+            with open(self.path, "r") as f:
+                return f.read().strip() or "?"
+        except OSError:
+            return "?"
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+# ── Shard Bus ─────────────────────────────────────────────────────
+class _BusProtocol(asyncio.DatagramProtocol):
+    def __init__(self, bus: "ShardBus"):
+        self.bus = bus
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.bus._deliver(data)
+
+
+class ShardBus:
+    """Small JSON messages between the shard processes of one host.
+
+    Each process binds ``<directory>/shard-<id>.sock``; ``publish`` sends
+    to one shard or to every other one. Delivery is best effort: a
+    message for a shard that is not running is dropped, so the bus only
+    carries hints and the stores stay the source of truth.
+    """
+
+    def __init__(self, directory: str, shard_id: int):
+        self.directory = directory
+        self.shard_id  = shard_id
+        self.path      = self._path(shard_id)
+        self._handlers  = {}  # kind -> async (message)
+        self._transport = None
+        self._sender    = None
+        self._tasks     = set()
+
+    def _path(self, shard_id: int) -> str:
+        return os.path.join(self.directory, f"shard-{shard_id}.sock")
+
+    def on(self, kind: str, handler) -> None:
+        self._handlers[kind] = handler
+
+    async def start(self) -> None:
+        if self._transport is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # A socket left behind by this shard's previous run.
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: _BusProtocol(self), local_addr=self.path, family=socket.AF_UNIX,
+        )
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setblocking(False)
+
+    def peers(self) -> list[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(self.directory, name) for name in names
+            if name.startswith("shard-") and name.endswith(".sock") and os.path.join(self.directory, name) != self.path
+        ]
+
+    def publish(self, kind: str, shard: int | None = None, **fields) -> int:
+        """Send to ``shard``, or to every other running shard; returns how many got it."""
+        if self._sender is None:
+            return 0
+        data    = json.dumps({"kind": kind, "from": self.shard_id, **fields}).encode("utf-8")
+        targets = [self._path(shard)] if shard is not None else self.peers()
+        sent    = 0
+        for path in targets:
+            try:
+                self._sender.sendto(data, path)
+                sent += 1
+            except (FileNotFoundError, ConnectionRefusedError):
+                pass  # that shard is not running
+            except BlockingIOError:
+                print(f"⚠️ Shard bus: {os.path.basename(path)} is not reading, dropped {kind!r}")
+        return sent
+
+    def _deliver(self, data: bytes) -> None:
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        handler = self._handlers.get(message.get("kind"))
+        if handler is None:
+            return
+        task = asyncio.create_task(self._handle(handler, message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, handler, message: dict) -> None:
+        try:
+            await handler(message)
+        except Exception as e:
+            print(f"⚠️ Shard bus handler for {message.get('kind')!r} failed: {e}")
+
+    async def close(self) -> None:
+        if self._transport is None:
+            return
+        self._transport.close()
+        self._transport = None
+        self._sender.close()
+        self._sender = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+# ── Launcher ──────────────────────────────────────────────────────
+def launch(script: str, count: int, stagger: float) -> int:
+    """Run ``count`` copies of ``script``, one per shard, until one of them exits.
+
+    The others are then stopped too, so the platform restarts the whole
+    set and every shard comes back with the same shard count.
+    """
+    children = []
+
+    def stop(signum=signal.SIGTERM, frame=None):
+        for child in children:
+            if child.poll() is None:
+                child.send_signal(signum)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for shard_id in range(count):
+        if shard_id:
+            # Discord accepts one IDENTIFY per 5 seconds unless the bot has a higher max_concurrency.
+            time.sleep(stagger)
+        env = {**os.environ, "SHARD_ID": str(shard_id), "SHARD_COUNT": str(count)}
+        children.append(subprocess.Popen([sys.executable, script], env=env))
+        print(f"🧩 Shard {shard_id}/{count} started (pid {children[-1].pid})")
+
+    while all(child.poll() is None for child in children):
+        time.sleep(1.0)
+    exited = next(child for child in children if child.poll() is not None)
+    print(f"⚠️ Shard {children.index(exited)} exited with {exited.returncode}; stopping the others")
+    stop()
+    for child in children:
+        try:
+            child.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            child.kill()
+    return exited.returncode or 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run one bot process per shard")
+    parser.add_argument("script", help="the bot entry point, e.g. bot.py")
+    parser.add_argument("--count", type=int, default=int(os.environ.get("SHARD_COUNT", "1")), help="number of shards (default: SHARD_COUNT or 1)")
+    parser.add_argument("--stagger", type=float, default=5.0, help="seconds between shard starts")
+    args = parser.parse_args(argv)
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    if args.count == 1:
+        # One shard: run the bot in this process, exactly as before.
+        os.execv(sys.executable, [sys.executable, args.script])
+    return launch(args.script, args.count, args.stagger)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,709 @@
+import asyncio
+import copy
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from catalog import TaskCatalog
+from leaderboard import RankIndex
+from ledger import apply_entry, make_entry, replay
+from models import MemberPeriodStats, Submission, Task, encode_points
+from shards import PartitionLock, PartitionLocked
+from stats import PeriodColumns
+from storage import Storage, import_legacy, open_storage
+
+
+def reset_key(period: str) -> str:
+    return f"last_reset:{period}"
+
+
+def _row(record: Task | Submission | None) -> dict | None:
+    return record.to_dict() if record is not None else None
+
+
+# ── Resident State ────────────────────────────────────────────────
+class StateCache:
+    """In-memory copy of tasks, points and submissions.
+
+    Handlers read the ``Task``, ``Submission`` and ``MemberPeriodStats``
+    records directly, change tasks and submissions through the ``put_*``
+    helpers and change points only by recording ledger entries. A
+    background task writes the dirty rows and new entries through
+    ``storage.write_batch`` on a worker thread, so the event loop never
+    does disk I/O.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        flush_interval: float = 2.0,
+        snapshot_every: int = 500,
+        page_size: int = 20,
+        executor: ThreadPoolExecutor | None = None,
+        archive_retention: int = 12,
+    ):
+        self.storage           = storage
+        self.flush_interval    = flush_interval
+        self.snapshot_every    = snapshot_every
+        self.page_size         = page_size
+        self.archive_retention = archive_retention
+        self.tasks          = {key: Task.from_dict(key, data) for key, data in storage.load_tasks().items()}
+        self.catalog        = TaskCatalog(self.tasks)
+        self.points, seq    = storage.load_snapshot()
+        self.submissions    = {
+            submission_id: Submission.from_dict(data, self.tasks)
+            for submission_id, data in storage.pending_submissions().items()
+        }
+        self.messages       = storage.load_messages()
+        self.meta           = {}
+        for period in Storage.PERIODS:
+            value = storage.get_meta(reset_key(period))
+            if value is not None:
+                self.meta[reset_key(period)] = value
+        tail                = storage.load_ledger(after_seq=seq)
+        self.ledger_seq     = max(seq, replay(self.points, tail))
+        self.ranks          = {
+            period: RankIndex.from_totals(
+                ((member_id, data.total_points) for member_id, data in self.points[period].items()), page_size,
+            )
+            for period in Storage.PERIODS
+        }
+        self.archived       = {}  # period -> (epoch, RankIndex) of the epoch closed last
+        self.history        = {}  # (period, epoch) -> PeriodColumns, archives read or closed so far
+        self._since_snapshot    = len(tail)
+        self._dirty_tasks       = set()
+        self._dirty_submissions = set()
+        self._dirty_messages    = set()
+        self._dirty_meta        = set()
+        self._ledger            = []
+        self._resolved          = []
+        self._archives          = {}
+        self._prune             = {}
+        self._snapshot_due      = False
+        self._archive_due       = True  # resolved rows an earlier run left in the hot store
+        self._recently_resolved = OrderedDict()  # submission_id -> status, for double clicks
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-flush")
+        self._wakeup   = None
+        self._flusher  = None
+
+    # tasks
+    def put_task(self, task: Task) -> None:
+        # A new object, so pending submissions keep the version they were claimed against.
+        self.tasks[task.key] = task
+        self.catalog.put(task.key, task)
+        self._mark(self._dirty_tasks, task.key)
+
+    def delete_task(self, task_key: str) -> None:
+        if self.tasks.pop(task_key, None) is not None:
+            self.catalog.delete(task_key)
+            self._mark(self._dirty_tasks, task_key)
+
+    # points
+    def get_member(self, period: str, member_id: int) -> MemberPeriodStats | None:
+        return self.points[period].get(member_id)
+
+    def total_points(self, period: str, member_id: int) -> int:
+        data = self.points[period].get(member_id)
+        return data.total_points if data else 0
+
+    def completions(self, period: str, member_id: int, task_key: str) -> int:
+        data = self.points[period].get(member_id)
+        return data.completions.get(task_key, 0) if data else 0
+
+    def record(self, kind: str, **fields) -> dict:
+        """Append a ledger entry and fold it into the live totals."""
+        self.ledger_seq += 1
+        entry = make_entry(self.ledger_seq, kind, **fields)
+        apply_entry(self.points, entry)
+        if kind == "reset":
+            self.ranks[entry["period"]] = RankIndex(self.page_size)
+        elif entry["points"]:
+            for period, index in self.ranks.items():
+                index.update(entry["member_id"], self.total_points(period, entry["member_id"]))
+        self._ledger.append(entry)
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.snapshot_every:
+            self._snapshot_due = True
+        self._mark_dirty()
+        return entry
+
+    def reset_period(self, period: str, deadline: float | None = None, epoch: str | None = None) -> dict:
+        """Close the current epoch of ``period`` and start an empty one.
+
+        The closed bucket and its rank index are kept as they are instead
+        of being zeroed member by member, so a reset costs the same for
+        any number of members. With an ``epoch`` label they are archived.
+        """
+        closed, index = self.points[period], self.ranks[period]
+        entry = self.record("reset", period=period)
+        if epoch is not None:
+            columns = PeriodColumns.from_bucket(closed)  # closed is no longer reachable from self.points
+            self.archived[period]           = (epoch, index)
+            self._archives[(period, epoch)] = columns
+            self.history[(period, epoch)]   = columns
+            self._prune[period]             = self.archive_retention
+        if deadline is not None:
+            self.mark_reset(period, deadline)
+        # Everything before a reset is settled; compact on the next flush.
+        self._snapshot_due = True
+        return entry
+
+    async def archive(self, period: str, epoch: str) -> RankIndex | None:
+        """Rank index of a closed epoch, read from storage unless it closed last."""
+        archived = self.archived.get(period)
+        if archived and archived[0] == epoch:
+            return archived[1]
+        columns = self.history.get((period, epoch))
+        if columns is None:
+            loop    = asyncio.get_running_loop()
+            columns = await loop.run_in_executor(self._executor, self.storage.load_archive_columns, period, epoch)
+        return RankIndex.from_totals(zip(columns.members, columns.points), self.page_size) if columns is not None else None
+
+    async def period_history(self, period: str, count: int) -> list[tuple[str, PeriodColumns]]:
+        """The last ``count`` closed epochs of ``period``, oldest first, for stats queries.
+
+        Archives never change once written, so each is read from storage
+        only once; the ones pruned since are dropped from memory as well.
+        """
+        loop   = asyncio.get_running_loop()
+        stored = await loop.run_in_executor(self._executor, self.storage.archive_epochs, period)
+        known  = set(stored) | {epoch for (p, epoch) in self._archives if p == period}
+        for key in [key for key in self.history if key[0] == period and key[1] not in known]:
+            del self.history[key]
+        epochs  = sorted(known)[-count:] if count > 0 else []
+        missing = [epoch for epoch in epochs if (period, epoch) not in self.history]
+        if missing:
+            loaded = await loop.run_in_executor(
+                self._executor,
+                lambda: [(epoch, self.storage.load_archive_columns(period, epoch)) for epoch in missing],
+            )
+            for epoch, columns in loaded:
+                if columns is not None:
+                    self.history[(period, epoch)] = columns
+        return [(epoch, self.history[(period, epoch)]) for epoch in epochs if (period, epoch) in self.history]
+
+    def last_reset(self, period: str) -> float | None:
+        """Deadline (epoch seconds) of the last reset of ``period`` that ran."""
+        value = self.meta.get(reset_key(period))
+        return float(value) if value is not None else None
+
+    def mark_reset(self, period: str, deadline: float) -> None:
+        self.put_meta(reset_key(period), repr(deadline))
+
+    def put_meta(self, key: str, value: str) -> None:
+        if self.meta.get(key) != value:
+            self.meta[key] = value
+            self._mark(self._dirty_meta, key)
+
+    def request_snapshot(self) -> None:
+        self._snapshot_due = True
+        self._mark_dirty()
+
+    # submissions — only pending ones stay resident
+    RECENTLY_RESOLVED = 1024
+
+    def put_submission(self, submission_id: str, submission: Submission) -> None:
+        self.submissions[submission_id] = submission
+        self._mark(self._dirty_submissions, submission_id)
+
+    def pending_submissions(self) -> dict:
+        return self.submissions
+
+    def submission_for_approval(self, message_id: int) -> str | None:
+        """Pending submission posted as ``message_id``; a scan, only for buttons without an id."""
+        for submission_id, submission in self.submissions.items():
+            if submission.approval_message_id == message_id:
+                return submission_id
+        return None
+
+    def _resolve_submission(self, submission_id: str, submission: Submission) -> None:
+        # Leaves the hot store; the next flush appends it to the monthly archive.
+        del self.submissions[submission_id]
+        self._resolved.append({"submission_id": submission_id, **submission.to_dict()})
+        self._remember_resolved(submission_id, submission.status)
+        self._mark(self._dirty_submissions, submission_id)
+
+    def _remember_resolved(self, submission_id: str, status: str) -> None:
+        self._recently_resolved[submission_id] = status
+        if len(self._recently_resolved) > self.RECENTLY_RESOLVED:
+            self._recently_resolved.popitem(last=False)
+
+    async def resolved_status(self, submission_id: str) -> str | None:
+        """Status of a submission that is no longer pending, looked up in the archive if need be."""
+        status = self._recently_resolved.get(submission_id)
+        if status is not None:
+            return status
+        if self._archive_due:
+            # Rows an earlier run resolved may still sit in the hot store.
+            await self.flush()
+        loop   = asyncio.get_running_loop()
+        record = await loop.run_in_executor(self._executor, self.storage.archived_submission, submission_id)
+        if record is None:
+            return None
+        self._remember_resolved(submission_id, record["status"])
+        return record["status"]
+
+    # message registry
+    def get_message(self, guild_id: int, kind: str) -> dict | None:
+        return self.messages.get((guild_id, kind))
+
+    def put_message(self, guild_id: int, kind: str, channel_id: int, message_id: int) -> None:
+        entry = {"channel_id": channel_id, "message_id": message_id}
+        if self.messages.get((guild_id, kind)) != entry:
+            self.messages[(guild_id, kind)] = entry
+            self._mark(self._dirty_messages, (guild_id, kind))
+
+    def forget_message(self, guild_id: int, kind: str) -> None:
+        if self.messages.pop((guild_id, kind), None) is not None:
+            self._mark(self._dirty_messages, (guild_id, kind))
+
+    # operations — run through MutationPipeline so check and write never interleave
+    def claim(
+        self, member_id: int, task_key: str, task: Task, amount: int, submission_id: str | None = None,
+    ) -> tuple[int | None, int, int]:
+        """Reserve ``amount`` completions if the weekly quota allows it.
+
+        With a ``submission_id`` the pending submission is stored in the
+        same operation, so a recorded claim always has one to review; its
+        message ids follow through ``attach_messages``.
+
+        Returns ``(remaining, weekly_total, monthly_total)``; ``remaining``
+        is ``None`` when the claim was recorded, otherwise how many
+        completions are still allowed.
+        """
+        if task.max_completions != 0:
+            remaining = task.max_completions - self.completions("weekly", member_id, task_key)
+            if remaining <= 0 or amount > remaining:
+                return max(0, remaining), 0, 0
+        self.record("claim", member_id=member_id, task_key=task_key, amount=amount)
+        if submission_id is not None:
+            self.put_submission(submission_id, Submission(member_id, task, amount, task.points * amount))
+        return None, self.total_points("weekly", member_id), self.total_points("monthly", member_id)
+
+    def attach_messages(self, submission_id: str, claim_message_id: int | None, approval_message_id: int | None) -> bool:
+        """Remember where a pending submission was posted; ``False`` if it is no longer pending."""
+        sub = self.submissions.get(submission_id)
+        if sub is None:
+            return False
+        sub.claim_message_id    = claim_message_id
+        sub.approval_message_id = approval_message_id
+        self._mark(self._dirty_submissions, submission_id)
+        return True
+
+    def withdraw_claim(self, submission_id: str) -> bool:
+        """Undo a claim that could not be posted: release its completions and drop the submission."""
+        sub = self.submissions.pop(submission_id, None)
+        if sub is None:
+            return False
+        self.record("reject", member_id=sub.member_id, task_key=sub.task_key, amount=sub.amount)
+        self._mark(self._dirty_submissions, submission_id)
+        return True
+
+    def review_submission(
+        self, submission_id: str, status: str, reviewer_id: str, reviewer_name: str,
+    ) -> tuple[str, Submission | None, int, int]:
+        """Approve or reject a pending submission.
+
+        Returns ``(outcome, submission, weekly_total, monthly_total)`` where
+        ``outcome`` is ``"ok"``, ``"missing"`` or ``"reviewed"``.
+        """
+        sub = self.submissions.get(submission_id)
+        if sub is None:
+            if submission_id in self._recently_resolved:
+                return "reviewed", None, 0, 0
+            return "missing", None, 0, 0
+        self.record(
+            "award" if status == "approved" else "reject",
+            member_id = sub.member_id,
+            task_key  = sub.task_key,
+            amount    = sub.amount,
+            points    = sub.earned_points if status == "approved" else 0,
+            reviewer  = reviewer_id,
+        )
+        sub.status      = status
+        sub.reviewed_by = reviewer_name
+        sub.resolved_at = time.time()
+        self._resolve_submission(submission_id, sub)
+        member_id = sub.member_id
+        return "ok", sub.copy(), self.total_points("weekly", member_id), self.total_points("monthly", member_id)
+
+    def review_many(
+        self, decisions: list[tuple[str, str]], reviewer_id: str, reviewer_name: str,
+    ) -> list[tuple[str, str, Submission | None, int, int]]:
+        """Apply ``(submission_id, status)`` decisions in order as one operation.
+
+        Returns ``(submission_id, outcome, submission, weekly_total,
+        monthly_total)`` per decision, as ``review_submission`` would.
+        """
+        return [
+            (submission_id, *self.review_submission(submission_id, status, reviewer_id, reviewer_name))
+            for submission_id, status in decisions
+        ]
+
+    # write-behind
+    @property
+    def dirty(self) -> bool:
+        return bool(
+            self._dirty_tasks or self._dirty_submissions or self._dirty_messages or self._resolved
+            or self._dirty_meta or self._ledger or self._archives or self._prune
+            or self._snapshot_due or self._archive_due
+        )
+
+    def _mark(self, dirty: set, key) -> None:
+        dirty.add(key)
+        self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _take_batch(self) -> dict:
+        # Copy dirty rows on the loop thread; the worker never sees live records.
+        batch = {
+            "tasks":       {key: _row(self.tasks.get(key)) for key in self._dirty_tasks},
+            "resolved":    self._resolved,
+            "submissions": {key: _row(self.submissions.get(key)) for key in self._dirty_submissions},
+            "messages":    {key: copy.deepcopy(self.messages.get(key)) for key in self._dirty_messages},
+            "meta":        {key: self.meta[key] for key in self._dirty_meta},
+            "archives":    self._archives,
+            "ledger":      self._ledger,
+            "snapshot":    None,
+            "prune":       self._prune,
+        }
+        if self._snapshot_due:
+            # Compaction: persist the totals and let storage drop the covered entries.
+            batch["snapshot"]    = (encode_points(self.points, self.ledger_seq), self.ledger_seq)
+            self._since_snapshot = 0
+            self._snapshot_due   = False
+        self._dirty_tasks       = set()
+        self._dirty_submissions = set()
+        self._dirty_messages    = set()
+        self._dirty_meta        = set()
+        self._ledger            = []
+        self._resolved          = []
+        self._archives          = {}
+        self._prune             = {}
+        return batch
+
+    def start(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._wakeup  = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flush_loop())
+            if self.dirty:
+                self._wakeup.set()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # Let a burst of mutations accumulate into a single write.
+            await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"⚠️ State flush failed: {e}")
+                self._wakeup.set()
+
+    async def flush(self) -> None:
+        if not self.dirty:
+            return
+        batch   = self._take_batch()
+        archive = self._take_archive()
+        loop    = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self._write, batch, archive)
+        except Exception:
+            self._archive_due |= archive
+            self._restore(batch)
+            raise
+
+    def _take_archive(self) -> bool:
+        archive, self._archive_due = self._archive_due, False
+        return archive
+
+    def _write(self, batch: dict, archive: bool) -> None:
+        if archive:
+            self.storage.archive_resolved()
+        self.storage.write_batch(batch)
+
+    def _restore(self, batch: dict) -> None:
+        # A failed write leaves its rows dirty for the next attempt.
+        self._ledger            = batch["ledger"] + self._ledger
+        self._resolved          = batch["resolved"] + self._resolved
+        self._dirty_tasks       |= set(batch["tasks"])
+        self._dirty_submissions |= set(batch["submissions"])
+        self._dirty_messages    |= set(batch["messages"])
+        self._dirty_meta        |= set(batch["meta"])
+        self._archives          = {**batch["archives"], **self._archives}
+        self._prune             = {**batch["prune"], **self._prune}
+        if batch["snapshot"] is not None:
+            self._snapshot_due = True
+
+    def flush_sync(self) -> None:
+        if self.dirty:
+            self._write(self._take_batch(), self._take_archive())
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        if self._since_snapshot:
+            self._snapshot_due = True
+        await self.flush()
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+
+# ── Mutation Pipeline ─────────────────────────────────────────────
+class MutationPipeline:
+    """Single consumer that owns writes to points and submissions.
+
+    Operations are plain synchronous callables applied strictly in queue
+    order. Everything that arrives within ``window`` seconds of the first
+    queued operation is applied together and persisted as one commit
+    before the callers are resumed.
+    """
+
+    def __init__(self, state: StateCache, window: float = 0.05):
+        self.state  = state
+        self.window = window
+        self._queue  = None
+        self._worker = None
+
+    def start(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue  = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def submit(self, op, *args):
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, args, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            group    = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    group.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            results = []
+            for op, args, future in group:
+                try:
+                    results.append((future, op(*args), None))
+                except Exception as e:
+                    results.append((future, None, e))
+            try:
+                await self.state.flush()
+            except Exception as e:
+                # Rows stay dirty; the background flusher retries them.
+                print(f"⚠️ Mutation commit failed: {e}")
+            for future, result, error in results:
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    async def drain(self) -> None:
+        """Wait until everything queued so far has been applied and committed."""
+        if self._worker is not None:
+            await self.submit(lambda: None)
+
+    async def close(self) -> None:
+        """Stop the worker; callers still waiting on queued operations get a cancellation."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            future.cancel()
+
+
+# ── Guild Partitions ──────────────────────────────────────────────
+class GuildStates:
+    """One store, cache and mutation pipeline per guild.
+
+    Each guild keeps its data in ``directory/<guild_id>``, so loading,
+    resetting or repairing one guild never reads another's rows. Caches
+    share a single flush thread; ``load`` reads a guild off the event
+    loop and ``get`` falls back to reading it in place.
+
+    With ``locking`` a guild is only opened while this process holds its
+    ``PartitionLock``, so shard processes sharing ``directory`` never
+    write the same guild; ``release`` hands one over to another process.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        directory: str,
+        durability: str = "normal",
+        flush_interval: float = 2.0,
+        snapshot_every: int = 500,
+        page_size: int = 20,
+        window: float = 0.05,
+        archive_retention: int = 12,
+        instrument=None,
+        locking: bool = True,
+    ):
+        self.backend           = backend
+        self.directory         = directory
+        self.durability        = durability
+        self.flush_interval    = flush_interval
+        self.snapshot_every    = snapshot_every
+        self.page_size         = page_size
+        self.window            = window
+        self.archive_retention = archive_retention
+        self.instrument        = instrument  # store -> store, e.g. to time its calls
+        self.locking           = locking
+        self._states   = {}
+        self._stores   = {}
+        self._locks    = {}
+        self._released = set()  # handed over; not reopened until acquired again
+        self._closed   = False
+        self._started  = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-flush")
+
+    def __iter__(self):
+        return iter(self._states.items())
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._states
+
+    def _path(self, guild_id: int) -> str:
+        return os.path.join(self.directory, str(guild_id))
+
+    def _lock(self, guild_id: int) -> PartitionLock:
+        lock = self._locks.get(guild_id)
+        if lock is None:
+            lock = self._locks[guild_id] = PartitionLock(self._path(guild_id))
+        return lock
+
+    def try_lock(self, guild_id: int) -> bool:
+        """Take ``guild_id``'s partition if no other process holds it."""
+        if not self.locking:
+            return True
+        if self._lock(guild_id).try_acquire():
+            self._released.discard(guild_id)
+            return True
+        return False
+
+    def holds(self, guild_id: int) -> bool:
+        """Whether this process holds ``guild_id``'s partition."""
+        return not self.locking or (guild_id in self._locks and self._locks[guild_id].held)
+
+    async def acquire(self, guild_id: int, timeout: float) -> None:
+        """Wait up to ``timeout`` seconds for another process to release ``guild_id``."""
+        if self.locking:
+            await self._lock(guild_id).acquire(timeout)
+            self._released.discard(guild_id)
+
+    async def release(self, guild_id: int) -> bool:
+        """Commit and close ``guild_id`` and unlock it; ``False`` if it was not open here."""
+        state = self._states.pop(guild_id, None)
+        if state is not None:
+            await state.mutations.drain()
+            await state.mutations.close()
+            await state.close()
+        store = self._stores.pop(guild_id, None)
+        if store is not None:
+            store.close()
+        lock = self._locks.pop(guild_id, None)
+        if lock is not None:
+            lock.release()
+        self._released.add(guild_id)
+        return state is not None or store is not None
+
+    def _store(self, guild_id: int) -> Storage:
+        store = self._stores.get(guild_id)
+        if store is None:
+            if guild_id in self._released:
+                raise PartitionLocked(f"Guild {guild_id} was handed over to another process")
+            if not self.try_lock(guild_id):
+                lock = self._lock(guild_id)
+                raise PartitionLocked(f"Guild {guild_id} is held by pid {lock.holder()}")
+            path  = self._path(guild_id)
+            store = open_storage(self.backend, path, self.durability)
+            if self.instrument is not None:
+                store = self.instrument(store)
+            self._stores[guild_id] = store
+        return store
+
+    def import_legacy(self, guild_id: int, source: Storage) -> dict:
+        """Seed ``guild_id`` from the old bot-wide store before it is loaded."""
+        if guild_id in self._states:
+            raise RuntimeError(f"Guild {guild_id} is already loaded")
+        return import_legacy(self._store(guild_id), source, guild_id)
+
+    def get(self, guild_id: int) -> StateCache:
+        """The guild's cache, read synchronously if nothing has loaded it yet."""
+        state = self._states.get(guild_id)
+        if state is None:
+            state = self._install(guild_id, self._build(self._store(guild_id)))
+        return state
+
+    async def load(self, guild_id: int) -> StateCache:
+        """Like ``get``, but a cold guild is read on a worker thread instead of the event loop."""
+        state = self._states.get(guild_id)
+        if state is None:
+            store = self._store(guild_id)
+            built = await asyncio.get_running_loop().run_in_executor(None, self._build, store)
+            state = self._install(guild_id, built)
+        return state
+
+    def _build(self, store: Storage) -> StateCache:
+        return StateCache(
+            store,
+            flush_interval    = self.flush_interval,
+            snapshot_every    = self.snapshot_every,
+            page_size         = self.page_size,
+            executor          = self._executor,
+            archive_retention = self.archive_retention,
+        )
+
+    def _install(self, guild_id: int, state: StateCache) -> StateCache:
+        # A synchronous get may have loaded the guild while a load was reading it.
+        current = self._states.get(guild_id)
+        if current is not None:
+            return current
+        state.mutations = MutationPipeline(state, window=self.window)
+        self._states[guild_id] = state
+        if self._started:
+            state.start()
+        return state
+
+    def start(self) -> None:
+        self._started = True
+        for state in self._states.values():
+            state.start()
+            state.mutations.start()
+
+    def flush_sync(self) -> None:
+        """Last-resort flush when ``close`` never ran; a no-op after it."""
+        if self._closed:
+            return
+        for state in self._states.values():
+            state.flush_sync()
+
+    async def close(self) -> None:
+        self._closed = True
+        for guild_id, state in self._states.items():
+            try:
+                await state.mutations.drain()
+                await state.mutations.close()
+                await state.close()
+            except Exception as e:
+                print(f"⚠️ Final flush failed for guild {guild_id}: {e}")
+        self._executor.shutdown(wait=True)
+        for store in self._stores.values():
+            store.close()
+        for lock in self._locks.values():
+            lock.release()
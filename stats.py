@@ -0,0 +1,166 @@
+import base64
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+from models import MemberPeriodStats
+
+
+# ── Columnar Periods ──────────────────────────────────────────────
+COLUMNS_FORMAT = "columns/1"
+
+
+def _pack(values: array) -> str:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _unpack(typecode: str, data: str) -> array:
+    values = array(typecode)
+    values.frombytes(base64.b64decode(data))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+class PeriodColumns:
+    """Final totals of one closed period epoch, stored column-wise.
+
+    Member and task ids are dictionary-encoded once; points are one
+    integer per member and completions a sparse list of
+    ``(member index, task index, count)`` cells held in three parallel
+    arrays, sorted by member. Aggregations walk the arrays instead of
+    nested dicts, and a member's cells are one slice of them.
+    """
+
+    __slots__ = (
+        "members", "tasks", "points", "cell_member", "cell_task", "cell_count",
+        "member_rows", "task_columns",
+    )
+
+    def __init__(self, members, tasks, points, cell_member, cell_task, cell_count):
+        self.members      = members      # [member_id as int]
+        self.tasks        = tasks        # [task_key]
+        self.points       = points       # array("q"), one per member
+        self.cell_member  = cell_member  # array("I"), ascending
+        self.cell_task    = cell_task    # array("I")
+        self.cell_count   = cell_count   # array("q")
+        self.member_rows  = {member_id: row for row, member_id in enumerate(members)}
+        self.task_columns = {task_key: column for column, task_key in enumerate(tasks)}
+
+    def member_cells(self, member_id: int) -> tuple[array, array]:
+        """``(task indexes, counts)`` of one member's cells; empty if it has none."""
+        row = self.member_rows.get(member_id)
+        if row is None:
+            return self.cell_task[:0], self.cell_count[:0]
+        start = bisect_left(self.cell_member, row)
+        end   = bisect_right(self.cell_member, row, start)
+        return self.cell_task[start:end], self.cell_count[start:end]
+
+    @classmethod
+    def from_bucket(cls, bucket: dict) -> "PeriodColumns":
+        members, tasks, task_index = [], [], {}
+        points      = array("q")
+        cell_member = array("I")
+        cell_task   = array("I")
+        cell_count  = array("q")
+        for member_id, data in bucket.items():
+            row = len(members)
+            members.append(member_id)
+            points.append(data.total_points)
+            for task_key, count in data.completion_items():
+                if not count:
+                    continue
+                column = task_index.get(task_key)
+                if column is None:
+                    column = task_index[task_key] = len(tasks)
+                    tasks.append(task_key)
+                cell_member.append(row)
+                cell_task.append(column)
+                cell_count.append(count)
+        return cls(members, tasks, points, cell_member, cell_task, cell_count)
+
+    def to_bucket(self) -> dict:
+        bucket = {member_id: MemberPeriodStats(points) for member_id, points in zip(self.members, self.points)}
+        for row, column, count in zip(self.cell_member, self.cell_task, self.cell_count):
+            bucket[self.members[row]].completions[self.tasks[column]] = count
+        return bucket
+
+    def to_dict(self) -> dict:
+        return {
+            "format":      COLUMNS_FORMAT,
+            "members":     self.members,
+            "tasks":       self.tasks,
+            "points":      _pack(self.points),
+            "cell_member": _pack(self.cell_member),
+            "cell_task":   _pack(self.cell_task),
+            "cell_count":  _pack(self.cell_count),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PeriodColumns":
+        if data.get("format") != COLUMNS_FORMAT:
+            raise ValueError(f"Unknown period archive format: {data.get('format')!r}")
+        return cls(
+            data["members"],
+            data["tasks"],
+            _unpack("q", data["points"]),
+            _unpack("I", data["cell_member"]),
+            _unpack("I", data["cell_task"]),
+            _unpack("q", data["cell_count"]),
+        )
+
+
+# ── Queries ───────────────────────────────────────────────────────
+# Each query takes ``history``: a list of ``(epoch, PeriodColumns)``,
+# oldest first, and touches only the arrays it aggregates.
+def top_members(history: list, limit: int = 10) -> list[tuple[int, int]]:
+    totals = {}
+    for _, columns in history:
+        for member_id, points in zip(columns.members, columns.points):
+            if points:
+                totals[member_id] = totals.get(member_id, 0) + points
+    return sorted(totals.items(), key=lambda item: -item[1])[:limit]
+
+
+def top_tasks(history: list, limit: int = 10, member_id: int | None = None) -> list[tuple[str, int]]:
+    totals = {}
+    for _, columns in history:
+        if member_id is None:
+            cell_task, cell_count = columns.cell_task, columns.cell_count
+        else:
+            cell_task, cell_count = columns.member_cells(member_id)
+        counts = [0] * len(columns.tasks)
+        for column, count in zip(cell_task, cell_count):
+            counts[column] += count
+        for task_key, count in zip(columns.tasks, counts):
+            if count:
+                totals[task_key] = totals.get(task_key, 0) + count
+    return sorted(totals.items(), key=lambda item: -item[1])[:limit]
+
+
+def task_contributors(history: list, task_key: str, limit: int = 10) -> list[tuple[int, int]]:
+    totals = {}
+    for _, columns in history:
+        target = columns.task_columns.get(task_key)
+        if target is None:
+            continue
+        for row, column, count in zip(columns.cell_member, columns.cell_task, columns.cell_count):
+            if column == target:
+                member_id = columns.members[row]
+                totals[member_id] = totals.get(member_id, 0) + count
+    return sorted(totals.items(), key=lambda item: -item[1])[:limit]
+
+
+def trend(history: list, member_id: int | None = None) -> list[tuple[str, int]]:
+    """Points per epoch: one member's, or everyone's combined."""
+    series = []
+    for epoch, columns in history:
+        if member_id is None:
+            series.append((epoch, sum(columns.points)))
+            continue
+        row = columns.member_rows.get(member_id)
+        series.append((epoch, columns.points[row] if row is not None else 0))
+    return series
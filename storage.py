@@ -0,0 +1,811 @@
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+
+from models import decode_points, encode_points, points_from_dicts
+from stats import PeriodColumns
+
+
+# ── Base ──────────────────────────────────────────────────────────
+class Storage(ABC):
+    """Persistence interface used by the bot.
+
+    Whole-collection loads populate the resident state at startup;
+    ``write_batch`` then persists only the rows that changed.
+    """
+
+    PERIODS = ("weekly", "monthly")
+
+    @abstractmethod
+    def load_tasks(self) -> dict: ...
+
+    # points: a binary snapshot of the totals plus the ledger entries after it
+    def load_snapshot(self) -> tuple[dict, int]:
+        """``({period: {member_id: MemberPeriodStats}}, seq)``."""
+        data = _read_bytes(self.snapshot_file)
+        if data is None:
+            return self.load_legacy_snapshot()
+        points, seq = decode_points(data)
+        return ensure_points_structure(points), seq
+
+    @abstractmethod
+    def load_legacy_snapshot(self) -> tuple[dict, int]:
+        """The totals when no binary snapshot has been written yet."""
+
+    def write_snapshot(self, data: bytes, seq: int) -> None:
+        """Replace the snapshot with ``encode_points`` output and drop ledger entries up to ``seq``.
+
+        The file is replaced before the ledger is trimmed; a crash in
+        between leaves entries the snapshot already covers, which loading
+        skips by the sequence stored in the file.
+        """
+        _write_bytes(self.snapshot_file, data, self.durability)
+        self.trim_ledger(seq)
+
+    @abstractmethod
+    def trim_ledger(self, seq: int) -> None: ...
+
+    @abstractmethod
+    def load_ledger(self, after_seq: int = 0) -> list: ...
+
+    # archives: the frozen totals of closed period epochs, stored column-wise
+    @abstractmethod
+    def load_archive_columns(self, period: str, epoch: str) -> PeriodColumns | None: ...
+
+    @abstractmethod
+    def archive_epochs(self, period: str) -> list[str]:
+        """Archived epoch labels of ``period``, oldest first."""
+
+    # submissions: the hot store holds open ones; resolved ones move to the archive
+    @abstractmethod
+    def load_submissions(self) -> dict: ...
+
+    @abstractmethod
+    def pending_submissions(self) -> dict: ...
+
+    def archive_submissions(self, records: list) -> None:
+        """Append resolved submissions to the monthly ``.jsonl.gz`` archives."""
+        append_submission_archive(self.submission_archive_dir, records, self.durability)
+
+    def archived_submission(self, submission_id: str) -> dict | None:
+        return find_archived_submission(self.submission_archive_dir, submission_id)
+
+    def archive_resolved(self) -> int:
+        """Move resolved submissions still in the hot store to the archive."""
+        resolved = {
+            submission_id: submission
+            for submission_id, submission in self.load_submissions().items()
+            if submission.get("status") != "pending"
+        }
+        if resolved:
+            self.write_batch({
+                "resolved":    [{"submission_id": key, **sub} for key, sub in resolved.items()],
+                "submissions": dict.fromkeys(resolved),
+            })
+        return len(resolved)
+
+    # message registry: (guild_id, kind) -> {"channel_id", "message_id"}
+    @abstractmethod
+    def load_messages(self) -> dict: ...
+
+    # meta
+    @abstractmethod
+    def get_meta(self, key: str) -> str | None: ...
+
+    @abstractmethod
+    def set_meta(self, key: str, value: str) -> None: ...
+
+    @abstractmethod
+    def write_batch(self, batch: dict) -> None:
+        """Persist a change set produced by ``StateCache``.
+
+        ``batch`` holds ``tasks``, ``submissions`` and ``messages`` keyed by
+        id (``None`` means deleted), ``resolved`` submissions to archive
+        before they leave the hot store, ``meta`` values by key, closed epochs
+        to ``archives`` by ``(period, epoch)``, new ``ledger`` entries to
+        append, an optional encoded ``(data, seq)`` ``snapshot`` written
+        after them and the number of archives to ``prune`` down to per
+        period.
+        """
+
+    def close(self) -> None:
+        pass
+
+
+# ── Durability ────────────────────────────────────────────────────
+# "off":    leave flushing to the OS
+# "normal": fsync each file before it replaces the old one
+# "full":   additionally fsync the directory so the rename itself survives a crash
+DURABILITY_MODES = ("off", "normal", "full")
+SQLITE_SYNCHRONOUS = {"off": "OFF", "normal": "NORMAL", "full": "FULL"}
+
+
+def check_durability(durability: str) -> str:
+    if durability not in DURABILITY_MODES:
+        raise ValueError(f"Unknown durability mode: {durability!r}")
+    return durability
+
+
+def ensure_points_structure(points: dict) -> dict:
+    for period in Storage.PERIODS:
+        if period not in points:
+            points[period] = {}
+    return points
+
+
+SNAPSHOT_SEQ_KEY = "_ledger_seq"
+
+
+def snapshot_file_for(path: str) -> str:
+    root, _ = os.path.splitext(path)
+    return f"{root}.snap"
+
+
+def ledger_file_for(points_file: str) -> str:
+    root, _ = os.path.splitext(points_file)
+    return f"{root}.ledger.jsonl"
+
+
+def archive_dir_for(points_file: str) -> str:
+    root, _ = os.path.splitext(points_file)
+    return f"{root}.archive"
+
+
+# ── Submission Archive ────────────────────────────────────────────
+# Resolved submissions are appended to <dir>/<YYYY-MM>.jsonl.gz, one gzip
+# member per write, which gzip readers stream back as a single file.
+DISCORD_EPOCH_MS = 1420070400000
+
+
+def submission_month(record: dict) -> str:
+    ts = record.get("resolved_at")
+    if ts is None:
+        # Older records: the id ends in the interaction's snowflake.
+        snowflake = int(str(record.get("submission_id", "")).rsplit("_", 1)[-1] or 0)
+        ts        = ((snowflake >> 22) + DISCORD_EPOCH_MS) / 1000 if snowflake else 0
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m")
+
+
+def append_submission_archive(directory: str, records: list, durability: str = "normal") -> None:
+    by_month = {}
+    for record in records:
+        by_month.setdefault(submission_month(record), []).append(record)
+    os.makedirs(directory, exist_ok=True)
+    for month, group in by_month.items():
+        lines = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in group)
+        with open(os.path.join(directory, f"{month}.jsonl.gz"), "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+                gz.write(lines.encode("utf-8"))
+            if durability != "off":
+                raw.flush()
+                os.fsync(raw.fileno())
+
+
+def iter_submission_archive(directory: str, month: str | None = None):
+    if not os.path.isdir(directory):
+        return
+    names = sorted(name for name in os.listdir(directory) if name.endswith(".jsonl.gz"))
+    if month is not None:
+        names = [name for name in names if name == f"{month}.jsonl.gz"]
+    for name in names:
+        with gzip.open(os.path.join(directory, name), "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def find_archived_submission(directory: str, submission_id: str) -> dict | None:
+    """The archived record of ``submission_id``, reading only months from its claim on."""
+    claimed = submission_month({"submission_id": submission_id})
+    if not os.path.isdir(directory):
+        return None
+    months = sorted(name[: -len(".jsonl.gz")] for name in os.listdir(directory) if name.endswith(".jsonl.gz"))
+    for month in months:
+        if month < claimed:
+            continue
+        for record in iter_submission_archive(directory, month):
+            if record.get("submission_id") == submission_id:
+                return record
+    return None
+
+
+def submission_archive_dir_for(path: str) -> str:
+    root, _ = os.path.splitext(path)
+    return f"{root}.submissions"
+
+
+# ── JSON Backend ──────────────────────────────────────────────────
+def _read_json(path: str, default):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return default
+
+
+def _sync_dir(directory: str) -> None:
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _write_json(path: str, data, durability: str = "normal") -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        if durability != "off":
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if durability == "full":
+        _sync_dir(directory)
+
+
+def _read_bytes(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_bytes(path: str, data: bytes, durability: str = "normal") -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        if durability != "off":
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if durability == "full":
+        _sync_dir(directory)
+
+
+def _read_jsonl(path: str) -> list:
+    entries = []
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+    return entries
+
+
+def _append_jsonl(path: str, entries: list, durability: str = "normal") -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        if durability != "off":
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class JsonStorage(Storage):
+    """The original one-file-per-collection layout."""
+
+    def __init__(
+        self,
+        tasks_file: str,
+        points_file: str,
+        submissions_file: str,
+        durability: str = "normal",
+        messages_file: str = "messages.json",
+        meta_file: str = "meta.json",
+    ):
+        self.tasks_file       = tasks_file
+        self.points_file      = points_file
+        self.snapshot_file    = snapshot_file_for(points_file)
+        self.ledger_file      = ledger_file_for(points_file)
+        self.archive_dir      = archive_dir_for(points_file)
+        self.submissions_file = submissions_file
+        self.submission_archive_dir = archive_dir_for(submissions_file)
+        self.messages_file    = messages_file
+        self.meta_file        = meta_file
+        self.durability       = check_durability(durability)
+
+    def get_meta(self, key: str) -> str | None:
+        return _read_json(self.meta_file, {}).get(key)
+
+    def set_meta(self, key: str, value: str) -> None:
+        meta = _read_json(self.meta_file, {})
+        meta[key] = value
+        _write_json(self.meta_file, meta, self.durability)
+
+    def load_tasks(self) -> dict:
+        return _read_json(self.tasks_file, {})
+
+    def save_tasks(self, tasks: dict) -> None:
+        _write_json(self.tasks_file, tasks, self.durability)
+
+    def load_legacy_snapshot(self) -> tuple[dict, int]:
+        # points.json: the totals as JSON with the snapshot sequence riding along.
+        points = _read_json(self.points_file, {})
+        seq    = points.pop(SNAPSHOT_SEQ_KEY, 0)
+        return ensure_points_structure(points_from_dicts(points)), seq
+
+    def write_snapshot(self, data: bytes, seq: int) -> None:
+        super().write_snapshot(data, seq)
+        if os.path.exists(self.points_file):
+            os.remove(self.points_file)  # superseded by the binary snapshot
+
+    def trim_ledger(self, seq: int) -> None:
+        tail = [entry for entry in _read_jsonl(self.ledger_file) if entry["seq"] > seq]
+        tmp_path = f"{self.ledger_file}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        _append_jsonl(tmp_path, tail, self.durability)
+        os.replace(tmp_path, self.ledger_file)
+
+    def load_ledger(self, after_seq: int = 0) -> list:
+        return [entry for entry in _read_jsonl(self.ledger_file) if entry["seq"] > after_seq]
+
+    def append_ledger(self, entries: list) -> None:
+        _append_jsonl(self.ledger_file, entries, self.durability)
+
+    def _archive_file(self, period: str, epoch: str) -> str:
+        return os.path.join(self.archive_dir, f"{period}-{epoch}.json")
+
+    def load_archive_columns(self, period: str, epoch: str) -> PeriodColumns | None:
+        data = _read_json(self._archive_file(period, epoch), None)
+        return PeriodColumns.from_dict(data) if data is not None else None
+
+    def archive_epochs(self, period: str) -> list[str]:
+        if not os.path.isdir(self.archive_dir):
+            return []
+        prefix = f"{period}-"
+        return sorted(
+            name[len(prefix) : -len(".json")]
+            for name in os.listdir(self.archive_dir)
+            if name.startswith(prefix) and name.endswith(".json")
+        )
+
+    def put_archive(self, period: str, epoch: str, columns: PeriodColumns) -> None:
+        _write_json(self._archive_file(period, epoch), columns.to_dict(), self.durability)
+
+    def prune_archives(self, period: str, keep: int) -> None:
+        epochs = self.archive_epochs(period)
+        for epoch in epochs[: max(0, len(epochs) - keep)]:
+            os.remove(self._archive_file(period, epoch))
+
+    def load_submissions(self) -> dict:
+        return _read_json(self.submissions_file, {})
+
+    def save_submissions(self, submissions: dict) -> None:
+        _write_json(self.submissions_file, submissions, self.durability)
+
+    def pending_submissions(self) -> dict:
+        return {
+            sub_id: sub
+            for sub_id, sub in self.load_submissions().items()
+            if sub.get("status") == "pending"
+        }
+
+    def load_messages(self) -> dict:
+        # Stored as {guild_id: {kind: entry}} because JSON keys must be strings.
+        return {
+            (int(guild_id), kind): entry
+            for guild_id, kinds in _read_json(self.messages_file, {}).items()
+            for kind, entry in kinds.items()
+        }
+
+    def _save_messages(self, changes: dict) -> None:
+        messages = self.load_messages()
+        for key, entry in changes.items():
+            if entry is None:
+                messages.pop(key, None)
+            else:
+                messages[key] = entry
+        nested = {}
+        for (guild_id, kind), entry in messages.items():
+            nested.setdefault(str(guild_id), {})[kind] = entry
+        _write_json(self.messages_file, nested, self.durability)
+
+    def write_batch(self, batch: dict) -> None:
+        # One atomic rewrite per touched file; points only ever append.
+        if batch.get("tasks"):
+            tasks = self.load_tasks()
+            for task_key, task in batch["tasks"].items():
+                if task is None:
+                    tasks.pop(task_key, None)
+                else:
+                    tasks[task_key] = task
+            self.save_tasks(tasks)
+        if batch.get("resolved"):
+            self.archive_submissions(batch["resolved"])
+        if batch.get("submissions"):
+            submissions = self.load_submissions()
+            for submission_id, submission in batch["submissions"].items():
+                if submission is None:
+                    submissions.pop(submission_id, None)
+                else:
+                    submissions[submission_id] = submission
+            self.save_submissions(submissions)
+        if batch.get("messages"):
+            self._save_messages(batch["messages"])
+        if batch.get("meta"):
+            meta = _read_json(self.meta_file, {})
+            meta.update(batch["meta"])
+            _write_json(self.meta_file, meta, self.durability)
+        # An archive is written before the reset entry that refers to it.
+        for (period, epoch), columns in batch.get("archives", {}).items():
+            self.put_archive(period, epoch, columns)
+        if batch.get("ledger"):
+            self.append_ledger(batch["ledger"])
+        if batch.get("snapshot"):
+            self.write_snapshot(*batch["snapshot"])
+        for period, keep in batch.get("prune", {}).items():
+            self.prune_archives(period, keep)
+
+
+# ── SQLite Backend ────────────────────────────────────────────────
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    task_key        TEXT PRIMARY KEY,
+    name            TEXT NOT NULL,
+    points          INTEGER NOT NULL,
+    max_completions INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS submissions (
+    submission_id       TEXT PRIMARY KEY,
+    member_id           TEXT NOT NULL,
+    task_key            TEXT NOT NULL,
+    task                TEXT NOT NULL,
+    amount              INTEGER NOT NULL,
+    earned_points       INTEGER NOT NULL,
+    status              TEXT NOT NULL,
+    claim_message_id    TEXT,
+    reviewed_by         TEXT,
+    approval_message_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_status
+    ON submissions (status);
+CREATE TABLE IF NOT EXISTS ledger (
+    seq       INTEGER PRIMARY KEY,
+    kind      TEXT NOT NULL,
+    period    TEXT,
+    member_id TEXT,
+    task_key  TEXT,
+    amount    INTEGER NOT NULL DEFAULT 0,
+    points    INTEGER NOT NULL DEFAULT 0,
+    ts        REAL NOT NULL,
+    reviewer  TEXT
+);
+CREATE TABLE IF NOT EXISTS archives (
+    period TEXT NOT NULL,
+    epoch  TEXT NOT NULL,
+    data   TEXT NOT NULL,
+    PRIMARY KEY (period, epoch)
+);
+CREATE TABLE IF NOT EXISTS messages (
+    guild_id   INTEGER NOT NULL,
+    kind       TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, kind)
+);
+"""
+
+SUBMISSION_COLUMNS = (
+    "submission_id", "member_id", "task_key", "task", "amount",
+    "earned_points", "status", "claim_message_id", "reviewed_by", "approval_message_id",
+)
+LEDGER_COLUMNS = (
+    "seq", "kind", "period", "member_id", "task_key", "amount", "points", "ts", "reviewer",
+)
+
+
+class SqliteStorage(Storage):
+    """Indexed SQLite store in WAL mode; every write touches only its own rows."""
+
+    def __init__(self, path: str, durability: str = "normal"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path       = path
+        self.durability = check_durability(durability)
+        self.snapshot_file = snapshot_file_for(path)
+        self.submission_archive_dir = submission_archive_dir_for(path)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS[self.durability]}")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def _transaction(self):
+        return _Transaction(self)
+
+    # meta
+    def get_meta(self, key: str) -> str | None:
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self.lock:
+            self._set_meta(self.conn, key, value)
+
+    @staticmethod
+    def _set_meta(cur, key: str, value: str) -> None:
+        cur.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    # tasks
+    def load_tasks(self) -> dict:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT task_key, name, points, max_completions FROM tasks ORDER BY rowid"
+            ).fetchall()
+        return {
+            key: {"name": name, "points": points, "max_completions": max_completions}
+            for key, name, points, max_completions in rows
+        }
+
+    @staticmethod
+    def _put_task(cur, task_key: str, task: dict) -> None:
+        cur.execute(
+            "INSERT INTO tasks (task_key, name, points, max_completions) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(task_key) DO UPDATE SET name = excluded.name, "
+            "points = excluded.points, max_completions = excluded.max_completions",
+            (task_key, task["name"], task["points"], task["max_completions"]),
+        )
+
+    # points
+    def load_legacy_snapshot(self) -> tuple[dict, int]:
+        # Before the first snapshot the ledger holds every change.
+        return ensure_points_structure({}), int(self.get_meta(SNAPSHOT_SEQ_KEY) or 0)
+
+    def trim_ledger(self, seq: int) -> None:
+        with self._transaction() as cur:
+            cur.execute("DELETE FROM ledger WHERE seq <= ?", (seq,))
+            self._set_meta(cur, SNAPSHOT_SEQ_KEY, str(seq))
+
+    def load_ledger(self, after_seq: int = 0) -> list:
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {', '.join(LEDGER_COLUMNS)} FROM ledger WHERE seq > ? ORDER BY seq",
+                (after_seq,),
+            ).fetchall()
+        return [dict(zip(LEDGER_COLUMNS, row)) for row in rows]
+
+    # archives
+    def load_archive_columns(self, period: str, epoch: str) -> PeriodColumns | None:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data FROM archives WHERE period = ? AND epoch = ?", (period, epoch),
+            ).fetchone()
+        return PeriodColumns.from_dict(json.loads(row[0])) if row else None
+
+    def archive_epochs(self, period: str) -> list[str]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT epoch FROM archives WHERE period = ? ORDER BY epoch", (period,),
+            ).fetchall()
+        return [epoch for (epoch,) in rows]
+
+    @staticmethod
+    def _put_archive(cur, period: str, epoch: str, columns: PeriodColumns) -> None:
+        cur.execute(
+            "INSERT INTO archives (period, epoch, data) VALUES (?, ?, ?) "
+            "ON CONFLICT(period, epoch) DO UPDATE SET data = excluded.data",
+            (period, epoch, json.dumps(columns.to_dict(), ensure_ascii=False, separators=(",", ":"))),
+        )
+
+    @staticmethod
+    def _prune_archives(cur, period: str, keep: int) -> None:
+        cur.execute(
+            "DELETE FROM archives WHERE period = ? AND epoch NOT IN "
+            "(SELECT epoch FROM archives WHERE period = ? ORDER BY epoch DESC LIMIT ?)",
+            (period, period, keep),
+        )
+
+    @staticmethod
+    def _append_ledger(cur, entries: list) -> None:
+        cur.executemany(
+            f"INSERT INTO ledger ({', '.join(LEDGER_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(LEDGER_COLUMNS))})",
+            [tuple(entry.get(column) for column in LEDGER_COLUMNS) for entry in entries],
+        )
+
+    # submissions
+    def load_submissions(self) -> dict:
+        return self._select_submissions("", ())
+
+    def pending_submissions(self) -> dict:
+        return self._select_submissions("WHERE status = ?", ("pending",))
+
+    def _select_submissions(self, where: str, params: tuple) -> dict:
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {', '.join(SUBMISSION_COLUMNS)} FROM submissions {where} ORDER BY rowid",
+                params,
+            ).fetchall()
+        submissions = {}
+        for row in rows:
+            record = dict(zip(SUBMISSION_COLUMNS, row))
+            submission_id  = record.pop("submission_id")
+            record["task"] = json.loads(record["task"])
+            if record["reviewed_by"] is None:
+                del record["reviewed_by"]
+            submissions[submission_id] = record
+        return submissions
+
+    @staticmethod
+    def _put_submission(cur, submission_id: str, submission: dict) -> None:
+        cur.execute(
+            f"INSERT OR REPLACE INTO submissions ({', '.join(SUBMISSION_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(SUBMISSION_COLUMNS))})",
+            (
+                submission_id,
+                submission["member_id"],
+                submission["task_key"],
+                json.dumps(submission["task"], ensure_ascii=False),
+                submission["amount"],
+                submission["earned_points"],
+                submission["status"],
+                submission.get("claim_message_id"),
+                submission.get("reviewed_by"),
+                submission.get("approval_message_id"),
+            ),
+        )
+
+    def load_messages(self) -> dict:
+        with self.lock:
+            rows = self.conn.execute("SELECT guild_id, kind, channel_id, message_id FROM messages").fetchall()
+        return {
+            (guild_id, kind): {"channel_id": channel_id, "message_id": message_id}
+            for guild_id, kind, channel_id, message_id in rows
+        }
+
+    @staticmethod
+    def _put_message(cur, guild_id: int, kind: str, entry: dict | None) -> None:
+        if entry is None:
+            cur.execute("DELETE FROM messages WHERE guild_id = ? AND kind = ?", (guild_id, kind))
+            return
+        cur.execute(
+            "INSERT OR REPLACE INTO messages (guild_id, kind, channel_id, message_id) VALUES (?, ?, ?, ?)",
+            (guild_id, kind, entry["channel_id"], entry["message_id"]),
+        )
+
+    def write_batch(self, batch: dict) -> None:
+        # Archive first: a crash in between can only leave a duplicate, never a loss.
+        if batch.get("resolved"):
+            self.archive_submissions(batch["resolved"])
+        with self._transaction() as cur:
+            for task_key, task in batch.get("tasks", {}).items():
+                if task is None:
+                    cur.execute("DELETE FROM tasks WHERE task_key = ?", (task_key,))
+                else:
+                    self._put_task(cur, task_key, task)
+            for submission_id, submission in batch.get("submissions", {}).items():
+                if submission is None:
+                    cur.execute("DELETE FROM submissions WHERE submission_id = ?", (submission_id,))
+                else:
+                    self._put_submission(cur, submission_id, submission)
+            for (guild_id, kind), entry in batch.get("messages", {}).items():
+                self._put_message(cur, guild_id, kind, entry)
+            for key, value in batch.get("meta", {}).items():
+                self._set_meta(cur, key, value)
+            for (period, epoch), columns in batch.get("archives", {}).items():
+                self._put_archive(cur, period, epoch, columns)
+            if batch.get("ledger"):
+                self._append_ledger(cur, batch["ledger"])
+            for period, keep in batch.get("prune", {}).items():
+                self._prune_archives(cur, period, keep)
+        # The snapshot covers the entries just committed, so it follows the transaction.
+        if batch.get("snapshot"):
+            self.write_snapshot(*batch["snapshot"])
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+class _Transaction:
+    def __init__(self, storage: SqliteStorage):
+        self.storage = storage
+
+    def __enter__(self):
+        self.storage.lock.acquire()
+        self.cur = self.storage.conn.cursor()
+        self.cur.execute("BEGIN IMMEDIATE")
+        return self.cur
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.cur.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.storage.lock.release()
+        return False
+
+
+# ── Opening Stores ────────────────────────────────────────────────
+def open_storage(backend: str, directory: str, durability: str = "normal") -> Storage:
+    """Open the store kept in ``directory`` (one directory per guild)."""
+    os.makedirs(directory, exist_ok=True)
+    if backend == "json":
+        return JsonStorage(
+            os.path.join(directory, "tasks.json"),
+            os.path.join(directory, "points.json"),
+            os.path.join(directory, "submissions.json"),
+            durability,
+            messages_file = os.path.join(directory, "messages.json"),
+            meta_file     = os.path.join(directory, "meta.json"),
+        )
+    if backend == "sqlite":
+        return SqliteStorage(os.path.join(directory, "bot.db"), durability)
+    raise ValueError(f"Unknown storage backend: {backend!r}")
+
+
+def open_legacy_storage(directory: str, tasks_file: str, points_file: str, submissions_file: str) -> Storage | None:
+    """Open the pre-partitioning, bot-wide JSON files if any exist.
+
+    Those files never had a message registry or meta data; both are
+    looked up in ``directory`` so nothing is read from the working directory.
+    """
+    if not any(os.path.exists(path) for path in (tasks_file, points_file, submissions_file)):
+        return None
+    return JsonStorage(
+        tasks_file,
+        points_file,
+        submissions_file,
+        messages_file = os.path.join(directory, "messages.json"),
+        meta_file     = os.path.join(directory, "meta.json"),
+    )
+
+
+# ── Legacy Import ─────────────────────────────────────────────────
+IMPORT_MARKER = "legacy_import"
+
+
+def import_legacy(target: Storage, source: Storage, guild_id: int) -> dict:
+    """Copy the bot-wide legacy store into one guild's store, once.
+
+    The import is recorded in the target's meta data; later calls are
+    no-ops, so it is safe to run on every start.
+    """
+    if target.get_meta(IMPORT_MARKER):
+        return {}
+    tasks       = source.load_tasks()
+    points, seq = source.load_snapshot()
+    ledger      = source.load_ledger(after_seq=seq)
+    submissions = source.load_submissions()
+    messages    = {key: entry for key, entry in source.load_messages().items() if key[0] == guild_id}
+    target.write_batch({
+        "tasks":       tasks,
+        "submissions": submissions,
+        "messages":    messages,
+        "ledger":      ledger,
+        "snapshot":    (encode_points(points, seq), seq),
+    })
+    counts = {
+        "tasks":       len(tasks),
+        "members":     sum(len(bucket) for bucket in points.values()),
+        "ledger":      len(ledger),
+        "submissions": len(submissions),
+    }
+    target.set_meta(IMPORT_MARKER, json.dumps(counts))
+    return counts
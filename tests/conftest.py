@@ -0,0 +1,22 @@
+import logging
+import os
+import sys
+
+import pytest
+
+# The bot's modules live flat in the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench  # noqa: E402
+
+
+@pytest.fixture
+def load_bot(tmp_path, monkeypatch):
+    """Loads ``bot(2).py`` the way bench.py does, with its data under ``tmp_path``."""
+    for name in ("DATA_DIR", "STORAGE_BACKEND", "MUTATION_BATCH_WINDOW"):
+        monkeypatch.setenv(name, "")
+    yield lambda: bench.load_bot(str(tmp_path / "data"), "sqlite", 0.0)
+    # Every load adds its rate limit counter to the library's logger.
+    http = logging.getLogger("discord.http")
+    for handler in [handler for handler in http.handlers if type(handler).__name__ == "RateLimitCounter"]:
+        http.removeHandler(handler)
@@ -0,0 +1,25 @@
+from approvals import approval_custom_id, approval_target
+
+
+def no_legacy_lookup(message_id):
+    raise AssertionError("only legacy buttons are matched by message id")
+
+
+def test_custom_ids_carry_the_action_and_submission():
+    assert approval_custom_id("approve", "7_1234") == "approve:7_1234"
+    assert approval_target("approve:7_1234", 99, no_legacy_lookup) == ("7_1234", "approved")
+    assert approval_target("reject:7_1234", None, no_legacy_lookup) == ("7_1234", "rejected")
+    # Only the first colon separates the action.
+    assert approval_target("approve:a:b", 99, no_legacy_lookup) == ("a:b", "approved")
+
+
+def test_clicks_no_approval_button_matches_are_left_to_their_views():
+    for custom_id in ["", "approve", "approve:", "delete:7_1", "btn_submit_task", "del_wood"]:
+        assert approval_target(custom_id, 99, no_legacy_lookup) is None
+
+
+def test_legacy_buttons_are_matched_by_message():
+    posted = {99: "7_1"}
+    assert approval_target("btn_approve", 99, posted.get) == ("7_1", "approved")
+    assert approval_target("btn_reject", 98, posted.get) == (None, "rejected")
+    assert approval_target("btn_approve", None, posted.get) is None
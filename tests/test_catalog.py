@@ -0,0 +1,68 @@
+import statistics
+import time
+
+from catalog import TaskCatalog
+from models import Task
+
+
+def tasks_of(names: dict) -> dict:
+    return {key: Task(key, name, 10, 0) for key, name in names.items()}
+
+
+def catalog_of(*names: str) -> TaskCatalog:
+    return TaskCatalog(tasks_of({name.lower().replace(" ", "_"): name for name in names}))
+
+
+def keys(rows: list) -> list[str]:
+    return [task_key for task_key, _ in rows]
+
+
+def test_name_prefixes_rank_before_word_prefixes():
+    catalog = catalog_of("Wood Delivery", "Collect Wood", "Woodland Patrol", "Stone")
+    assert keys(catalog.search("wood")) == ["wood_delivery", "woodland_patrol", "collect_wood"]
+    assert keys(catalog.search("  WOOD  del"))[0] == "wood_delivery"
+
+
+def test_typos_and_infixes_fall_back_to_trigrams():
+    catalog = catalog_of("Collect Wood", "Mine Stone", "Fish")
+    assert keys(catalog.search("colect wod")) == ["collect_wood"]
+    assert keys(catalog.search("ston")) == ["mine_stone"]
+    assert catalog.search("xyz") == []
+
+
+def test_put_and_delete_update_the_index():
+    catalog = catalog_of("Collect Wood")
+    catalog.put("collect_wood", Task("collect_wood", "Gather Berries", 10, 0))
+    assert catalog.search("wood") == []
+    assert keys(catalog.search("berr")) == ["collect_wood"]
+    catalog.delete("collect_wood")
+    assert catalog.search("berr") == [] and len(catalog) == 0
+
+
+def test_pages_hold_25_tasks():
+    catalog = TaskCatalog(tasks_of({f"task_{i:03}": f"Task {i:03}" for i in range(60)}))
+    first, total = catalog.page(0)
+    last, _      = catalog.page(2)
+    assert total == 3
+    assert len(first) == 25 and keys(first)[0] == "task_000"
+    assert keys(last) == [f"task_{i:03}" for i in range(50, 60)]
+    assert catalog.page(3) == ([], 3)
+    assert TaskCatalog({}).page(0) == ([], 1)
+    assert len(catalog.search("task")) == 25
+
+
+def test_lookups_stay_under_a_millisecond_with_thousands_of_tasks():
+    verbs   = ["Collect", "Deliver", "Craft", "Escort", "Guard", "Hunt", "Mine", "Repair", "Scout", "Trade"]
+    items   = ["Oak Wood", "Iron Ore", "Gold Ore", "Granite", "Marble", "Salmon", "Wheat", "Leather", "Herbs", "Coal"]
+    places  = ["North Gate", "South Docks", "Old Mill", "Harbor", "Castle", "Market", "Forest Camp", "Quarry"]
+    names   = [f"{verb} {item} at {place}" for verb in verbs for item in items for place in places]
+    catalog = TaskCatalog(tasks_of({f"task_{i}": f"{name} {i // len(names)}" for i, name in enumerate(names * 7)}))
+    assert len(catalog) == 5600
+    # What autocomplete sends while someone types, typos included.
+    queries = ["c", "co", "col", "coll", "collect o", "iron", "irn ore", "delivr", "colect wod", "harbour", "mine g"]
+    timings = []
+    for query in queries * 10:
+        start = time.perf_counter()
+        catalog.search(query)
+        timings.append(time.perf_counter() - start)
+    assert statistics.median(timings) < 0.001
@@ -0,0 +1,136 @@
+import asyncio
+
+from leaderboard import RankIndex, RefreshScheduler
+
+
+def test_orders_by_points_then_member_id():
+    index = RankIndex.from_totals([(3, 10), (1, 10), (2, 20), (4, 0)], page_size=10)
+    # Ties keep a stable order by member id; members without points are not ranked.
+    assert index.page(0) == [(2, 20), (1, 10), (3, 10)]
+    assert [index.rank(member_id) for member_id in (2, 1, 3, 4)] == [1, 2, 3, None]
+    assert len(index) == 3
+
+
+def test_pages_split_at_page_size():
+    index = RankIndex.from_totals(((member_id, 100 - member_id) for member_id in range(45)), page_size=20)
+    assert index.total_pages == 3
+    assert [len(index.page(page)) for page in range(3)] == [20, 20, 5]
+    assert index.page(1)[0] == (20, 80)
+    assert index.page(3) == []
+    assert RankIndex(page_size=20).total_pages == 1
+
+
+def test_updates_move_insert_and_remove():
+    index = RankIndex.from_totals([(1, 30), (2, 20), (3, 10)], page_size=2)
+    index.update(3, 40)
+    assert index.page(0) == [(3, 40), (1, 30)]
+    index.update(4, 25)
+    assert index.rank(4) == 3
+    index.update(1, 0)
+    assert index.points(1) == 0 and index.rank(1) is None
+    assert index.page(0) == [(3, 40), (4, 25)]
+    assert index.page(1) == [(2, 20)]
+
+
+def test_page_versions_change_only_where_rows_moved():
+    index   = RankIndex.from_totals(((member_id, 100 - member_id) for member_id in range(6)), page_size=2)
+    before  = [index.page_version(page) for page in range(3)]
+    index.update(5, 98)  # last place moves up from page 2 to page 1
+    after   = [index.page_version(page) for page in range(3)]
+    assert after[0] == before[0]
+    assert after[1] != before[1] and after[2] != before[2]
+    index.update(5, 98)  # no change, no new version
+    assert [index.page_version(page) for page in range(3)] == after
+
+
+def test_a_new_index_never_reuses_versions():
+    old = RankIndex.from_totals([(1, 5)], page_size=20)
+    old.update(1, 6)
+    new = RankIndex.from_totals([(1, 6)], page_size=20)
+    assert new.page_version(0) != old.page_version(0)
+
+
+def test_clear_bumps_every_page():
+    index  = RankIndex.from_totals(((member_id, member_id + 1) for member_id in range(5)), page_size=2)
+    before = [index.page_version(page) for page in range(3)]
+    index.clear()
+    assert len(index) == 0 and index.page(0) == []
+    assert all(index.page_version(page) != version for page, version in enumerate(before))
+
+
+# ── Refresh Scheduler ─────────────────────────────────────────────
+def recording_scheduler(interval: float) -> tuple[RefreshScheduler, list]:
+    calls = []
+
+    async def refresh(guild, period):
+        calls.append((guild, period, asyncio.get_running_loop().time()))
+
+    return RefreshScheduler(refresh, interval), calls
+
+
+def test_a_burst_of_marks_renders_twice_per_window():
+    scheduler, calls = recording_scheduler(0.2)
+
+    async def main():
+        start = asyncio.get_running_loop().time()
+        for _ in range(20):
+            scheduler.mark(1, "weekly")
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.3)
+        return start
+
+    start = asyncio.run(main())
+    # The first mark renders at once; the other 19 collapse into one render after the window.
+    assert [(guild, period) for guild, period, _ in calls] == [(1, "weekly"), (1, "weekly")]
+    assert calls[0][2] - start < 0.05
+    assert calls[1][2] - calls[0][2] >= 0.2
+
+
+def test_keys_are_debounced_separately():
+    scheduler, calls = recording_scheduler(10.0)
+
+    async def main():
+        scheduler.mark(1, "weekly")
+        scheduler.mark(1, "monthly")
+        scheduler.mark(2, "weekly")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert sorted((guild, period) for guild, period, _ in calls) == [(1, "monthly"), (1, "weekly"), (2, "weekly")]
+
+
+def test_cancel_and_flush_settle_waiting_refreshes():
+    scheduler, calls = recording_scheduler(10.0)
+
+    async def main():
+        for key in [(1, "weekly"), (2, "weekly")]:
+            scheduler.mark(*key)
+        await asyncio.sleep(0.01)
+        for key in [(1, "weekly"), (2, "weekly")]:
+            scheduler.mark(*key)  # both now wait out the 10 s window
+        assert scheduler.cancel(1, "weekly")
+        assert not scheduler.cancel(1, "weekly")
+        await scheduler.flush()
+
+    asyncio.run(main())
+    assert [(guild, period) for guild, period, _ in calls] == [(1, "weekly"), (2, "weekly"), (2, "weekly")]
+
+
+def test_a_failing_refresh_does_not_stop_later_ones():
+    calls = []
+
+    async def refresh(guild, period):
+        calls.append(guild)
+        if guild == 1:
+            raise RuntimeError("channel gone")
+
+    scheduler = RefreshScheduler(refresh, 0.0)
+
+    async def main():
+        scheduler.mark(1, "weekly")
+        scheduler.mark(2, "weekly")
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert calls == [1, 2]
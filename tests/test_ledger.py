@@ -0,0 +1,113 @@
+import pytest
+
+from ledger import apply_entry, make_entry, rebuild, replay
+from models import Task
+from state import StateCache
+from storage import open_storage
+
+
+def empty_points() -> dict:
+    return {"weekly": {}, "monthly": {}}
+
+
+def totals(points: dict) -> dict:
+    return {
+        period: {member_id: data.to_dict() for member_id, data in bucket.items()}
+        for period, bucket in points.items()
+    }
+
+
+# ── Replay ────────────────────────────────────────────────────────
+def test_entry_kinds_fold_into_both_periods():
+    points = empty_points()
+    last = replay(points, [
+        make_entry(1, "claim", member_id=7, task_key="a", amount=2),
+        make_entry(2, "award", member_id=7, task_key="a", amount=2, points=10, reviewer="1"),
+        make_entry(3, "claim", member_id=7, task_key="b", amount=1),
+        make_entry(4, "reject", member_id=7, task_key="b", amount=1, reviewer="1"),
+    ])
+    assert last == 4
+    for period in ("weekly", "monthly"):
+        data = points[period][7]
+        assert data.total_points == 10
+        assert data.completions == {"a": 4, "b": 0}
+
+
+def test_reject_never_goes_negative_or_creates_members():
+    points = empty_points()
+    apply_entry(points, make_entry(1, "reject", member_id=7, task_key="a", amount=3))
+    assert points["weekly"] == {}
+    apply_entry(points, make_entry(2, "claim", member_id=7, task_key="a", amount=1))
+    apply_entry(points, make_entry(3, "reject", member_id=7, task_key="a", amount=3))
+    assert points["weekly"][7].completions == {"a": 0}
+
+
+def test_reset_empties_only_its_period():
+    points = empty_points()
+    apply_entry(points, make_entry(1, "award", member_id=7, task_key="a", amount=1, points=5))
+    apply_entry(points, make_entry(2, "reset", period="weekly"))
+    assert points["weekly"] == {}
+    assert points["monthly"][7].total_points == 5
+
+
+def test_member_ids_stored_as_text_are_read_as_int():
+    points = empty_points()
+    apply_entry(points, {**make_entry(1, "award", task_key="a", amount=1, points=5), "member_id": "7"})
+    assert list(points["weekly"]) == [7]
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        make_entry(1, "bonus", member_id=7, task_key="a")
+
+
+# ── Compaction ────────────────────────────────────────────────────
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    """Opens the same guild directory of one backend, as a restart would."""
+    return lambda: open_storage(request.param, str(tmp_path / request.param))
+
+
+def run(state: StateCache, count: int) -> None:
+    task = Task("a", "A", 3, 0)
+    for i in range(count):
+        member_id = 100 + i % 4
+        state.claim(member_id, "a", task, 1)
+        state.flush_sync()
+        state.record("award", member_id=member_id, task_key="a", amount=1, points=3, reviewer="1")
+        state.flush_sync()
+
+
+def test_snapshot_trims_the_ledger_and_reloads_the_same_totals(store):
+    storage = store()
+    state   = StateCache(storage, snapshot_every=5)
+    run(state, 6)  # 12 entries: a snapshot after the 5th and the 10th
+    assert state.ledger_seq == 12
+    snapshot, seq = storage.load_snapshot()
+    assert seq == 10
+    assert [entry["seq"] for entry in storage.load_ledger()] == [11, 12]
+    assert totals(rebuild(storage)[0]) == totals(state.points)
+    expected = totals(state.points)
+    storage.close()
+
+    reopened = store()
+    restored = StateCache(reopened, snapshot_every=5)
+    assert restored.ledger_seq == 12
+    assert totals(restored.points) == expected
+    assert restored.ranks["weekly"].page(0) == state.ranks["weekly"].page(0)
+    reopened.close()
+
+
+def test_reset_forces_a_snapshot(store):
+    storage = store()
+    state   = StateCache(storage, snapshot_every=1000)
+    run(state, 2)
+    state.reset_period("weekly")
+    state.flush_sync()
+    assert storage.load_ledger() == []
+    points, seq = storage.load_snapshot()
+    assert seq == state.ledger_seq
+    assert points["weekly"] == {}
+    assert totals(points)["monthly"] == totals(state.points)["monthly"]
+    storage.close()
+
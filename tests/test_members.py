@@ -0,0 +1,54 @@
+from members import MemberCache, MemberIdentity
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def member(member_id: int, name: str = "") -> MemberIdentity:
+    return MemberIdentity(member_id, name or f"Member {member_id}", None)
+
+
+def test_least_recently_used_members_are_evicted_first():
+    cache = MemberCache(capacity=2, clock=Clock())
+    cache.put(1, member(10))
+    cache.put(1, member(11))
+    assert cache.get(1, 10) == member(10)  # 10 is now the most recent
+    cache.put(1, member(12))
+    assert len(cache) == 2
+    assert cache.lookup(1, 11) == (False, None)
+    assert cache.get(1, 10) == member(10) and cache.get(1, 12) == member(12)
+
+
+def test_entries_expire_after_the_ttl():
+    clock = Clock()
+    cache = MemberCache(ttl=60, clock=clock)
+    cache.put(1, member(10))
+    cache.put_missing(1, 11)
+    clock.now = 60
+    assert cache.lookup(1, 10) == (True, member(10))
+    # A member that could not be found is remembered too, until it expires.
+    assert cache.lookup(1, 11) == (True, None)
+    clock.now = 61
+    assert cache.lookup(1, 10) == (False, None)
+    assert cache.lookup(1, 11) == (False, None)
+    assert len(cache) == 0
+    assert cache.stats() == {"entries": 0, "hits": 2, "misses": 2, "hit_rate": 0.5}
+
+
+def test_generation_changes_only_when_a_guild_identity_does():
+    cache = MemberCache(clock=Clock())
+    cache.put(1, member(10, "Ada"))
+    first = cache.generation(1)
+    cache.put(1, member(10, "Ada"))
+    assert cache.generation(1) == first
+    cache.put(1, member(10, "Ada L."))
+    assert cache.generation(1) == first + 1
+    cache.forget(1, 10)
+    cache.forget(1, 10)
+    assert cache.generation(1) == first + 2
+    assert cache.generation(2) == 0
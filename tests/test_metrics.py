@@ -0,0 +1,68 @@
+import asyncio
+import logging
+
+import pytest
+
+from metrics import Histogram, Metrics
+
+
+def test_histogram_buckets_are_upper_bounds():
+    histogram = Histogram((0.01, 0.1, 1.0))
+    for value in (0.005, 0.01, 0.05, 2.0):
+        histogram.observe(value)
+    # A value on a bound counts in that bucket ("le"); the last slot is +Inf.
+    assert histogram.counts == [2, 1, 0, 1]
+    assert histogram.count == 4 and histogram.sum == pytest.approx(2.065)
+
+
+def test_histogram_quantiles_interpolate_inside_a_bucket():
+    histogram = Histogram((0.01, 0.1, 1.0))
+    assert histogram.quantile(0.5) == 0.0
+    for _ in range(10):
+        histogram.observe(0.05)
+    assert histogram.quantile(0.5) == pytest.approx(0.055)
+    assert histogram.quantile(1.0) == pytest.approx(0.1)
+    histogram.observe(5.0)
+    # Past the last bound the estimate is capped at it.
+    assert histogram.quantile(1.0) == 1.0
+
+
+def test_render_writes_cumulative_prometheus_buckets():
+    metrics = Metrics(prefix="t")
+    metrics.describe("claims_total", "Claims handled")
+    metrics.inc("claims_total", outcome="ok")
+    metrics.inc("claims_total", 2, outcome="ok")
+    metrics.observe("claim_seconds", 0.002)
+    metrics.observe("claim_seconds", 0.02)
+    text = metrics.render()
+    assert "# HELP t_claims_total Claims handled\n" in text
+    assert 't_claims_total{outcome="ok"} 3\n' in text
+    assert 't_claim_seconds_bucket{le="0.0025"} 1\n' in text
+    assert 't_claim_seconds_bucket{le="+Inf"} 2\n' in text
+    assert "t_claim_seconds_count 2\n" in text
+
+
+# ── Rate Limit Counter ────────────────────────────────────────────
+def warning(message: str) -> logging.LogRecord:
+    return logging.LogRecord("discord.http", logging.WARNING, __file__, 0, message, None, None)
+
+
+def test_each_429_is_counted_once_with_its_scope(load_bot):
+    async def main():
+        bot     = load_bot()
+        counter = bot.RateLimitCounter(logging.WARNING)
+        counter.emit(warning("We are being rate limited. PATCH /channels/1/messages/2 responded with 429."))
+        counter.emit(warning("We are being rate limited. POST /channels/1/messages responded with 429."))
+        counter.emit(warning("Global rate limit has been hit. Retrying in 1.00 seconds."))
+        await asyncio.sleep(0)
+        # A global warning on its own, outside a bucket 429.
+        counter.emit(warning("Global rate limit has been hit. Retrying in 1.00 seconds."))
+        counter.emit(warning("Something else"))
+        await asyncio.sleep(0)
+        totals = {
+            scope: bot.metrics.total("discord_rate_limits_total", scope=scope) for scope in ("bucket", "global")
+        }
+        await bot.states.close()
+        return totals
+
+    assert asyncio.run(main()) == {"bucket": 1, "global": 2}
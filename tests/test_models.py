@@ -0,0 +1,79 @@
+import pytest
+
+from models import (
+    SNAPSHOT_MAGIC, MemberPeriodStats, Submission, Task, decode_points, encode_points, points_from_dicts,
+)
+
+
+def sample_points() -> dict:
+    return points_from_dicts({
+        "weekly": {
+            "7":                   {"total_points": 12, "completions": {"a": 2, "b": 1}},
+            "8":                   {"total_points": 0, "completions": {}},
+            "1234567890123456789": {"total_points": -3, "completions": {"ü-task": 4}},
+        },
+        "monthly": {},
+    })
+
+
+def as_dicts(points: dict) -> dict:
+    return {period: {member_id: data.to_dict() for member_id, data in bucket.items()} for period, bucket in points.items()}
+
+
+def test_snapshot_round_trip():
+    points = sample_points()
+    data   = encode_points(points, 42)
+    assert data.startswith(SNAPSHOT_MAGIC)
+    decoded, seq = decode_points(data)
+    assert seq == 42
+    assert as_dicts(decoded) == as_dicts(points)
+    assert list(decoded["weekly"]) == [7, 8, 1234567890123456789]
+
+
+def test_empty_snapshot_round_trip():
+    decoded, seq = decode_points(encode_points({"weekly": {}, "monthly": {}}, 0))
+    assert decoded == {"weekly": {}, "monthly": {}} and seq == 0
+
+
+def test_decoded_completions_unpack_lazily_and_stay_mutable():
+    decoded, _ = decode_points(encode_points(sample_points(), 1))
+    stats = decoded["weekly"][7]
+    assert dict(stats.completion_items()) == {"a": 2, "b": 1}
+    assert stats._completions is None  # still packed
+    stats.completions["a"] += 1
+    assert dict(stats.completion_items()) == {"a": 3, "b": 1}
+    again, _ = decode_points(encode_points(decoded, 2))
+    assert again["weekly"][7].completions == {"a": 3, "b": 1}
+
+
+def test_task_keys_are_shared_between_members():
+    decoded, _ = decode_points(encode_points(points_from_dicts({
+        "weekly": {"1": {"total_points": 1, "completions": {"task_x": 1}}},
+        "monthly": {"2": {"total_points": 1, "completions": {"task_x": 2}}},
+    }), 0))
+    (first,)  = decoded["weekly"][1].completions
+    (second,) = decoded["monthly"][2].completions
+    assert first is second
+
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError):
+        decode_points(b'{"weekly": {}}')
+
+
+def test_submission_round_trip_shares_the_live_task():
+    task = Task("a", "Task A", 5, 3)
+    sub  = Submission(7, task, 2, 10, claim_message_id=11, approval_message_id=12)
+    row  = sub.to_dict()
+    assert row["member_id"] == "7" and row["approval_message_id"] == "12"
+    restored = Submission.from_dict(row, {"a": task})
+    assert restored.task is task
+    assert (restored.member_id, restored.claim_message_id, restored.approval_message_id) == (7, 11, 12)
+    # A task edited since the claim: the submission keeps the version it was claimed against.
+    edited = Submission.from_dict(row, {"a": Task("a", "Task A", 8, 3)})
+    assert edited.task == task and edited.task.points == 5
+
+
+def test_member_stats_from_dict():
+    stats = MemberPeriodStats.from_dict({"total_points": 4})
+    assert stats.total_points == 4 and stats.completions == {}
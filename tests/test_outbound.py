@@ -0,0 +1,87 @@
+import asyncio
+import random
+
+from outbound import PANEL, USER, OutboundScheduler
+
+
+class FixedWindowServer:
+    """Discord's view of one bucket: a window opens with the first request it receives."""
+
+    def __init__(self, capacity: int, period: float, rng: random.Random):
+        self.capacity = capacity
+        self.period   = period
+        self.rng      = rng
+        self.windows  = []  # [opened at, requests]
+        self.limited  = 0
+
+    async def request(self, latency: float = 0.01) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(latency + self.rng.uniform(0, latency))
+            now = loop.time()
+            if not self.windows or now >= self.windows[-1][0] + self.period:
+                self.windows.append([now, 0])
+            window = self.windows[-1]
+            if window[1] < self.capacity:
+                window[1] += 1
+                return
+            self.limited += 1
+            await asyncio.sleep(window[0] + self.period - now)
+
+
+def test_a_burst_never_exceeds_the_route_capacity_per_window():
+    server    = FixedWindowServer(5, 0.2, random.Random(1))
+    scheduler = OutboundScheduler(workers=4, route_capacity=5, route_period=0.2)
+
+    async def main():
+        calls = [scheduler.submit(server.request, PANEL, "channel:1") for _ in range(23)]
+        await asyncio.gather(*calls)
+        await scheduler.close()
+
+    asyncio.run(main())
+    assert server.limited == 0
+    assert max(count for _, count in server.windows) <= 5
+    assert sum(count for _, count in server.windows) == 23
+    assert len(server.windows) == 5
+
+
+def test_a_slow_call_is_charged_to_the_next_window():
+    # The first call of the second window is slow enough to land after Discord's reset.
+    server    = FixedWindowServer(3, 0.2, random.Random(2))
+    scheduler = OutboundScheduler(workers=3, route_capacity=3, route_period=0.2)
+    slow      = iter([0.01, 0.01, 0.01, 0.3])
+
+    async def call():
+        await server.request(next(slow, 0.01))
+
+    async def main():
+        calls = [scheduler.submit(call, PANEL, "channel:1") for _ in range(12)]
+        await asyncio.gather(*calls)
+        await scheduler.close()
+
+    asyncio.run(main())
+    assert server.limited == 0
+    assert max(count for _, count in server.windows) <= 3
+
+
+def test_routes_have_separate_budgets_and_users_go_first():
+    scheduler = OutboundScheduler(workers=1, route_capacity=1, route_period=60.0)
+    order     = []
+
+    def job(name):
+        async def run():
+            order.append(name)
+        return run
+
+    async def main():
+        first = scheduler.submit(job("panel 1"), PANEL, "channel:1")
+        await first
+        calls = [
+            scheduler.submit(job("panel 2"), PANEL, "channel:2"),
+            scheduler.submit(job("user"), USER, "message:1"),
+        ]
+        await asyncio.gather(*calls)
+        await scheduler.close()
+
+    asyncio.run(main())
+    assert order == ["panel 1", "user", "panel 2"]
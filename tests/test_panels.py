@@ -0,0 +1,111 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+import bench
+
+
+def open_orders(description: str) -> discord.Embed:
+    return discord.Embed(title="📋 Open Orders", description=description)
+
+
+async def publish(bot, channel, description: str):
+    return await bot.publish_message(channel, "open_tasks", bot.embed_titled("📋 Open Orders"), embed=open_orders(description))
+
+
+async def started(load_bot):
+    # The client binds to the running loop, so the bot is loaded inside it.
+    bot   = load_bot()
+    api   = bench.Api()
+    guild = bench.FakeGuild(api, 0, [bot.OPEN_TASKS_CHANNEL_NAME])
+    bot.outbound.start()
+    return bot, api, guild.text_channels[0]
+
+
+async def stop(bot) -> None:
+    await bot.outbound.close()
+    await bot.states.close()
+
+
+def test_panels_are_remembered_and_edited_in_place(load_bot):
+    async def main():
+        bot, api, channel = await started(load_bot)
+        guild = channel.guild
+        first = await publish(bot, channel, "a")
+        assert api.calls == {"channel.history": 1, "channel.send": 1}
+        assert bot.guild_state(guild).get_message(guild.id, "open_tasks") == {
+            "channel_id": channel.id, "message_id": first.id,
+        }
+        # The stored message is edited: no history scan, no new message.
+        assert (await publish(bot, channel, "b")).id == first.id
+        assert api.calls == {"channel.history": 1, "channel.send": 1, "message.edit": 1}
+        await stop(bot)
+
+        # After a restart the registry still points at the message.
+        bot, api, channel = await started(load_bot)
+        assert (await publish(bot, channel, "c")).id == first.id
+        assert api.calls == {"message.edit": 1}
+        await stop(bot)
+
+    asyncio.run(main())
+
+
+def test_a_deleted_panel_is_forgotten_and_posted_again(load_bot):
+    class DeletedMessage(bench.FakeMessage):
+        async def edit(self, **fields):
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+
+    async def main():
+        bot, api, channel = await started(load_bot)
+        first = await publish(bot, channel, "a")
+        channel.get_partial_message = lambda message_id: DeletedMessage(api, channel, message_id)
+        second = await publish(bot, channel, "b")
+        assert second.id != first.id
+        assert api.calls == {"channel.history": 2, "channel.send": 2}
+        assert bot.guild_state(channel.guild).get_message(channel.guild.id, "open_tasks")["message_id"] == second.id
+        await stop(bot)
+
+    asyncio.run(main())
+
+
+def test_unchanged_renders_cost_no_api_call(load_bot):
+    async def main():
+        bot, api, channel = await started(load_bot)
+        await publish(bot, channel, "a")
+        assert await publish(bot, channel, "a") is None
+        assert api.calls == {"channel.history": 1, "channel.send": 1}
+        await publish(bot, channel, "b")
+        assert await publish(bot, channel, "b") is None
+        assert api.calls["message.edit"] == 1
+        await stop(bot)
+
+    asyncio.run(main())
+
+
+def test_fingerprints_cover_content_embed_and_components(load_bot):
+    async def main():
+        bot  = load_bot()
+        view = discord.ui.View()
+        view.add_item(discord.ui.Button(label="Next", custom_id="next"))
+        base = bot.fingerprint(open_orders("a"), view, "hi")
+        assert base == bot.fingerprint(open_orders("a"), view, "hi")
+        assert base != bot.fingerprint(open_orders("b"), view, "hi")
+        assert base != bot.fingerprint(open_orders("a"), discord.ui.View(), "hi")
+        assert base != bot.fingerprint(open_orders("a"), view, "hello")
+        await bot.states.close()
+
+    asyncio.run(main())
+
+
+def test_a_caller_digest_ignores_cosmetic_changes(load_bot):
+    # Leaderboards pass the digest of their unstamped render, so a new "Last updated" is no edit.
+    async def main():
+        bot, api, channel = await started(load_bot)
+        match = bot.embed_titled("📋 Open Orders")
+        await bot.publish_message(channel, "open_tasks", match, digest="same", embed=open_orders("12:00"))
+        assert await bot.publish_message(channel, "open_tasks", match, digest="same", embed=open_orders("12:01")) is None
+        assert api.calls == {"channel.history": 1, "channel.send": 1}
+        await stop(bot)
+
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytz
+
+from resets import ResetScheduler, epoch_label, last_deadline, next_deadline
+
+BERLIN = pytz.timezone("Europe/Berlin")
+
+
+def local(*args) -> datetime:
+    return BERLIN.localize(datetime(*args))
+
+
+# ── Deadlines ─────────────────────────────────────────────────────
+def test_weekly_deadline_is_monday_evening():
+    now = local(2026, 10, 14, 12, 0)  # a Wednesday
+    assert last_deadline("weekly", now) == local(2026, 10, 12, 19)
+    assert next_deadline("weekly", now) == local(2026, 10, 19, 19)
+
+
+def test_deadline_itself_counts_as_passed():
+    deadline = local(2026, 10, 12, 19)
+    assert last_deadline("weekly", deadline) == deadline
+    assert last_deadline("weekly", deadline - timedelta(seconds=1)) == local(2026, 10, 5, 19)
+    assert next_deadline("weekly", deadline) == local(2026, 10, 19, 19)
+
+
+def test_weekly_deadline_across_spring_forward():
+    # Clocks go forward on Sunday 29 March 2026; the week before it has 167 hours.
+    now      = local(2026, 3, 30, 20, 0)
+    deadline = last_deadline("weekly", now)
+    assert deadline == local(2026, 3, 30, 19)
+    assert deadline.utcoffset() == timedelta(hours=2)
+    previous = last_deadline("weekly", deadline - timedelta(seconds=1))
+    assert previous.utcoffset() == timedelta(hours=1)
+    assert deadline - previous == timedelta(hours=167)
+    assert next_deadline("weekly", local(2026, 3, 25, 12)) == deadline
+
+
+def test_weekly_deadline_across_fall_back():
+    # Clocks go back on Sunday 25 October 2026; that week has 169 hours.
+    deadline = next_deadline("weekly", local(2026, 10, 21, 12))
+    assert deadline == local(2026, 10, 26, 19)
+    assert deadline.utcoffset() == timedelta(hours=1)
+    assert deadline - local(2026, 10, 19, 19) == timedelta(hours=169)
+
+
+def test_monthly_deadline_across_fall_back():
+    now = local(2026, 10, 31, 23, 0)
+    assert last_deadline("monthly", now) == local(2026, 10, 1, 20)
+    deadline = next_deadline("monthly", now)
+    assert deadline == local(2026, 11, 1, 20)
+    assert deadline.utcoffset() == timedelta(hours=1)
+
+
+def test_monthly_deadline_wraps_the_year():
+    assert last_deadline("monthly", local(2027, 1, 1, 19, 59)) == local(2026, 12, 1, 20)
+    assert next_deadline("monthly", local(2026, 12, 15)) == local(2027, 1, 1, 20)
+
+
+def test_epoch_labels():
+    assert epoch_label("weekly", local(2026, 12, 28, 19)) == "2026-W53"
+    assert epoch_label("monthly", local(2026, 3, 1, 20)) == "2026-03"
+
+
+# ── Scheduler ─────────────────────────────────────────────────────
+class FakeState:
+    def __init__(self, **last):
+        self.last = dict(last)
+
+    def last_reset(self, period):
+        return self.last.get(period)
+
+    def mark_reset(self, period, deadline):
+        self.last[period] = deadline
+
+
+class Harness:
+    def __init__(self, now: datetime, states: dict, fail: set = frozenset()):
+        self.now    = now
+        self.states = states
+        self.fail   = fail
+        self.calls  = []
+        self.scheduler = ResetScheduler(
+            self.reset,
+            targets   = lambda: list(self.states),
+            state_for = self.states.__getitem__,
+            tz        = BERLIN,
+            clock     = lambda: self.now,
+        )
+
+    async def reset(self, target, period, deadline):
+        self.calls.append((target, period, deadline))
+        if target in self.fail:
+            raise RuntimeError("storage unavailable")
+        # The bot's reset marks the deadline as part of the reset itself.
+        self.states[target].mark_reset(period, deadline.timestamp())
+
+    def run_due(self):
+        return asyncio.run(self.scheduler.run_due())
+
+
+def test_first_start_adopts_the_current_period():
+    harness = Harness(local(2026, 10, 14, 12), {"g": FakeState()})
+    assert harness.run_due() == []
+    assert harness.calls == []
+    assert harness.states["g"].last["weekly"] == local(2026, 10, 12, 19).timestamp()
+    assert harness.states["g"].last["monthly"] == local(2026, 10, 1, 20).timestamp()
+
+
+def test_catches_up_once_after_downtime():
+    # Down since before the 28 September reset; three weekly deadlines passed.
+    state = FakeState(
+        weekly  = local(2026, 9, 21, 19).timestamp(),
+        monthly = local(2026, 9, 1, 20).timestamp(),
+    )
+    harness = Harness(local(2026, 10, 14, 12), {"g": state})
+    assert sorted(harness.run_due()) == [("g", "monthly"), ("g", "weekly")]
+    deadlines = {period: deadline for _, period, deadline in harness.calls}
+    assert deadlines == {"weekly": local(2026, 10, 12, 19), "monthly": local(2026, 10, 1, 20)}
+
+
+def test_rerun_is_idempotent():
+    state   = FakeState(weekly=local(2026, 10, 5, 19).timestamp(), monthly=local(2026, 10, 1, 20).timestamp())
+    harness = Harness(local(2026, 10, 12, 19, 0, 30), {"g": state})
+    assert harness.run_due() == [("g", "weekly")]
+    assert harness.run_due() == []
+    harness.now = local(2026, 10, 18, 23)
+    assert harness.run_due() == []
+    assert len(harness.calls) == 1
+
+
+def test_failed_reset_is_retried_and_others_continue():
+    marked  = local(2026, 10, 5, 19).timestamp()
+    states  = {"a": FakeState(weekly=marked), "b": FakeState(weekly=marked)}
+    harness = Harness(local(2026, 10, 13, 9), states, fail={"a"})
+    harness.scheduler.periods = ("weekly",)
+    assert harness.run_due() == [("b", "weekly")]
+    assert states["a"].last["weekly"] == marked
+    harness.fail = set()
+    assert harness.run_due() == [("a", "weekly")]
+
+
+def test_sleeps_until_the_nearest_deadline():
+    harness = Harness(local(2026, 10, 26, 18, 0), {})
+    assert harness.scheduler.seconds_until_next() == 3600.0
+    harness.now = local(2026, 10, 31, 20, 0)
+    assert harness.scheduler.seconds_until_next() == 24 * 3600.0
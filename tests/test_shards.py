@@ -0,0 +1,94 @@
+import asyncio
+import os
+
+import pytest
+
+from shards import PartitionLock, PartitionLocked, ShardBus, shard_for
+from state import GuildStates
+
+
+def test_guilds_map_to_shards_by_snowflake():
+    guild_id = (123 << 22) | 99
+    assert shard_for(guild_id, 1) == 0
+    assert shard_for(guild_id, 4) == 123 % 4
+
+
+# ── Partition Locks ───────────────────────────────────────────────
+def test_one_holder_per_partition(tmp_path):
+    first, second = PartitionLock(str(tmp_path / "1")), PartitionLock(str(tmp_path / "1"))
+    assert first.try_acquire() and first.try_acquire()
+    assert not second.try_acquire()
+    assert second.holder() == str(os.getpid())
+    first.release()
+    assert not first.held
+    assert second.try_acquire()
+    second.release()
+
+
+def test_acquire_waits_for_the_holder_or_times_out(tmp_path):
+    holder, waiter = PartitionLock(str(tmp_path / "1")), PartitionLock(str(tmp_path / "1"))
+    holder.try_acquire()
+
+    async def main():
+        with pytest.raises(PartitionLocked):
+            await waiter.acquire(timeout=0.05, interval=0.01)
+        asyncio.get_running_loop().call_later(0.05, holder.release)
+        await waiter.acquire(timeout=1.0, interval=0.01)
+
+    asyncio.run(main())
+    assert waiter.held
+    waiter.release()
+
+
+def test_a_guild_is_served_by_one_process_until_it_is_released(tmp_path):
+    owner, other = GuildStates("sqlite", str(tmp_path)), GuildStates("sqlite", str(tmp_path))
+
+    async def main():
+        owner.get(1).put_meta("k", "v")
+        assert not other.try_lock(1)
+        with pytest.raises(PartitionLocked):
+            other.get(1)
+        assert await owner.release(1)
+        assert not owner.holds(1)
+        # Handed over: the old owner does not reopen it behind the new one's back.
+        with pytest.raises(PartitionLocked):
+            owner.get(1)
+        await other.acquire(1, timeout=1.0)
+        assert other.get(1).storage.get_meta("k") == "v"
+        await owner.close()
+        await other.close()
+
+    asyncio.run(main())
+
+
+# ── Shard Bus ─────────────────────────────────────────────────────
+def test_messages_reach_one_shard_or_every_other_one(tmp_path):
+    directory = str(tmp_path / "ipc")
+    buses     = [ShardBus(directory, shard_id) for shard_id in range(3)]
+    received  = []
+
+    def recorder(shard_id):
+        async def handler(message):
+            received.append((shard_id, message))
+        return handler
+
+    async def main():
+        for bus in buses:
+            bus.on("release", recorder(bus.shard_id))
+            await bus.start()
+        assert buses[0].publish("release", shard=2, guild=7) == 1
+        assert buses[1].publish("release", guild=8) == 2
+        assert buses[0].publish("unknown") == 2  # delivered, but nobody handles it
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+        await buses[2].close()
+        assert not os.path.exists(buses[2].path)
+        # A shard that is not running just misses the hint.
+        assert buses[0].publish("release", shard=2, guild=9) == 0
+        for bus in buses[:2]:
+            await bus.close()
+
+    asyncio.run(main())
+    assert sorted((shard, message["guild"], message["from"]) for shard, message in received) == [
+        (0, 8, 1), (2, 7, 0), (2, 8, 1),
+    ]
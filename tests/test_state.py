@@ -0,0 +1,154 @@
+import asyncio
+import threading
+
+from models import Task
+from state import GuildStates, MutationPipeline, StateCache
+from storage import open_storage
+
+
+def test_load_reads_a_cold_guild_off_the_event_loop(tmp_path):
+    states  = GuildStates("json", str(tmp_path))
+    threads = []
+    build   = states._build
+
+    def recording_build(store):
+        threads.append(threading.current_thread())
+        return build(store)
+
+    states._build = recording_build
+
+    async def main():
+        state = await states.load(1)
+        assert await states.load(1) is state
+        assert states.get(1) is state
+        await states.close()
+
+    asyncio.run(main())
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
+
+
+def test_get_still_loads_synchronously(tmp_path):
+    states = GuildStates("sqlite", str(tmp_path))
+    state  = states.get(2)
+    assert 2 in states and states.get(2) is state
+    asyncio.run(states.close())
+
+
+def test_flush_sync_after_close_is_a_no_op(tmp_path):
+    states = GuildStates("sqlite", str(tmp_path))
+    state  = states.get(3)
+    asyncio.run(states.close())
+    state.put_meta("k", "v")
+    states.flush_sync()  # the stores are closed; this must not touch them
+
+
+# ── Mutation Pipeline ─────────────────────────────────────────────
+def counting_flushes(state: StateCache) -> list:
+    batches = []
+    write   = state.storage.write_batch
+
+    def recording_write(batch):
+        batches.append(sorted(batch["meta"]))
+        write(batch)
+
+    state.storage.write_batch = recording_write
+    return batches
+
+
+def test_operations_in_one_window_share_a_commit_and_keep_their_order(tmp_path):
+    state    = StateCache(open_storage("json", str(tmp_path)))
+    pipeline = MutationPipeline(state, window=0.05)
+    batches  = counting_flushes(state)
+    applied  = []
+
+    def op(key):
+        applied.append(key)
+        state.put_meta(key, "1")
+        return key
+
+    async def main():
+        first = await asyncio.gather(*(pipeline.submit(op, f"k{i}") for i in range(5)))
+        later = await pipeline.submit(op, "k5")
+        await pipeline.close()
+        return first, later
+
+    first, later = asyncio.run(main())
+    assert first == ["k0", "k1", "k2", "k3", "k4"] and later == "k5"
+    assert applied == ["k0", "k1", "k2", "k3", "k4", "k5"]
+    assert batches == [["k0", "k1", "k2", "k3", "k4"], ["k5"]]
+
+
+def test_a_failing_operation_only_fails_its_own_caller(tmp_path):
+    state    = StateCache(open_storage("json", str(tmp_path)))
+    pipeline = MutationPipeline(state, window=0.05)
+
+    def fail():
+        raise ValueError("bad")
+
+    async def main():
+        results = await asyncio.gather(
+            pipeline.submit(state.put_meta, "a", "1"),
+            pipeline.submit(fail),
+            pipeline.submit(state.put_meta, "b", "2"),
+            return_exceptions=True,
+        )
+        await pipeline.close()
+        return results
+
+    results = asyncio.run(main())
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], ValueError)
+    assert state.storage.get_meta("a") == "1" and state.storage.get_meta("b") == "2"
+
+
+def test_close_commits_operations_still_queued(tmp_path):
+    states = GuildStates("sqlite", str(tmp_path), window=0.05)
+
+    async def main():
+        await states.load(4)
+        states.start()
+        state   = states.get(4)
+        pending = [asyncio.ensure_future(state.mutations.submit(state.put_meta, f"k{i}", "1")) for i in range(3)]
+        await asyncio.sleep(0)  # queued, the window still open
+        await states.close()
+        return await asyncio.wait_for(asyncio.gather(*pending), 1.0)
+
+    assert asyncio.run(main()) == [None, None, None]
+    store = open_storage("sqlite", str(tmp_path / "4"))
+    assert [store.get_meta(f"k{i}") for i in range(3)] == ["1", "1", "1"]
+    store.close()
+
+
+# ── Reviews ───────────────────────────────────────────────────────
+def test_a_review_from_before_a_restart_is_found_in_the_archive(tmp_path):
+    task = Task("wood", "Collect Wood", 10, 0)
+
+    async def review_then_restart():
+        state = StateCache(open_storage("sqlite", str(tmp_path)))
+        state.claim(7, "wood", task, 1, submission_id="7_1")
+        assert state.review_submission("7_1", "approved", "1", "Admin")[0] == "ok"
+        assert await state.resolved_status("7_1") == "approved"
+        await state.close()
+        state.storage.close()
+
+        state = StateCache(open_storage("sqlite", str(tmp_path)))
+        assert state.review_submission("7_1", "rejected", "1", "Admin")[0] == "missing"
+        assert await state.resolved_status("7_1") == "approved"
+        assert await state.resolved_status("7_2") is None
+        await state.close()
+        state.storage.close()
+
+    asyncio.run(review_then_restart())
+
+
+def test_a_review_still_in_the_hot_store_is_found(tmp_path):
+    # A crash between the review and its flush leaves the row in the hot store.
+    store = open_storage("json", str(tmp_path))
+    task  = Task("wood", "Collect Wood", 10, 0)
+    store.write_batch({"submissions": {"7_1": {
+        "member_id": 7, "task_key": "wood", "task": task.to_dict(), "amount": 1, "earned_points": 10,
+        "status": "rejected",
+    }}})
+    state = StateCache(store)
+    assert asyncio.run(state.resolved_status("7_1")) == "rejected"
+    asyncio.run(state.close())
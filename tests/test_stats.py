@@ -0,0 +1,57 @@
+from array import array
+
+import pytest
+
+import stats
+from models import points_from_dicts
+from stats import PeriodColumns
+
+
+def bucket() -> dict:
+    return points_from_dicts({"weekly": {
+        "7": {"total_points": 3, "completions": {"a": 1, "b": 2}},
+        "9": {"total_points": 1, "completions": {"b": 5, "c": 0}},
+    }})["weekly"]
+
+
+def totals(bucket: dict) -> dict:
+    return {member_id: data.to_dict() for member_id, data in bucket.items()}
+
+
+def test_columns_round_trip():
+    columns = PeriodColumns.from_bucket(bucket())
+    data    = columns.to_dict()
+    assert data["format"] == stats.COLUMNS_FORMAT
+    restored = PeriodColumns.from_dict(data)
+    assert restored.cell_member.typecode == restored.cell_task.typecode == "I"
+    # Zero counts are not stored.
+    assert totals(restored.to_bucket()) == {
+        7: {"total_points": 3, "completions": {"a": 1, "b": 2}},
+        9: {"total_points": 1, "completions": {"b": 5}},
+    }
+
+
+def test_unknown_formats_are_rejected():
+    with pytest.raises(ValueError):
+        PeriodColumns.from_dict({"7": {"total_points": 3, "completions": {"a": 1}}})
+
+
+def test_queries_aggregate_across_epochs():
+    history = [("2026-W40", PeriodColumns.from_bucket(bucket())), ("2026-W41", PeriodColumns.from_bucket(bucket()))]
+    assert stats.top_members(history) == [(7, 6), (9, 2)]
+    assert stats.top_tasks(history) == [("b", 14), ("a", 2)]
+    assert stats.top_tasks(history, member_id=7) == [("b", 4), ("a", 2)]
+
+
+def test_member_queries_read_only_that_members_cells():
+    other   = points_from_dicts({"weekly": {"9": {"total_points": 4, "completions": {"c": 4}}}})["weekly"]
+    history = [("2026-W40", PeriodColumns.from_bucket(bucket())), ("2026-W41", PeriodColumns.from_bucket(other))]
+    tasks, counts = history[0][1].member_cells(9)
+    assert [history[0][1].tasks[column] for column in tasks] == ["b"]
+    assert list(counts) == [5]
+    assert history[1][1].member_cells(7) == (array("I"), array("q"))
+    assert stats.top_tasks(history, member_id=9) == [("b", 5), ("c", 4)]
+    assert stats.top_tasks(history, member_id=7) == [("b", 2), ("a", 1)]
+    assert stats.trend(history, 7) == [("2026-W40", 3), ("2026-W41", 0)]
+    assert stats.task_contributors(history, "c") == [(9, 4)]
+    assert stats.task_contributors(history, "missing") == []
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from state import StateCache
+from storage import (
+    append_submission_archive, import_legacy, iter_submission_archive, open_legacy_storage, open_storage,
+)
+
+
+def write_json(path, data) -> str:
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+# ── Legacy Import ─────────────────────────────────────────────────
+def legacy_files(root) -> tuple[str, str, str]:
+    """The bot-wide files as the single-guild bot wrote them."""
+    task = {"name": "Collect Wood", "points": 10, "max_completions": 5}
+    return (
+        write_json(root / "tasks.json", {"wood": task}),
+        write_json(root / "points.json", {
+            "weekly":  {"7": {"total_points": 30, "completions": {"wood": 3}}},
+            "monthly": {"7": {"total_points": 50, "completions": {"wood": 5}}},
+        }),
+        write_json(root / "submissions.json", {
+            "7_1": {
+                "member_id": "7", "task_key": "wood", "task": task, "amount": 1,
+                "earned_points": 10, "status": "pending", "claim_message_id": "99",
+            },
+        }),
+    )
+
+
+def test_no_legacy_files_means_no_source(tmp_path):
+    missing = [str(tmp_path / name) for name in ("tasks.json", "points.json", "submissions.json")]
+    assert open_legacy_storage(str(tmp_path / "data"), *missing) is None
+
+
+def test_legacy_json_files_are_imported_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Files in the working directory that the legacy source must not pick up.
+    write_json(tmp_path / "messages.json", {"1": {"claim": {"channel_id": 5, "message_id": 6}}})
+    write_json(tmp_path / "meta.json", {"legacy_import": "{}"})
+    source = open_legacy_storage(str(tmp_path / "data"), *legacy_files(tmp_path))
+    target = open_storage("sqlite", str(tmp_path / "data" / "1"))
+
+    counts = import_legacy(target, source, 1)
+    assert counts == {"tasks": 1, "members": 2, "ledger": 0, "submissions": 1}
+    assert import_legacy(target, source, 1) == {}
+    assert target.load_tasks()["wood"]["points"] == 10
+    points, _ = target.load_snapshot()
+    assert points["weekly"][7].total_points == 30
+    assert points["monthly"][7].completions == {"wood": 5}
+    assert target.pending_submissions()["7_1"]["claim_message_id"] == "99"
+    assert target.load_messages() == {}
+    source.close()
+    target.close()
+
+
+# ── Submission Archive ────────────────────────────────────────────
+def resolved(submission_id: str, month: int, status: str = "approved") -> dict:
+    task = {"name": "Collect Wood", "points": 10, "max_completions": 5}
+    at   = datetime(2026, month, 15, tzinfo=timezone.utc).timestamp()
+    return {
+        "submission_id": submission_id, "member_id": 7, "task_key": "wood", "task": task, "amount": 1,
+        "earned_points": 10, "status": status, "resolved_at": at,
+    }
+
+
+def test_archive_is_written_per_month_and_streamed_back(tmp_path):
+    directory = str(tmp_path / "archive")
+    append_submission_archive(directory, [resolved("7_1", 9), resolved("7_2", 10)])
+    # A second write appends another gzip member to the same month.
+    append_submission_archive(directory, [resolved("7_3", 10, "rejected")], durability="off")
+
+    assert sorted(os.listdir(directory)) == ["2026-09.jsonl.gz", "2026-10.jsonl.gz"]
+    assert [r["submission_id"] for r in iter_submission_archive(directory)] == ["7_1", "7_2", "7_3"]
+    october = list(iter_submission_archive(directory, "2026-10"))
+    assert [(r["submission_id"], r["status"]) for r in october] == [("7_2", "approved"), ("7_3", "rejected")]
+    assert list(iter_submission_archive(directory, "2026-11")) == []
+    assert list(iter_submission_archive(str(tmp_path / "missing"))) == []
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_leftover_resolved_submissions_move_to_the_archive_on_the_first_flush(tmp_path, backend):
+    store = open_storage(backend, str(tmp_path))
+    left  = resolved("7_1", 9)
+    store.write_batch({"submissions": {"7_1": {key: value for key, value in left.items() if key != "submission_id"}}})
+
+    state = StateCache(store)
+    assert "7_1" in store.load_submissions()  # loading writes nothing
+    asyncio.run(state.close())
+    assert store.load_submissions() == {}
+    assert [r["submission_id"] for r in iter_submission_archive(store.submission_archive_dir)] == ["7_1"]
+    store.close()
@@ -0,0 +1,72 @@
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from tracing import TRACE_VERSION, TraceRecorder, read_trace
+
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def interaction_at(ts: float) -> SimpleNamespace:
+    return SimpleNamespace(created_at=datetime.fromtimestamp(ts, timezone.utc))
+
+
+def test_events_round_trip_with_arrival_times_and_pseudonyms(tmp_path):
+    path     = str(tmp_path / "traces" / "trace.jsonl")
+    clock    = Clock(1000.0)
+    recorder = TraceRecorder(path, salt="pepper", clock=clock)
+    clock.now = 1002.5
+    # The handler finished 0.5 s after Discord created the interaction.
+    recorder.record("claim", interaction_at(1002.0), guild=recorder.anon("g", 123456789), amount=2)
+    clock.now = 1010.0
+    recorder.record("reset", duration=4.0, guild=recorder.anon("g", 123456789), period="weekly")
+    recorder.close()
+
+    header, events = read_trace(path)
+    assert header["trace"] == TRACE_VERSION
+    assert events == [
+        {"t": 2.0, "kind": "claim", "ms": 500.0, "guild": recorder.anon("g", 123456789), "amount": 2},
+        {"t": 6.0, "kind": "reset", "ms": 4000.0, "guild": recorder.anon("g", 123456789), "period": "weekly"},
+    ]
+    assert "123456789" not in open(path, encoding="utf-8").read()
+
+
+def test_pseudonyms_are_stable_per_salt_only():
+    recorder = TraceRecorder(salt="a")
+    assert recorder.anon("m", 7) == recorder.anon("m", 7) != recorder.anon("m", 8)
+    assert recorder.anon("m", 7) != TraceRecorder(salt="b").anon("m", 7)
+    assert recorder.anon("m", 7).startswith("m")
+
+
+def test_a_disabled_recorder_writes_nothing(tmp_path):
+    recorder = TraceRecorder()
+    assert not recorder.enabled
+    recorder.record("ui", interaction_at(0), handler="x")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sessions_appended_across_restarts_follow_each_other(tmp_path):
+    path = str(tmp_path / "trace.jsonl")
+    for started in (100.0, 5000.0):
+        clock    = Clock(started)
+        recorder = TraceRecorder(path, clock=clock)
+        clock.now = started + 3.0
+        recorder.record("reset", duration=0.0, period="weekly")
+        recorder.close()
+    _, events = read_trace(path)
+    assert [event["t"] for event in events] == [3.0, 6.0]
+
+
+def test_unknown_trace_versions_are_rejected(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    path.write_text(json.dumps({"trace": TRACE_VERSION + 1}) + "\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_trace(str(path))
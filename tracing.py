@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+
+# ── Trace Recording ───────────────────────────────────────────────
+# One JSON object per line. The first line is a header; every other line
+# is an event with ``t`` (seconds since recording started), ``kind``,
+# ``ms`` (time from Discord creating the interaction until the handler
+# finished, or the duration of a reset) and kind-specific fields:
+#
+#   ui           handler: one button, select, modal or autocomplete callback
+#   claim        guild, member, task, points, max_completions, amount, submission, outcome
+#   review       guild, reviewer, status, outcome and the submission's fields
+#   bulk_review  guild, reviewer, status, items: [submission fields]
+#   reset        guild, period
+#
+# Guild, member, task and submission ids are replaced by salted hashes,
+# so traces can leave the server without exposing who did what.
+TRACE_VERSION = 1
+
+
+class TraceRecorder:
+    """Opt-in event log for reproducing production load with ``replay.py``.
+
+    Disabled without a ``path``; every call then returns immediately. The
+    salt is random per recording unless given, so pseudonyms cannot be
+    linked across traces.
+    """
+
+    def __init__(self, path: str | None = None, salt: str | None = None, clock=time.time):
+        self.path    = path
+        self.salt    = (salt or os.urandom(16).hex()).encode("utf-8")
+        self.clock   = clock
+        self.started = clock()
+        self._file   = None
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8", buffering=1)
+            self._write({
+                "trace":      TRACE_VERSION,
+                "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            })
+
+    @property
+    def enabled(self) -> bool:
+        return self._file is not None
+
+    def anon(self, prefix: str, value) -> str:
+        digest = hashlib.blake2b(str(value).encode("utf-8"), key=self.salt[:64], digest_size=6).hexdigest()
+        return f"{prefix}{digest}"
+
+    def submission_fields(self, guild_id: int, submission_id: str, sub) -> dict:
+        """What replay needs to recreate a pending submission it never saw claimed."""
+        return {
+            "submission":      self.anon("s", submission_id),
+            "member":          self.anon("m", sub.member_id),
+            "task":            self.anon("t", f"{guild_id}:{sub.task_key}"),
+            "points":          sub.task.points,
+            "max_completions": sub.task.max_completions,
+            "amount":          sub.amount,
+        }
+
+    def record(self, kind: str, interaction=None, duration: float | None = None, **fields) -> None:
+        if self._file is None:
+            return
+        now = self.clock()
+        if duration is None and interaction is not None:
+            duration = max(0.0, now - interaction.created_at.timestamp())
+        # ``t`` is when the interaction arrived, so a replay issues it at the same point.
+        arrived = now - (duration or 0.0)
+        event = {"t": round(max(0.0, arrived - self.started), 4), "kind": kind, "ms": None if duration is None else round(duration * 1000, 2)}
+        event.update(fields)
+        self._write(event)
+
+    def _write(self, event: dict) -> None:
+        try:
+            self._file.write(json.dumps(event, separators=(",", ":")) + "\n")
+        except OSError as e:
+            print(f"⚠️ Trace recording stopped: {e}")
+            self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_trace(path: str) -> tuple[dict, list]:
+    """``(header, events)`` of a trace file, events ordered by time.
+
+    A file appended to across restarts holds one header per session;
+    later sessions are shifted to start where the previous one ended.
+    """
+    header, events, offset = {}, [], 0.0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if "trace" in entry:
+                if entry["trace"] != TRACE_VERSION:
+                    raise ValueError(f"Unsupported trace version: {entry['trace']}")
+                header = header or entry
+                offset = events[-1]["t"] if events else 0.0
+            else:
+                entry["t"] += offset
+                events.append(entry)
+    events.sort(key=lambda event: event["t"])
+    return header, events